@@ -6,7 +6,10 @@ Core agent interaction functions for running autonomous coding sessions.
 
 v3.1.0 enhancements:
 - Triple timeout protection (15-min no-response, 10-min stall, 120-min session)
+- Watchdog task enforces timeouts even when no messages arrive
 - Retry + skip logic (auto-recovery from failures)
+- Session outcomes attributed to features (feature_list.json diff + commits)
+- Cross-session churn detection (oscillating diffs count as retry failures)
 - Comprehensive error handling and logging
 """
 
@@ -16,17 +19,128 @@ from typing import Optional
 
 from claude_code_sdk import ClaudeSDKClient
 
+from churn_detector import ChurnDetector
 from client import create_client
-from progress import print_session_header, print_progress_summary
+from feature_loader import load_project_features
+from progress import print_session_header, print_progress_summary, count_feature_file
 from prompts import get_initializer_prompt, get_coding_prompt, copy_spec_to_project
 from output_formatter import format_tool_output
 from loop_detector import LoopDetector
+from progress_probe import ProgressProbe
+from stall_history import GapHistogram
 from retry_manager import RetryManager
 from error_handler import ErrorHandler
+from security_audit import flush_all as flush_security_audit, print_audit_summary
+from session_attribution import attribute_session, build_focus_prompt, take_snapshot
 
 
 # Configuration
 AUTO_CONTINUE_DELAY_SECONDS = 3
+WATCHDOG_INTERVAL_SECONDS = 30
+CLIENT_TEARDOWN_TIMEOUT_SECONDS = 10
+
+
+async def _watch_session(loop_detector: LoopDetector) -> str:
+    """
+    Evaluate the loop detector on a timer, independent of message arrival.
+
+    Returns:
+        The stop reason once the detector trips
+    """
+    while True:
+        await asyncio.sleep(WATCHDOG_INTERVAL_SECONDS)
+        is_stuck, reason = loop_detector.check()
+        if is_stuck:
+            return reason
+
+
+async def _teardown_client(client: ClaudeSDKClient) -> None:
+    """Interrupt and disconnect a client that has stopped responding."""
+    for method in ("interrupt", "disconnect"):
+        try:
+            await asyncio.wait_for(
+                getattr(client, method)(),
+                timeout=CLIENT_TEARDOWN_TIMEOUT_SECONDS,
+            )
+        except Exception:
+            pass  # Best effort - the client may already be dead
+
+
+async def _receive_session(
+    client: ClaudeSDKClient,
+    message: str,
+    loop_detector: Optional[LoopDetector],
+    response_parts: list[str],
+) -> tuple[str, str]:
+    """
+    Send the prompt and stream the response, appending text to response_parts.
+
+    Returns:
+        ("continue", "") when the response completes, or ("timeout", reason)
+        when the loop detector trips between messages
+    """
+    # Send the query
+    await client.query(message)
+
+    # Collect response text and show tool use
+    async for msg in client.receive_response():
+        # Check for timeout/loop before processing message
+        if loop_detector:
+            is_stuck, reason = loop_detector.check()
+            if is_stuck:
+                return "timeout", reason
+
+        msg_type = type(msg).__name__
+
+        # Handle AssistantMessage (text and tool use)
+        if msg_type == "AssistantMessage" and hasattr(msg, "content"):
+            for block in msg.content:
+                block_type = type(block).__name__
+
+                if block_type == "TextBlock" and hasattr(block, "text"):
+                    response_parts.append(block.text)
+                    print(block.text, end="", flush=True)
+                elif block_type == "ToolUseBlock" and hasattr(block, "name"):
+                    tool_name = block.name
+                    tool_input = block.input if hasattr(block, "input") else {}
+
+                    # Track tool use for loop detection (classified by tool_registry)
+                    if loop_detector:
+                        loop_detector.track_tool_use(tool_name, tool_input)
+
+                    try:
+                        formatted = format_tool_output(tool_name, tool_input)
+                        print(formatted, flush=True)
+                    except Exception as e:
+                        # Fallback to simple output if formatter fails
+                        print(f"\n[Tool: {tool_name}]", flush=True)
+                        input_str = str(tool_input)
+                        if len(input_str) > 200:
+                            print(f"   Input: {input_str[:200]}...", flush=True)
+                        else:
+                            print(f"   Input: {input_str}", flush=True)
+
+        # Handle UserMessage (tool results)
+        elif msg_type == "UserMessage" and hasattr(msg, "content"):
+            for block in msg.content:
+                block_type = type(block).__name__
+
+                if block_type == "ToolResultBlock":
+                    result_content = getattr(block, "content", "")
+                    is_error = getattr(block, "is_error", False)
+
+                    # Check if command was blocked by security hook
+                    if "blocked" in str(result_content).lower():
+                        print(f"   [BLOCKED] {result_content}", flush=True)
+                    elif is_error:
+                        # Show errors (truncated)
+                        error_str = str(result_content)[:500]
+                        print(f"   [Error] {error_str}", flush=True)
+                    else:
+                        # Tool succeeded - just show brief confirmation
+                        print("   [Done]", flush=True)
+
+    return "continue", ""
 
 
 async def run_agent_session(
@@ -39,6 +153,11 @@ async def run_agent_session(
     """
     Run a single agent session using Claude Agent SDK.
 
+    When a loop detector is given, a watchdog task evaluates it every
+    WATCHDOG_INTERVAL_SECONDS alongside the receive loop, so timeouts fire
+    even if the API goes silent and no message ever arrives. On a trip the
+    receive loop is cancelled and the client torn down.
+
     Args:
         client: Claude SDK client
         message: The prompt to send
@@ -47,86 +166,46 @@ async def run_agent_session(
         error_handler: Error handler for logging
 
     Returns:
-        (status, response_text) where status is:
-        - "continue" if agent should continue working
-        - "timeout" if session timed out or stalled
-        - "error" if an error occurred
+        (status, detail) where status is:
+        - "continue" if agent should continue working (detail: response text)
+        - "timeout" if session timed out or stalled (detail: stop reason)
+        - "error" if an error occurred (detail: error message)
     """
     print("Sending prompt to Claude Agent SDK...\n")
 
+    response_parts: list[str] = []
+    receive_task = asyncio.create_task(
+        _receive_session(client, message, loop_detector, response_parts)
+    )
+    watchdog_task = None
+
     try:
-        # Send the query
-        await client.query(message)
-
-        # Collect response text and show tool use
-        response_text = ""
-        async for msg in client.receive_response():
-            # Check for timeout/loop before processing message
-            if loop_detector:
-                is_stuck, reason = loop_detector.check()
-                if is_stuck:
-                    print(f"\n🛑 Session stopped: {reason}\n")
-                    if error_handler:
-                        error_handler.record_warning("session_timeout", reason)
-                    return "timeout", response_text
-
-            msg_type = type(msg).__name__
-
-            # Handle AssistantMessage (text and tool use)
-            if msg_type == "AssistantMessage" and hasattr(msg, "content"):
-                for block in msg.content:
-                    block_type = type(block).__name__
-
-                    if block_type == "TextBlock" and hasattr(block, "text"):
-                        response_text += block.text
-                        print(block.text, end="", flush=True)
-                    elif block_type == "ToolUseBlock" and hasattr(block, "name"):
-                        tool_name = block.name
-                        tool_input = block.input if hasattr(block, "input") else {}
-
-                        # Track tool use for loop detection
-                        if loop_detector:
-                            # Determine tool type
-                            if tool_name in ['read_file', 'cat', 'head', 'tail']:
-                                file_path = tool_input.get('file_path', tool_input.get('path', ''))
-                                loop_detector.track_tool('read', file_path)
-                            else:
-                                loop_detector.track_tool(tool_name)
-
-                        try:
-                            formatted = format_tool_output(tool_name, tool_input)
-                            print(formatted, flush=True)
-                        except Exception as e:
-                            # Fallback to simple output if formatter fails
-                            print(f"\n[Tool: {tool_name}]", flush=True)
-                            input_str = str(tool_input)
-                            if len(input_str) > 200:
-                                print(f"   Input: {input_str[:200]}...", flush=True)
-                            else:
-                                print(f"   Input: {input_str}", flush=True)
-
-            # Handle UserMessage (tool results)
-            elif msg_type == "UserMessage" and hasattr(msg, "content"):
-                for block in msg.content:
-                    block_type = type(block).__name__
-
-                    if block_type == "ToolResultBlock":
-                        result_content = getattr(block, "content", "")
-                        is_error = getattr(block, "is_error", False)
-
-                        # Check if command was blocked by security hook
-                        if "blocked" in str(result_content).lower():
-                            print(f"   [BLOCKED] {result_content}", flush=True)
-                        elif is_error:
-                            # Show errors (truncated)
-                            error_str = str(result_content)[:500]
-                            print(f"   [Error] {error_str}", flush=True)
-                        else:
-                            # Tool succeeded - just show brief confirmation
-                            print("   [Done]", flush=True)
+        if loop_detector:
+            watchdog_task = asyncio.create_task(_watch_session(loop_detector))
+            done, _ = await asyncio.wait(
+                {receive_task, watchdog_task},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if receive_task not in done:
+                # Watchdog tripped while the receive loop was blocked
+                reason = watchdog_task.result()
+                receive_task.cancel()
+                await asyncio.gather(receive_task, return_exceptions=True)
+                await _teardown_client(client)
+                print(f"\n🛑 Session stopped by watchdog: {reason}\n")
+                if error_handler:
+                    error_handler.record_warning("session_timeout", reason)
+                return "timeout", reason
+
+        status, reason = await receive_task
+        if status == "timeout":
+            print(f"\n🛑 Session stopped: {reason}\n")
+            if error_handler:
+                error_handler.record_warning("session_timeout", reason)
+            return "timeout", reason
 
         print("\n" + "-" * 70 + "\n")
-        return "continue", response_text
+        return "continue", "".join(response_parts)
 
     except Exception as e:
         print(f"Error during agent session: {e}")
@@ -134,6 +213,12 @@ async def run_agent_session(
             error_handler.record_error("agent_session", e, fatal=False)
         return "error", str(e)
 
+    finally:
+        if watchdog_task and not watchdog_task.done():
+            watchdog_task.cancel()
+        if not receive_task.done():
+            receive_task.cancel()
+
 
 async def run_autonomous_agent(
     project_dir: Path,
@@ -174,7 +259,7 @@ async def run_autonomous_agent(
     # Show reliability features
     print(f"\n📊 Reliability Features:")
     print(f"   Session timeout: {session_timeout_minutes} min")
-    print(f"   Stall timeout: {stall_timeout_minutes} min")
+    print(f"   Stall timeout: up to {stall_timeout_minutes} min (learned per tool type, extended while files change or builds run)")
     print(f"   No-response timeout: 15 min")
     print(f"   Max retries per feature: {max_retries}")
     print()
@@ -185,9 +270,12 @@ async def run_autonomous_agent(
     # Initialize reliability components
     retry_manager = RetryManager(project_dir, max_retries=max_retries)
     error_handler = ErrorHandler(project_dir)
+    churn_detector = ChurnDetector(project_dir)
     loop_detector = LoopDetector(
         session_timeout_minutes=session_timeout_minutes,
-        stall_timeout_minutes=stall_timeout_minutes
+        stall_timeout_minutes=stall_timeout_minutes,
+        progress_probe=ProgressProbe(project_dir),
+        gap_histogram=GapHistogram(project_dir / ".claude" / "tool_gaps.json"),
     )
 
     print("✅ Reliability components initialized\n")
@@ -245,25 +333,18 @@ async def run_autonomous_agent(
         
         if iteration > 1 or mode == "greenfield":  # Only check after first session, or always in greenfield
             if spec_feature_list.exists():
-                import json
-                try:
-                    with open(spec_feature_list) as f:
-                        features = json.load(f)
-                    total = len(features)
-                    passing = sum(1 for f in features if f.get('passes', False))
-                    
-                    if passing >= total and total > 0:
-                        print("\n" + "=" * 70)
-                        print(f"🎉 PROJECT 100% COMPLETE ({passing}/{total} features passing)!")
-                        print("=" * 70)
-                        print("\nAll features are marked as passing.")
-                        print("The autonomous coding work is DONE.")
-                        print("\n✅ STOPPING AUTOMATICALLY - No further work needed!")
-                        print("\nTo add more features, create a new enhancement spec.")
-                        print("=" * 70)
-                        return  # Exit the function, stopping the loop
-                except (json.JSONDecodeError, IOError):
-                    pass  # Continue if we can't read the file
+                passing, total = count_feature_file(spec_feature_list)
+
+                if passing >= total and total > 0:
+                    print("\n" + "=" * 70)
+                    print(f"🎉 PROJECT 100% COMPLETE ({passing}/{total} features passing)!")
+                    print("=" * 70)
+                    print("\nAll features are marked as passing.")
+                    print("The autonomous coding work is DONE.")
+                    print("\n✅ STOPPING AUTOMATICALLY - No further work needed!")
+                    print("\nTo add more features, create a new enhancement spec.")
+                    print("=" * 70)
+                    return  # Exit the function, stopping the loop
 
         # Print session header
         print_session_header(iteration, is_first_run)
@@ -272,11 +353,27 @@ async def run_autonomous_agent(
         client = create_client(project_dir, model, mode)
 
         # Choose prompt based on session type and mode
+        target = None
         if is_first_run:
             prompt = get_initializer_prompt(mode)
             is_first_run = False  # Only use initializer once
         else:
-            prompt = get_coding_prompt(mode)
+            # Point the session at the next retryable feature, hide skipped ones
+            features = load_project_features(project_dir)
+            target = retry_manager.get_next_feature(features)
+            skipped = [
+                f for f in features
+                if not f.passes and retry_manager.should_skip(f.id)
+            ]
+            if target is None and skipped:
+                print("\n" + "=" * 70)
+                print(f"⚠️  All remaining features were skipped after {max_retries} failed attempts")
+                print("=" * 70)
+                print("\nReview them, then delete .claude/retry_state.json and .claude/retry_state.jsonl to retry.")
+                break
+            prompt = build_focus_prompt(get_coding_prompt(mode), target, skipped)
+
+        snapshot = take_snapshot(project_dir)
 
         # Reset loop detector for fresh session
         loop_detector.reset()
@@ -288,6 +385,31 @@ async def run_autonomous_agent(
                 loop_detector=loop_detector,
                 error_handler=error_handler
             )
+        loop_detector.flush()
+        flush_security_audit()
+
+        # Attribute the outcome to features for retry/skip tracking
+        attribution = attribute_session(
+            project_dir, snapshot, status, target.id if target else None
+        )
+        for feature_id in attribution.passed:
+            retry_manager.record_success(feature_id)
+        for feature_id in attribution.failed:
+            reason = response if status != "continue" else "session made no commits"
+            retry_manager.record_failure(feature_id, f"{status}: {reason}"[:500])
+            print(f"\n⚠️  Feature {feature_id} not completed "
+                  f"(attempt {retry_manager.get_retry_count(feature_id)}/{max_retries})")
+
+        # Cross-session churn: write/revert cycles and edits that never land
+        churn = churn_detector.record_session(
+            snapshot.head,
+            target.id if target else None,
+            passes_changed=bool(attribution.passed or attribution.regressed),
+        )
+        if churn and target is not None:
+            error_handler.record_warning("churn", churn, feature_id=target.id)
+            if target.id not in attribution.failed and target.id not in attribution.passed:
+                retry_manager.record_failure(target.id, f"churn: {churn}")
 
         # Handle status
         if status == "continue":
@@ -296,9 +418,8 @@ async def run_autonomous_agent(
             await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
 
         elif status == "timeout":
-            print("\n🛑 Session timed out or stalled")
+            print(f"\n🛑 Session timed out or stalled: {response}")
             print("This session will be retried with fresh context...")
-            # Don't record as failure - timeout is expected sometimes
             await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
 
         elif status == "error":
@@ -337,6 +458,9 @@ async def run_autonomous_agent(
     # Print error summary
     error_handler.print_session_summary()
 
+    # Print security hook decisions (blocked commands cost turns)
+    print_audit_summary(project_dir.resolve())
+
     # Print instructions for running the generated application
     print("\n" + "-" * 70)
     print("  TO RUN THE GENERATED APPLICATION:")
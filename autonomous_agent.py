@@ -43,6 +43,12 @@ Examples:
   # Continue existing project
   python autonomous_agent_demo.py --project-dir ./claude_clone
 
+  # Work on 4 features at once in separate git worktrees
+  python autonomous_agent_demo.py --project-dir ./claude_clone --parallel-workers 4
+
+  # Run several projects concurrently from a job file (or directory of job files)
+  python autonomous_agent_demo.py --jobs jobs.yaml --concurrency 4
+
 Environment Variables:
   CLAUDE_CODE_OAUTH_TOKEN    Your Claude Code OAuth token (required)
                              Generate with: claude setup-token
@@ -96,7 +102,7 @@ Environment Variables:
         "--stall-timeout",
         type=int,
         default=10,
-        help="No-activity stall timeout in minutes (default: 10)",
+        help="No-activity stall timeout in minutes; caps the per-tool limits learned from history (default: 10)",
     )
 
     parser.add_argument(
@@ -106,6 +112,27 @@ Environment Variables:
         help="Maximum retry attempts per feature (default: 3)",
     )
 
+    parser.add_argument(
+        "--parallel-workers",
+        type=int,
+        default=1,
+        help="Number of features to work on at once, each in its own git worktree (default: 1 = serial)",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        type=Path,
+        default=None,
+        help="JSON/YAML job file, or directory of job files, listing projects to run concurrently (each job: project_dir, spec, mode)",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of projects running at once with --jobs (default: 4)",
+    )
+
     parser.add_argument(
         "--version",
         action="store_true",
@@ -138,6 +165,35 @@ def main() -> None:
         print("  export CLAUDE_CODE_OAUTH_TOKEN='your-oauth-token-here'")
         return
 
+    # Multi-project mode: each job carries its own project_dir, spec and mode
+    if args.jobs:
+        from orchestrator import load_jobs, run_projects
+
+        try:
+            jobs = load_jobs(args.jobs)
+        except (ValueError, OSError) as e:
+            print(f"Error: could not load jobs from {args.jobs}: {e}")
+            return
+        if not jobs:
+            print(f"Error: no jobs found in {args.jobs}")
+            return
+
+        try:
+            asyncio.run(
+                run_projects(
+                    jobs,
+                    model=args.model,
+                    concurrency=args.concurrency,
+                    session_timeout_minutes=args.session_timeout,
+                    stall_timeout_minutes=args.stall_timeout,
+                    max_retries=args.max_retries,
+                )
+            )
+        except KeyboardInterrupt:
+            print("\n\nInterrupted by user")
+            print("To resume, run the same command again")
+        return
+
     # Validate spec file for enhancement/bugfix modes
     if args.mode in ["enhancement", "bugfix"] and not args.spec:
         print(f"Error: --spec is required for {args.mode} mode")
@@ -157,18 +213,35 @@ def main() -> None:
 
     # Run the agent
     try:
-        asyncio.run(
-            run_autonomous_agent(
-                project_dir=project_dir,
-                model=args.model,
-                max_iterations=args.max_iterations,
-                mode=args.mode,
-                spec_file=args.spec,
-                session_timeout_minutes=args.session_timeout,
-                stall_timeout_minutes=args.stall_timeout,
-                max_retries=args.max_retries,
+        if args.parallel_workers > 1:
+            from parallel_workers import run_parallel_features
+
+            asyncio.run(
+                run_parallel_features(
+                    project_dir=project_dir,
+                    model=args.model,
+                    workers=args.parallel_workers,
+                    mode=args.mode,
+                    spec_file=args.spec,
+                    max_iterations=args.max_iterations,
+                    session_timeout_minutes=args.session_timeout,
+                    stall_timeout_minutes=args.stall_timeout,
+                    max_retries=args.max_retries,
+                )
+            )
+        else:
+            asyncio.run(
+                run_autonomous_agent(
+                    project_dir=project_dir,
+                    model=args.model,
+                    max_iterations=args.max_iterations,
+                    mode=args.mode,
+                    spec_file=args.spec,
+                    session_timeout_minutes=args.session_timeout,
+                    stall_timeout_minutes=args.stall_timeout,
+                    max_retries=args.max_retries,
+                )
             )
-        )
     except KeyboardInterrupt:
         print("\n\nInterrupted by user")
         print("To resume, run the same command again")
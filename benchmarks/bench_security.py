@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Security Hook Benchmark
+=======================
+
+Times bash_security_hook on a corpus of real agent commands
+(security_corpus.json) and fuzzes the parser against shlex and bash, then writes
+both to a JSON results file so latency and parsing fidelity can be
+compared across releases.
+
+Measured per call, in microseconds:
+- cold: parse and decision caches cleared before every call
+- warm: the same commands repeated (the common case in a session)
+
+The decision for every corpus command is stored too, so a parser change
+that flips an allow/block shows up in --compare.
+
+Usage:
+    python benchmarks/bench_security.py
+    python benchmarks/bench_security.py --compare benchmarks/results/security-3.3.0.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+from security import bash_security_hook, evaluate_command, parse_command  # noqa: E402
+from fuzz_security_parser import fuzz, fuzz_bash  # noqa: E402
+
+
+# Corpus of agent commands (JSON: {"commands": [...]})
+CORPUS_FILE = BENCH_DIR / "security_corpus.json"
+
+# Where results are written (one file per harness version)
+RESULTS_DIR = BENCH_DIR / "results"
+
+# Passes over the corpus per measurement
+DEFAULT_ROUNDS = 20
+
+# Random commands compared against shlex
+DEFAULT_FUZZ_ITERATIONS = 10000
+
+# Random commands checked against bash (each one starts a bash process)
+DEFAULT_BASH_FUZZ_ITERATIONS = 1000
+
+
+def load_corpus(path: Path = CORPUS_FILE) -> List[str]:
+    """Commands from the corpus file."""
+    with open(path) as f:
+        return json.load(f)["commands"]
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def summarize(samples_us: List[float]) -> Dict[str, float]:
+    """p50/p99/mean/max of latency samples in microseconds."""
+    values = sorted(samples_us)
+    return {
+        "calls": len(values),
+        "p50_us": round(_percentile(values, 0.50), 2),
+        "p99_us": round(_percentile(values, 0.99), 2),
+        "mean_us": round(sum(values) / len(values), 2) if values else 0.0,
+        "max_us": round(values[-1], 2) if values else 0.0,
+    }
+
+
+async def _time_hook(commands: List[str], rounds: int, cold: bool) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        for command in commands:
+            if cold:
+                parse_command.cache_clear()
+                evaluate_command.cache_clear()
+            input_data = {"tool_name": "Bash", "tool_input": {"command": command}}
+            start = time.perf_counter_ns()
+            await bash_security_hook(input_data)
+            samples.append((time.perf_counter_ns() - start) / 1000)
+    return samples
+
+
+def run_benchmark(
+    commands: List[str],
+    rounds: int = DEFAULT_ROUNDS,
+    fuzz_iterations: int = DEFAULT_FUZZ_ITERATIONS,
+    bash_fuzz_iterations: int = DEFAULT_BASH_FUZZ_ITERATIONS,
+) -> Dict:
+    """
+    Benchmark the hook and fuzz the parser.
+
+    Args:
+        commands: Corpus commands
+        rounds: Passes over the corpus per measurement
+        fuzz_iterations: Random commands compared against shlex
+        bash_fuzz_iterations: Random commands checked against bash
+
+    Returns:
+        Results dict (see module docstring)
+    """
+    cold = asyncio.run(_time_hook(commands, rounds, cold=True))
+    parse_command.cache_clear()
+    evaluate_command.cache_clear()
+    warm = asyncio.run(_time_hook(commands, rounds, cold=False))
+
+    decisions = {command: evaluate_command(command) for command in commands}
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "version": (BENCH_DIR.parent / "VERSION").read_text().strip(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus_size": len(commands),
+        "rounds": rounds,
+        "cold": summarize(cold),
+        "warm": summarize(warm),
+        "blocked": sum(1 for reason in decisions.values() if reason),
+        "decisions": decisions,
+        "fuzz": fuzz(fuzz_iterations),
+        "fuzz_bash": fuzz_bash(bash_fuzz_iterations),
+    }
+
+
+def compare(previous: Dict, current: Dict) -> List[str]:
+    """Human-readable differences between two results files."""
+    lines = []
+    for mode in ("cold", "warm"):
+        for key in ("p50_us", "p99_us"):
+            before = previous.get(mode, {}).get(key)
+            after = current[mode][key]
+            if before:
+                lines.append(f"{mode} {key}: {before} -> {after} ({(after - before) / before:+.0%})")
+
+    before_agreement = previous.get("fuzz", {}).get("agreement")
+    if before_agreement is not None:
+        lines.append(f"fuzz agreement: {before_agreement:.4f} -> {current['fuzz']['agreement']:.4f}")
+    before_missed = previous.get("fuzz_bash", {}).get("mismatches")
+    if before_missed is not None:
+        lines.append(f"bash fuzz mismatches: {before_missed} -> {current['fuzz_bash']['mismatches']}")
+
+    for command, reason in current["decisions"].items():
+        old = previous.get("decisions", {}).get(command)
+        if old is not None and bool(old) != bool(reason):
+            was, now = ("blocked", "allowed") if old else ("allowed", "blocked")
+            lines.append(f"decision changed ({was} -> {now}): {command!r}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Bash security hook")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--fuzz-iterations", type=int, default=DEFAULT_FUZZ_ITERATIONS)
+    parser.add_argument("--bash-fuzz-iterations", type=int, default=DEFAULT_BASH_FUZZ_ITERATIONS)
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Results file (default: benchmarks/results/security-<version>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results file to diff against")
+    args = parser.parse_args()
+
+    results = run_benchmark(load_corpus(), args.rounds, args.fuzz_iterations, args.bash_fuzz_iterations)
+
+    output = args.output or RESULTS_DIR / f"security-{results['version']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"Corpus: {results['corpus_size']} commands x {results['rounds']} rounds "
+          f"({results['blocked']} blocked)")
+    for mode in ("cold", "warm"):
+        stats = results[mode]
+        print(f"  {mode:5s} p50 {stats['p50_us']:8.1f}µs   p99 {stats['p99_us']:8.1f}µs")
+    fuzz_report = results["fuzz"]
+    print(f"  fuzz  {fuzz_report['iterations']} commands, {fuzz_report['mismatches']} mismatches vs shlex")
+    bash_report = results["fuzz_bash"]
+    if bash_report["skipped"]:
+        print("  fuzz  bash not installed, skipped")
+    else:
+        print(f"  fuzz  {bash_report['iterations']} commands, {bash_report['mismatches']} mismatches vs bash "
+              f"({bash_report['rejected']} blocked)")
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print(f"\nCompared with {args.compare}:")
+        for line in compare(previous, results) or ["no differences"]:
+            print(f"  {line}")
+
+    return 0 if fuzz_report["mismatches"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Security Parser Fuzzer
+======================
+
+Property-based comparison of security.parse_command against two references:
+shlex, the POSIX tokenizer, and bash itself.
+
+Random command lines are generated from words (plain, single-quoted,
+double-quoted with escapes, backslash-escaped) joined by spaces and the
+operators &&, ||, |, ; and &. Operators are also generated inside quotes
+and unbalanced quotes are mixed in. For every input, both tokenizers must
+agree on:
+- whether the input is malformed
+- the words of every pipeline stage, in order
+
+shlex has no notion of substitutions, so that generator leaves out $,
+backticks, #, parentheses, redirections, newlines and here-docs, as well as
+backslash-escaped operators and quoted strings made only of operator
+characters (shlex's punctuation mode returns `\\;` and `";"` exactly like
+the operator `;`, which the shell - and parse_command - treat as literals).
+
+Those constructs are what decide which commands actually run, so a second
+generator (random_shell_command) mixes them all in: $(...), backticks,
+${...:-...}, $((...)), assignments, subshells, comments, redirections,
+newlines and quoted/unquoted here-docs. Its oracle is bash: every command
+runs with PATH emptied and a command_not_found_handle that logs each
+command name bash tries to execute, including those inside substitutions,
+and nothing else runs. Each input is also evaluated under a policy that
+allows exactly those names; for every input the policy allows, each logged
+name must appear among parse_command's stages. Blocked inputs (parse errors,
+subshells, which the parser does not model) are counted as rejected.
+
+Usage:
+    python benchmarks/fuzz_security_parser.py --iterations 20000 --seed 1
+    python benchmarks/fuzz_security_parser.py --oracle bash --iterations 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from security import DEFAULT_POLICY, evaluate_command, parse_command  # noqa: E402
+from security_policy import SecurityPolicy  # noqa: E402
+
+
+# Operators the generator joins words with
+OPERATORS = ("&&", "||", "|", ";", "&")
+
+# Characters used inside generated words
+WORD_ALPHABET = "abcxyz019-_./=+,:%@"
+
+# Characters used inside quoted strings (operators and spaces included)
+QUOTED_ALPHABET = WORD_ALPHABET + " ;&|\t"
+
+# Mismatching inputs kept in the report
+MAX_MISMATCH_EXAMPLES = 20
+
+# Command names for the bash oracle (neither builtins nor real programs)
+ORACLE_COMMANDS = ("alpha", "beta", "gamma", "delta", "omega")
+
+# Allows exactly the bash oracle's command names
+ORACLE_POLICY = SecurityPolicy(
+    allowed_commands=frozenset(ORACLE_COMMANDS),
+    pkill_processes=frozenset(),
+    chmod_mode=DEFAULT_POLICY.chmod_mode,
+)
+
+# Operators between commands for the bash oracle (newlines included)
+ORACLE_OPERATORS = OPERATORS + ("\n",)
+
+# Redirections the bash oracle generator appends (relative paths stay in its temp dir)
+ORACLE_REDIRECTIONS = ("> out.txt", ">> out.txt", "2>&1", "2>/dev/null", "< /dev/null", "&> out.txt")
+
+# Deepest nesting of substitutions and subshells in generated commands
+ORACLE_MAX_DEPTH = 2
+
+# Seconds bash may take per generated command
+ORACLE_TIMEOUT = 10
+
+# Runs before every generated command: only the logging handler can "run" a command
+_ORACLE_PRELUDE = (
+    "PATH=/nonexistent\n"
+    'command_not_found_handle() { printf "%s\\n" "$1" >> "$ORACLE_LOG"; return 0; }\n'
+)
+
+
+def _random_text(rng: random.Random, alphabet: str, max_length: int) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+
+
+def _quoted_text(rng: random.Random, alphabet: str) -> str:
+    text = _random_text(rng, alphabet, 8)
+    if text and set(text) <= set(";&|"):
+        # shlex returns a quoted "|" exactly like the operator |
+        text += "a"
+    return text
+
+
+def random_word(rng: random.Random) -> str:
+    """One word built from plain, quoted and escaped parts."""
+    parts = []
+    for _ in range(rng.randint(1, 3)):
+        kind = rng.random()
+        if kind < 0.5:
+            parts.append(_random_text(rng, WORD_ALPHABET, 6) or "a")
+        elif kind < 0.7:
+            parts.append("'" + _quoted_text(rng, QUOTED_ALPHABET + '"\\') + "'")
+        elif kind < 0.9:
+            inner = _quoted_text(rng, QUOTED_ALPHABET + "'")
+            if rng.random() < 0.3:
+                inner += rng.choice(('\\"', "\\\\", "\\a"))
+            parts.append('"' + inner + '"')
+        else:
+            parts.append("\\" + rng.choice(WORD_ALPHABET + " '\""))
+    return "".join(parts)
+
+
+def random_command(rng: random.Random) -> str:
+    """A random command line (occasionally malformed)."""
+    pieces = []
+    for index in range(rng.randint(1, 6)):
+        if index:
+            operator = rng.choice(OPERATORS)
+            pieces.append(operator if rng.random() < 0.3 else f" {operator} ")
+        pieces.append(" ".join(random_word(rng) for _ in range(rng.randint(1, 4))))
+    command = "".join(pieces)
+    if rng.random() < 0.05:
+        command += rng.choice(("'", '"', "\\"))
+    return command
+
+
+def _oracle_command(rng: random.Random) -> str:
+    """A command for backticks: plain words only (backslashes mean something else there)."""
+    words = [rng.choice(ORACLE_COMMANDS)]
+    words += [_random_text(rng, "abcxyz019", 4) or "a" for _ in range(rng.randint(0, 2))]
+    return " ".join(words)
+
+
+def _oracle_argument(rng: random.Random, depth: int) -> str:
+    """An argument that may run commands when bash expands it."""
+    if depth >= ORACLE_MAX_DEPTH:
+        return random_word(rng)
+    inner = random_shell_command(rng, depth + 1, newlines=False)
+    kind = rng.randrange(9)
+    if kind == 0:
+        return f"$({inner})"
+    if kind == 1:
+        return f"`{_oracle_command(rng)}`"
+    if kind == 2:
+        return f'"text $({inner}) more"'
+    if kind == 3:
+        return f"$(( 0 $({inner}) ))"
+    if kind == 4:
+        return f"$(( 1 + `{_oracle_command(rng)}` 0 ))"
+    if kind == 5:
+        return f"${{unset_var:-$({inner})}}"
+    if kind == 6:
+        return f'"${{unset_var:-`{_oracle_command(rng)}`}}"'
+    if kind == 7:
+        return f"x#$({inner})"  # Not a comment: # only starts one at a word start
+    return random_word(rng)
+
+
+def _oracle_stage(rng: random.Random, depth: int, newlines: bool) -> str:
+    if depth < ORACLE_MAX_DEPTH and rng.random() < 0.05:
+        return f"( {random_shell_command(rng, depth + 1, newlines=False)} )"
+    words = []
+    if rng.random() < 0.1:
+        words.append(f"var={_oracle_argument(rng, depth)}")
+    words.append(rng.choice(ORACLE_COMMANDS))
+    for _ in range(rng.randint(0, 3)):
+        words.append(_oracle_argument(rng, depth) if rng.random() < 0.3 else random_word(rng))
+    if rng.random() < 0.2:
+        words.append(rng.choice(ORACLE_REDIRECTIONS))
+    if newlines and rng.random() < 0.15:
+        # A here-doc ends its line; the body expands unless the delimiter is quoted
+        delimiter = rng.choice(("EOF", "'EOF'", '"EOF"', "\\EOF", "-EOF"))
+        tab = "\t" if delimiter == "-EOF" else ""
+        body = [
+            f"{tab}$({_oracle_command(rng)}) and `{_oracle_command(rng)}`",
+            f"{tab}${{unset_var:-$({_oracle_command(rng)})}} \\$({_oracle_command(rng)})",
+        ]
+        return " ".join(words) + f" <<{delimiter}\n" + "\n".join(body) + f"\n{tab}EOF\n"
+    if newlines and rng.random() < 0.1:
+        words.append(f"# $({_oracle_command(rng)})\n")
+    return " ".join(words)
+
+
+def random_shell_command(rng: random.Random, depth: int = 0, newlines: bool = True) -> str:
+    """A random command line using substitutions, here-docs and the rest (see module docstring)."""
+    pieces = []
+    for index in range(rng.randint(1, 2 if depth else 5)):
+        if index and not pieces[-1].endswith("\n"):
+            operator = rng.choice(ORACLE_OPERATORS if newlines else OPERATORS)
+            pieces.append(operator if operator == "\n" else f" {operator} ")
+        pieces.append(_oracle_stage(rng, depth, newlines))
+    return "".join(pieces)
+
+
+def bash_commands(command: str, workdir: str, bash: str = "bash") -> Set[str]:
+    """
+    Command names bash tries to run for a command line (nothing actually runs).
+
+    Args:
+        command: Command line
+        workdir: Scratch directory bash runs in (redirections write there)
+        bash: Path to bash (PATH is emptied for the run)
+
+    Returns:
+        Names bash looked up, from every nesting level
+    """
+    log = os.path.join(workdir, "oracle.log")
+    open(log, "w").close()
+    subprocess.run(
+        [bash, "--norc", "--noprofile", "-c", _ORACLE_PRELUDE + command + "\nwait"],
+        cwd=workdir,
+        env={"ORACLE_LOG": log, "PATH": "/nonexistent", "LC_ALL": "C"},
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=ORACLE_TIMEOUT,
+    )
+    with open(log) as f:
+        return set(f.read().split())
+
+
+def reference_stages(command: str) -> Optional[List[List[str]]]:
+    """Words per pipeline stage according to shlex (None if malformed)."""
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=";&|")
+    lexer.whitespace_split = True
+    stages: List[List[str]] = [[]]
+    try:
+        for token in lexer:
+            if token and set(token) <= set(";&|"):
+                stages.append([])
+            else:
+                stages[-1].append(token)
+    except ValueError:
+        return None
+    return [stage for stage in stages if stage]
+
+
+def parser_stages(command: str) -> Optional[List[List[str]]]:
+    """Words per pipeline stage according to security.parse_command (None if malformed)."""
+    ast = parse_command(command)
+    if ast.error:
+        return None
+    return [list(stage.words) for segment in ast.segments for stage in segment.pipeline]
+
+
+def fuzz(iterations: int = 10000, seed: int = 0) -> Dict:
+    """
+    Compare parse_command with shlex on random commands.
+
+    Args:
+        iterations: Number of commands to generate
+        seed: Random seed (runs are reproducible)
+
+    Returns:
+        Report dict: iterations, seed, mismatches, agreement, examples
+    """
+    rng = random.Random(seed)
+    mismatches = 0
+    examples = []
+    for _ in range(iterations):
+        command = random_command(rng)
+        expected = reference_stages(command)
+        actual = parser_stages(command)
+        if expected != actual:
+            mismatches += 1
+            if len(examples) < MAX_MISMATCH_EXAMPLES:
+                examples.append({"command": command, "shlex": expected, "parser": actual})
+    return {
+        "iterations": iterations,
+        "seed": seed,
+        "mismatches": mismatches,
+        "agreement": 1 - mismatches / iterations if iterations else 1.0,
+        "examples": examples,
+    }
+
+
+def fuzz_bash(iterations: int = 1000, seed: int = 0) -> Dict:
+    """
+    Check parse_command sees every command bash would run, on random commands.
+
+    Args:
+        iterations: Number of commands to generate
+        seed: Random seed (runs are reproducible)
+
+    Returns:
+        Report dict: iterations, seed, rejected (blocked under ORACLE_POLICY),
+        mismatches (allowed inputs where bash runs a command the parser
+        missed), examples;
+        skipped is True if bash is not installed
+    """
+    report = {"iterations": iterations, "seed": seed, "rejected": 0, "mismatches": 0, "examples": []}
+    bash = shutil.which("bash")
+    if bash is None:
+        return {**report, "skipped": True}
+
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(iterations):
+            command = random_shell_command(rng)
+            if evaluate_command(command, ORACLE_POLICY):
+                report["rejected"] += 1
+                continue
+            parsed = set(parse_command(command).commands)
+            missed = bash_commands(command, workdir, bash) - parsed
+            if missed:
+                report["mismatches"] += 1
+                if len(report["examples"]) < MAX_MISMATCH_EXAMPLES:
+                    report["examples"].append({"command": command, "missed": sorted(missed)})
+    return {**report, "skipped": False}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzz security.parse_command against shlex or bash")
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--oracle", choices=("shlex", "bash"), default="shlex")
+    args = parser.parse_args()
+
+    if args.oracle == "bash":
+        report = fuzz_bash(args.iterations, args.seed)
+    else:
+        report = fuzz(args.iterations, args.seed)
+    print(json.dumps(report, indent=2))
+    return 0 if report["mismatches"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
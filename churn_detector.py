@@ -0,0 +1,200 @@
+"""
+Churn Detector
+==============
+
+Cross-session detection of work that goes in circles.
+
+LoopDetector resets every session, so it cannot see an agent that spends
+ten sessions writing and reverting the same change. After each session the
+churn detector fingerprints the session's `git diff` (HEAD at session start
+vs. the working tree) hunk by hunk, per file, and keeps a short history in
+.claude/churn.json.
+
+Two patterns are flagged:
+- Oscillation: blocks of lines removed in earlier sessions keep coming
+  back (A -> B -> A -> B)
+- Idle edits: sessions aimed at the same feature changed files without
+  any feature's passes state changing, CHURN_EDIT_SESSIONS times in a row
+
+Flagged sessions are reported to RetryManager as failures for the target
+feature.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from session_attribution import git_output
+
+
+# Sessions of hunk fingerprints kept per file
+CHURN_HISTORY_SESSIONS = 10
+
+# Re-added hunks in one file (within the history) that count as oscillation
+CHURN_OSCILLATION_THRESHOLD = 2
+
+# Consecutive sessions editing files without the target passing
+CHURN_EDIT_SESSIONS = 3
+
+# Blocks shorter than this (e.g. a lone "}") are too generic to fingerprint
+MIN_BLOCK_CHARS = 16
+
+# Files whose edits are tracked elsewhere (passes flips via session attribution)
+IGNORED_FILES = ("feature_list.json",)
+
+_HUNK_HEADER = re.compile(r"^@@ .* @@")
+
+
+def _block_hash(lines: List[str]) -> Optional[str]:
+    """Fingerprint a block of changed lines (whitespace-insensitive, blank lines ignored)."""
+    normalized = [" ".join(line.split()) for line in lines]
+    normalized = [line for line in normalized if line]
+    if sum(len(line) for line in normalized) < MIN_BLOCK_CHARS:
+        return None
+    return hashlib.sha1("\n".join(normalized).encode()).hexdigest()[:12]
+
+
+def parse_diff_hunks(diff: str) -> Dict[str, List[Tuple[Optional[str], Optional[str]]]]:
+    """
+    Fingerprint the hunks of a unified diff.
+
+    Args:
+        diff: `git diff` output
+
+    Returns:
+        {path: [(added_block_hash, removed_block_hash), ...]}
+    """
+    hunks: Dict[str, List[Tuple[Optional[str], Optional[str]]]] = {}
+    path = None
+    added: List[str] = []
+    removed: List[str] = []
+
+    def flush():
+        if path is not None and (added or removed) and not path.endswith(IGNORED_FILES):
+            hunks.setdefault(path, []).append((_block_hash(added), _block_hash(removed)))
+
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            flush()
+            added, removed = [], []
+            path = line.split(" b/", 1)[-1]
+        elif line.startswith(("+++", "---")):
+            continue
+        elif _HUNK_HEADER.match(line):
+            flush()
+            added, removed = [], []
+        elif line.startswith("+"):
+            added.append(line[1:])
+        elif line.startswith("-"):
+            removed.append(line[1:])
+    flush()
+    return hunks
+
+
+class ChurnDetector:
+    """Detect oscillating edits and idle edit streaks across sessions."""
+
+    def __init__(self, project_dir: Path):
+        """
+        Initialize churn detector.
+
+        Args:
+            project_dir: Project directory (git repository)
+        """
+        self.project_dir = project_dir
+        self.state_file = project_dir / ".claude" / "churn.json"
+        self.session = 0
+        self.files: Dict[str, List[Dict]] = {}  # {path: [{session, added, removed}]}
+        self.edit_streaks: Dict[str, int] = {}  # {feature_id: sessions without passing}
+        self._load_state()
+
+    def _load_state(self):
+        if not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return  # Start fresh if state file is corrupted
+        self.session = state.get("session", 0)
+        self.files = state.get("files", {})
+        self.edit_streaks = state.get("edit_streaks", {})
+
+    def _save_state(self):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "session": self.session,
+                "files": self.files,
+                "edit_streaks": self.edit_streaks,
+            }, f)
+        os.replace(tmp_path, self.state_file)
+
+    def session_diff(self, base: Optional[str]) -> str:
+        """Diff between the session's starting commit and the working tree."""
+        if not base:
+            return ""
+        return git_output(self.project_dir, "diff", "--no-color", "-U0", base) or ""
+
+    def record_session(
+        self,
+        base: Optional[str],
+        target: Optional[str] = None,
+        passes_changed: bool = False,
+    ) -> Optional[str]:
+        """
+        Fingerprint a finished session's diff and check for churn.
+
+        Args:
+            base: HEAD commit at session start (None skips the diff)
+            target: Feature id the session worked on
+            passes_changed: Whether any feature's passes state changed
+
+        Returns:
+            Reason string if the session churned, else None
+        """
+        hunks = parse_diff_hunks(self.session_diff(base))
+        self.session += 1
+
+        oscillating = []
+        for path, file_hunks in hunks.items():
+            history = self.files.get(path, [])
+            earlier_removed = {h for entry in history for h in entry["removed"]}
+
+            added = [a for a, _ in file_hunks if a]
+            removed = [r for _, r in file_hunks if r]
+            # A hunk flips when it brings back a block an earlier session removed
+            # (replacing one's own earlier attempt is normal iteration, not a flip)
+            flips = sum(1 for a in added if a in earlier_removed)
+            # Flips from earlier sessions still in the history count too
+            total_flips = flips + sum(entry.get("flips", 0) for entry in history)
+            if flips and total_flips >= CHURN_OSCILLATION_THRESHOLD:
+                oscillating.append(path)
+
+            history.append({
+                "session": self.session,
+                "added": added,
+                "removed": removed,
+                "flips": flips,
+            })
+            self.files[path] = history[-CHURN_HISTORY_SESSIONS:]
+
+        reason = None
+        if oscillating:
+            reason = f"oscillating edits in {', '.join(sorted(oscillating)[:3])}"
+
+        if target is not None:
+            if passes_changed or not hunks:
+                self.edit_streaks.pop(target, None)
+            else:
+                streak = self.edit_streaks.get(target, 0) + 1
+                self.edit_streaks[target] = streak
+                if reason is None and streak >= CHURN_EDIT_SESSIONS:
+                    reason = f"{streak} sessions of edits on {target} without any feature passing"
+
+        self._save_state()
+        return reason
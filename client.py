@@ -12,7 +12,7 @@ from pathlib import Path
 from claude_code_sdk import ClaudeCodeOptions, ClaudeSDKClient
 from claude_code_sdk.types import HookMatcher
 
-from security import bash_security_hook
+from security import bash_security_hook, get_policy, protect_policy_files_hook
 from setup_mcp import MCPServerSetup
 from skills_manager import SkillsManager
 from lsp_plugins import LSPPluginManager
@@ -102,6 +102,11 @@ def create_client(project_dir: Path, model: str, mode: str = "greenfield") -> Cl
                 # Allow ALL MCP tools (no prompts!)
                 "mcp__*",  # Wildcard for all MCP tools
             ],
+            "deny": [
+                # The agent must not widen its own Bash allowlist
+                "Write(./.claude/security_policy.*)",
+                "Edit(./.claude/security_policy.*)",
+            ],
         },
     }
 
@@ -113,10 +118,16 @@ def create_client(project_dir: Path, model: str, mode: str = "greenfield") -> Cl
     with open(settings_file, "w") as f:
         json.dump(security_settings, f, indent=2)
 
+    # Read the project's security policy now, before the agent can touch it;
+    # it stays frozen for the rest of the process
+    policy = get_policy(str(project_dir.resolve()))
+
     print(f"Created security settings at {settings_file}")
     print("   - Sandbox enabled (OS-level bash isolation)")
     print(f"   - Filesystem restricted to: {project_dir.resolve()}")
     print("   - Bash commands restricted to allowlist (see security.py)")
+    if policy.sources:
+        print(f"   - Security policy: {', '.join(policy.sources)}")
     print(f"   - MCP servers: {', '.join(mcp_servers.keys())}")
     print("   - Secrets scanning enabled (blocks git commits with secrets)")
     print("   - E2E validation enabled (requires tests for user-facing features)")
@@ -156,6 +167,9 @@ def create_client(project_dir: Path, model: str, mode: str = "greenfield") -> Cl
                         bash_security_hook,      # Command allowlist
                         secrets_scan_hook,       # Secrets detection
                     ]),
+                    HookMatcher(matcher="Write|Edit|MultiEdit|NotebookEdit", hooks=[
+                        protect_policy_files_hook,  # Policy files are read-only
+                    ]),
                 ],
                 "PostToolUse": [
                     HookMatcher(matcher="Bash", hooks=[
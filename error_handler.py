@@ -4,20 +4,72 @@ Error handler for claude-harness v3.1.0.
 Production-grade error handling with comprehensive logging.
 
 Features:
-- Structured error logging to .claude/errors.json
+- Structured error logging to .claude/errors.jsonl (append-only, size-rotated)
 - User-friendly error messages
 - Traceback capture for debugging
 - Error categorization (fatal vs recoverable)
-- Session error summaries
+- Session error summaries (current session kept in memory, history on disk only)
+- Error fingerprinting: repeats of the same failure are counted, not re-logged
 """
 
+import hashlib
 import json
+import os
+import re
 import traceback
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict
 
 
+# Rotate errors.jsonl once it grows past this size
+ERROR_LOG_MAX_BYTES = 5 * 1024 * 1024
+
+# Rotated logs kept (errors.jsonl.1 ... errors.jsonl.N)
+ERROR_LOG_BACKUPS = 3
+
+# Innermost traceback frames that go into an error fingerprint
+FINGERPRINT_FRAMES = 3
+
+# Volatile message parts replaced before fingerprinting
+_VOLATILE_PATTERNS = [
+    (re.compile(r"0x[0-9a-fA-F]+"), "0x?"),
+    (re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"), "<uuid>"),
+    (re.compile(r"\d+(\.\d+)?"), "N"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_message(message: str) -> str:
+    """Strip addresses, ids and numbers so repeats of one failure compare equal."""
+    for pattern, replacement in _VOLATILE_PATTERNS:
+        message = pattern.sub(replacement, message)
+    return message.strip()[:200]
+
+
+def fingerprint_error(
+    kind: str,
+    message: str,
+    error: Optional[BaseException] = None,
+) -> str:
+    """
+    Fingerprint a failure mode.
+
+    Args:
+        kind: Exception type name (or warning context)
+        message: Error or warning message
+        error: Exception whose innermost traceback frames are included
+
+    Returns:
+        Short hex digest identifying the failure mode
+    """
+    parts = [kind, normalize_message(message)]
+    if error is not None and error.__traceback__ is not None:
+        frames = traceback.extract_tb(error.__traceback__)[-FINGERPRINT_FRAMES:]
+        parts.extend(f"{Path(frame.filename).name}:{frame.name}" for frame in frames)
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()[:12]
+
+
 class ErrorHandler:
     """Handle and log errors gracefully."""
 
@@ -29,27 +81,71 @@ class ErrorHandler:
             project_dir: Project directory for error logs
         """
         self.project_dir = project_dir
-        self.error_log_file = project_dir / ".claude" / "errors.json"
-        self.errors: List[Dict] = []
+        self.error_log_file = project_dir / ".claude" / "errors.jsonl"
         self.session_start = datetime.now()
 
-        # Load existing errors
-        self._load_errors()
+        # Current session only - history stays on disk
+        self.errors: List[Dict] = []  # One entry per fingerprint
+        self._by_fingerprint: Dict[str, Dict] = {}
+        self._index = {'errors': 0, 'fatal': 0, 'warnings': 0}
+        self._by_context: Dict[str, int] = {}
 
-    def _load_errors(self):
-        """Load existing error log from disk."""
-        if self.error_log_file.exists():
-            try:
-                with open(self.error_log_file, 'r') as f:
-                    self.errors = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                self.errors = []
+    def _append(self, entry: Dict):
+        """
+        Index an entry for this session and append it to the log.
 
-    def _save_errors(self):
-        """Save error log to disk."""
-        self.error_log_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.error_log_file, 'w') as f:
-            json.dump(self.errors, f, indent=2)
+        The first occurrence of a fingerprint is logged in full; repeats
+        only bump its count/last_seen and append a compact "repeat" line.
+        """
+        if entry.get('type') == 'warning':
+            self._index['warnings'] += 1
+        else:
+            self._index['errors'] += 1
+            if entry.get('fatal', False):
+                self._index['fatal'] += 1
+        context = entry.get('context', 'unknown')
+        self._by_context[context] = self._by_context.get(context, 0) + 1
+
+        fingerprint = entry['fingerprint']
+        existing = self._by_fingerprint.get(fingerprint)
+        if existing is None:
+            entry['count'] = 1
+            entry['first_seen'] = entry['last_seen'] = entry['timestamp']
+            self._by_fingerprint[fingerprint] = entry
+            self.errors.append(entry)
+            self._write_line(entry)
+            return
+
+        existing['count'] += 1
+        existing['last_seen'] = entry['timestamp']
+        existing['fatal'] = existing.get('fatal', False) or entry.get('fatal', False)
+        self._write_line({
+            "type": "repeat",
+            "fingerprint": fingerprint,
+            "timestamp": entry['timestamp'],
+            "session_start": entry['session_start'],
+            "feature_id": entry.get('feature_id'),
+        })
+
+    def _write_line(self, entry: Dict):
+        """Append one JSON line to the log, rotating it when it gets too big."""
+        try:
+            self.error_log_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.error_log_file, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+                size = f.tell()
+            if size > ERROR_LOG_MAX_BYTES:
+                self._rotate()
+        except IOError:
+            pass  # Logging must never take the agent down
+
+    def _rotate(self):
+        """Shift errors.jsonl -> errors.jsonl.1 -> ... dropping the oldest."""
+        for i in range(ERROR_LOG_BACKUPS - 1, 0, -1):
+            src = self.error_log_file.with_name(f"{self.error_log_file.name}.{i}")
+            if src.exists():
+                os.replace(src, self.error_log_file.with_name(f"{self.error_log_file.name}.{i + 1}"))
+        os.replace(self.error_log_file, self.error_log_file.with_name(f"{self.error_log_file.name}.1"))
 
     def record_error(
         self,
@@ -76,10 +172,10 @@ class ErrorHandler:
             "traceback": traceback.format_exc(),
             "feature_id": feature_id,
             "fatal": fatal,
+            "fingerprint": fingerprint_error(type(error).__name__, str(error), error),
         }
 
-        self.errors.append(error_entry)
-        self._save_errors()
+        self._append(error_entry)
 
         # Print user-friendly error
         self._print_user_error(context, error, feature_id, fatal)
@@ -115,7 +211,7 @@ class ErrorHandler:
 
         if fatal:
             print("\n⛔ Execution will stop")
-            print("Check .claude/errors.json for full traceback")
+            print("Check .claude/errors.jsonl for full traceback")
         else:
             print("\n♻️  Will attempt to recover and continue")
 
@@ -142,10 +238,10 @@ class ErrorHandler:
             "context": context,
             "message": message,
             "feature_id": feature_id,
+            "fingerprint": fingerprint_error(f"warning:{context}", message),
         }
 
-        self.errors.append(warning_entry)
-        self._save_errors()
+        self._append(warning_entry)
 
         # Print warning
         print(f"\n⚠️  Warning ({context}): {message}")
@@ -158,16 +254,10 @@ class ErrorHandler:
         Get errors from current session only.
 
         Returns:
-            List of error entries from this session
+            List of error entries from this session, one per fingerprint
+            (with "count", "first_seen" and "last_seen")
         """
-        session_errors = []
-        session_start_str = self.session_start.isoformat()
-
-        for error in self.errors:
-            if error.get('session_start') == session_start_str:
-                session_errors.append(error)
-
-        return session_errors
+        return list(self.errors)
 
     def get_error_summary(self) -> Dict[str, any]:
         """
@@ -176,22 +266,23 @@ class ErrorHandler:
         Returns:
             Dictionary with error statistics
         """
-        session_errors = self.get_session_errors()
-
-        fatal_count = sum(1 for e in session_errors if e.get('fatal', False))
-        warning_count = sum(1 for e in session_errors if e.get('type') == 'warning')
-        error_count = len(session_errors) - warning_count
-
-        error_by_context = {}
-        for error in session_errors:
-            context = error.get('context', 'unknown')
-            error_by_context[context] = error_by_context.get(context, 0) + 1
-
         return {
-            'total_errors': error_count,
-            'fatal_errors': fatal_count,
-            'warnings': warning_count,
-            'errors_by_context': error_by_context,
+            'total_errors': self._index['errors'],
+            'fatal_errors': self._index['fatal'],
+            'warnings': self._index['warnings'],
+            'errors_by_context': dict(self._by_context),
+            'errors_by_fingerprint': [
+                {
+                    'fingerprint': e['fingerprint'],
+                    'type': e.get('error_type', 'warning'),
+                    'context': e.get('context', 'unknown'),
+                    'message': e.get('error_message', e.get('message', '')),
+                    'count': e['count'],
+                    'first_seen': e['first_seen'],
+                    'last_seen': e['last_seen'],
+                }
+                for e in sorted(self.errors, key=lambda e: e['count'], reverse=True)
+            ],
             'session_start': self.session_start.isoformat(),
         }
 
@@ -220,6 +311,12 @@ class ErrorHandler:
             for context, count in summary['errors_by_context'].items():
                 print(f"   {context}: {count}")
 
+        if summary['errors_by_fingerprint']:
+            print("\nBy failure mode (most frequent first):")
+            for group in summary['errors_by_fingerprint']:
+                message = group['message'][:80]
+                print(f"   [{group['fingerprint']}] {group['count']}x {group['type']}: {message}")
+
         print(f"\nFull error log: {self.error_log_file}")
         print("="*70 + "\n")
 
@@ -230,14 +327,22 @@ class ErrorHandler:
         Returns:
             True if fatal errors exist
         """
-        session_errors = self.get_session_errors()
-        return any(e.get('fatal', False) for e in session_errors)
+        return self._index['fatal'] > 0
 
     def clear_session_errors(self):
-        """Clear errors from current session (keep historical errors)."""
-        session_start_str = self.session_start.isoformat()
-        self.errors = [
-            e for e in self.errors
-            if e.get('session_start') != session_start_str
-        ]
-        self._save_errors()
+        """
+        Clear errors from current session (keep historical errors).
+
+        The log is append-only, so a "clear" marker is written instead of
+        rewriting the file; readers should drop this session's earlier
+        entries when they see it.
+        """
+        self.errors = []
+        self._by_fingerprint = {}
+        self._index = {'errors': 0, 'fatal': 0, 'warnings': 0}
+        self._by_context = {}
+        self._write_line({
+            "timestamp": datetime.now().isoformat(),
+            "session_start": self.session_start.isoformat(),
+            "type": "clear",
+        })
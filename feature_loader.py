@@ -0,0 +1,190 @@
+"""
+Feature List Loader
+===================
+
+Single loader for feature_list.json shared by the whole harness.
+
+Feature records show up in several shapes:
+- A bare list of {"description", "steps", "passes", ...} (initializer output)
+- {"features": [...]} with a "passing" key (older E2E hook format)
+- Records keyed by "id" or "name" (retry tracking)
+
+All of them are normalized into compact Feature objects. Each file version,
+identified by (mtime, size), is parsed once per process and shared by every
+caller, so the returned lists must be treated as read-only.
+
+This module only uses the standard library: it is copied into generated
+projects next to regression_tester.py.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def find_feature_list(project_dir: Path) -> Path:
+    """Locate feature_list.json (spec/ folder first, then project root)."""
+    tests_file = project_dir / "spec" / "feature_list.json"
+    if not tests_file.exists():
+        tests_file = project_dir / "feature_list.json"
+    return tests_file
+
+
+def feature_id(record: Dict, index: int) -> str:
+    """Stable identifier for a feature (explicit id/name, else its list position)."""
+    return str(record.get("id", record.get("name", f"feature-{index}")))
+
+
+def record_passes(record: Any) -> bool:
+    """Whether a raw feature record is marked as passing ("passes" or "passing")."""
+    return isinstance(record, dict) and bool(record.get("passes", record.get("passing", False)))
+
+
+def feature_records(data: Any) -> List[Dict]:
+    """Unwrap the raw feature list from either supported top-level shape."""
+    if isinstance(data, dict):
+        data = data.get("features", [])
+    if not isinstance(data, list):
+        return []
+    return [record for record in data if isinstance(record, dict)]
+
+
+class Feature:
+    """One normalized feature record."""
+
+    __slots__ = ("id", "index", "description", "category", "steps", "passes", "record")
+
+    def __init__(
+        self,
+        id: str,
+        index: int,
+        description: str = "",
+        category: Optional[str] = None,
+        steps: Tuple[str, ...] = (),
+        passes: bool = False,
+        record: Optional[Dict] = None,
+    ):
+        self.id = id
+        self.index = index
+        self.description = description
+        self.category = category
+        self.steps = steps
+        self.passes = passes
+        self.record = record if record is not None else {}
+
+    @classmethod
+    def from_record(cls, record: Dict, index: int) -> "Feature":
+        """Build a Feature from a raw feature_list.json record."""
+        return cls(
+            id=feature_id(record, index),
+            index=index,
+            description=record.get("description", ""),
+            category=record.get("category"),
+            steps=tuple(record.get("steps", ())),
+            passes=record_passes(record),
+            record=record,
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "passes":
+            return self.passes
+        if key == "id":
+            return self.id
+        return self.record[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style access to the raw record (with normalized "id" and "passes")."""
+        if key == "passes":
+            return self.passes
+        if key == "id":
+            return self.id
+        return self.record.get(key, default)
+
+    def to_dict(self) -> Dict:
+        """Raw record with normalized "passes" and list "index"."""
+        data = dict(self.record)
+        data["passes"] = self.passes
+        data.setdefault("index", self.index)
+        return data
+
+    def __repr__(self) -> str:
+        return f"Feature(id={self.id!r}, index={self.index}, passes={self.passes})"
+
+
+def parse_features(data: Any) -> List[Feature]:
+    """Normalize already-decoded feature list JSON into Feature objects."""
+    return [
+        Feature.from_record(record, index)
+        for index, record in enumerate(feature_records(data))
+    ]
+
+
+# {path: ((mtime_ns, size), [Feature, ...])}
+_cache: Dict[str, Tuple[Tuple[int, int], List[Feature]]] = {}
+
+
+def load_features(path: Path, strict: bool = False) -> List[Feature]:
+    """
+    Load and normalize a feature list file, parsing each file version once.
+
+    Args:
+        path: Path to feature_list.json
+        strict: Raise on missing/invalid files instead of returning []
+
+    Returns:
+        Shared, read-only list of Feature objects
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        if strict:
+            raise
+        return []
+
+    key = str(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    try:
+        with open(path) as f:
+            features = parse_features(json.load(f))
+    except (json.JSONDecodeError, UnicodeDecodeError, IOError):
+        if strict:
+            raise
+        return []
+
+    _cache[key] = (signature, features)
+    return features
+
+
+def load_project_features(project_dir: Path) -> List[Feature]:
+    """Load the project's feature list (spec/ first, then root), or [] if absent."""
+    return load_features(find_feature_list(project_dir))
+
+
+def set_feature_passes(path: Path, index: int, passes: bool = True) -> None:
+    """
+    Set one feature's passing state in a feature list file, keeping its shape.
+
+    The raw file is rewritten (atomically) so a bare list stays a bare list
+    and {"features": [...]} keeps its other keys.
+
+    Args:
+        path: Path to feature_list.json
+        index: Feature.index of the feature to update
+        passes: New passing state
+    """
+    with open(path) as f:
+        data = json.load(f)
+
+    record = feature_records(data)[index]
+    record["passes"] = passes
+    if "passing" in record:
+        record["passing"] = passes
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    tmp_path.replace(path)
@@ -0,0 +1,150 @@
+"""
+Feature work queue for claude-harness.
+
+Heap-backed queue of pending (failing, non-skipped) features. It is built
+once from a feature list and then updated incrementally as features pass,
+fail or get skipped, so picking the next feature is O(log n) instead of a
+scan from the top of feature_list.json on every call.
+
+Scheduling policies:
+- file_order: first pending feature in file order (the original behaviour)
+- priority: lowest "priority" value first ("critical"/"high"/"medium"/"low"
+  or a number), file order within a priority
+- category: categories in the given order, file order within a category
+- fewest_retries: features with the fewest failed attempts first
+"""
+
+import heapq
+import itertools
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from feature_loader import Feature, feature_id, record_passes
+
+
+POLICIES = ("file_order", "priority", "category", "fewest_retries")
+
+PRIORITY_NAMES = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+DEFAULT_PRIORITY = 2
+
+
+def _priority_rank(value) -> float:
+    """Map a feature's "priority" field to a sortable rank (lower runs first)."""
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        return PRIORITY_NAMES.get(value.lower(), DEFAULT_PRIORITY)
+    return DEFAULT_PRIORITY
+
+
+class FeatureQueue:
+    """Priority queue of pending features with lazy deletion."""
+
+    def __init__(
+        self,
+        features: Iterable[Union[Dict, Feature]] = (),
+        policy: str = "file_order",
+        category_order: Optional[List[str]] = None,
+        retry_count: Optional[Dict[str, int]] = None,
+        skipped: Optional[Iterable[str]] = None,
+    ):
+        """
+        Initialize feature queue.
+
+        Args:
+            features: Feature list (raw dicts or Feature objects)
+            policy: Scheduling policy (see POLICIES)
+            category_order: Category ranking for the "category" policy
+            retry_count: Current retry counts ({feature_id: count})
+            skipped: Feature ids to leave out (failed after max retries)
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy '{policy}', expected one of {POLICIES}")
+
+        self.policy = policy
+        self.category_rank = {name: rank for rank, name in enumerate(category_order or [])}
+        self.retry_count = retry_count if retry_count is not None else {}
+        self.skipped = set(skipped or ())
+
+        self._heap: List[Tuple[tuple, int, str]] = []
+        self._entries: Dict[str, Tuple[int, Union[Dict, Feature], int]] = {}  # {id: (index, item, version)}
+        self._versions = itertools.count()
+
+        self.sync(features)
+
+    def _key(self, fid: str, index: int, item: Union[Dict, Feature]) -> tuple:
+        """Sort key for the configured policy (ties broken by file order)."""
+        if self.policy == "priority":
+            return (_priority_rank(item.get("priority")), index)
+        if self.policy == "category":
+            category = item.get("category")
+            return (self.category_rank.get(category, len(self.category_rank)), index)
+        if self.policy == "fewest_retries":
+            return (self.retry_count.get(fid, 0), index)
+        return (index,)
+
+    def _push(self, fid: str, index: int, item: Union[Dict, Feature]) -> None:
+        version = next(self._versions)
+        self._entries[fid] = (index, item, version)
+        heapq.heappush(self._heap, (self._key(fid, index, item), version, fid))
+
+    def sync(self, features: Iterable[Union[Dict, Feature]]) -> None:
+        """
+        Bring the queue in line with a (possibly changed) feature list.
+
+        Only features that are new, newly pending, moved or no longer
+        pending touch the heap; unchanged pending features just get their
+        record reference refreshed.
+        """
+        seen = set()
+        for index, item in enumerate(features):
+            if isinstance(item, Feature):
+                fid, passes = item.id, item.passes
+            else:
+                fid, passes = feature_id(item, index), record_passes(item)
+            seen.add(fid)
+
+            entry = self._entries.get(fid)
+            if passes or fid in self.skipped:
+                self._entries.pop(fid, None)
+            elif entry is None or entry[0] != index:
+                self._push(fid, index, item)
+            else:
+                self._entries[fid] = (index, item, entry[2])
+
+        # Features removed from the list
+        for fid in list(self._entries):
+            if fid not in seen:
+                del self._entries[fid]
+
+    def peek(self) -> Optional[Union[Dict, Feature]]:
+        """Next feature to work on, or None if nothing is pending."""
+        while self._heap:
+            _, version, fid = self._heap[0]
+            entry = self._entries.get(fid)
+            if entry is not None and entry[2] == version:
+                return entry[1]
+            heapq.heappop(self._heap)  # Stale entry (passed, skipped or re-keyed)
+        return None
+
+    def mark_passed(self, fid: str) -> None:
+        """Remove a feature that now passes."""
+        self._entries.pop(fid, None)
+
+    def mark_skipped(self, fid: str) -> None:
+        """Remove a feature that hit max retries."""
+        self.skipped.add(fid)
+        self._entries.pop(fid, None)
+
+    def mark_failed(self, fid: str) -> None:
+        """Re-rank a feature after a failed attempt (only matters for fewest_retries)."""
+        entry = self._entries.get(fid)
+        if entry is not None and self.policy == "fewest_retries":
+            index, item, _ = entry
+            self._push(fid, index, item)
+
+    def unskip(self, fid: str) -> None:
+        """Allow a previously skipped feature back into the queue on next sync."""
+        self.skipped.discard(fid)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,275 @@
+"""
+Feature Store
+=============
+
+SQLite-backed index over spec/feature_list.json.
+
+feature_list.json stays the agent-facing source of truth. The store mirrors it
+into .claude/features.db and only re-imports when the file's (mtime, size)
+changes, so hot paths (progress counts, completion check, next-feature
+selection, E2E hook) run indexed queries instead of re-parsing the JSON.
+
+Tables:
+- features: one row per feature (position, id, passes, category, retry state,
+  original JSON record), indexed on id, passes, category and retry state
+- meta: source file signature of the last import
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from feature_loader import Feature, find_feature_list, load_features, parse_features
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    position INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    passes INTEGER NOT NULL DEFAULT 0,
+    category TEXT,
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_features_id ON features (id);
+CREATE INDEX IF NOT EXISTS idx_features_passes ON features (passes, skipped, position);
+CREATE INDEX IF NOT EXISTS idx_features_category ON features (category, passes, position);
+CREATE INDEX IF NOT EXISTS idx_features_retry ON features (skipped, retry_count);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class FeatureStore:
+    """Indexed SQLite mirror of a project's feature_list.json."""
+
+    def __init__(self, project_dir: Path):
+        """
+        Initialize feature store.
+
+        Args:
+            project_dir: Project directory containing feature_list.json
+        """
+        self.project_dir = project_dir
+        self.db_path = project_dir / ".claude" / "features.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.executescript(SCHEMA)
+
+    @property
+    def feature_file(self) -> Path:
+        return find_feature_list(self.project_dir)
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _file_signature(self) -> Optional[str]:
+        try:
+            stat = self.feature_file.stat()
+        except OSError:
+            return None
+        return f"{self.feature_file}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def sync(self) -> bool:
+        """
+        Re-import feature_list.json if it changed since the last import.
+
+        Returns:
+            True if the store now reflects a readable feature list
+        """
+        signature = self._file_signature()
+        if signature is None:
+            # Feature list removed (or never created) - nothing to index
+            with self._conn:
+                self._conn.execute("DELETE FROM features")
+                self._conn.execute("DELETE FROM meta WHERE key = 'source'")
+            return False
+
+        if signature == self._get_meta("source"):
+            return True
+
+        try:
+            features = load_features(self.feature_file, strict=True)
+        except (json.JSONDecodeError, UnicodeDecodeError, IOError):
+            # Mid-write or corrupted - keep serving the last good import
+            return self._get_meta("source") is not None
+
+        self.import_features(features, signature)
+        return True
+
+    def import_features(self, features, signature: str = "") -> None:
+        """
+        Replace the indexed features with the given feature list.
+
+        Retry state is carried over for features whose id survives the import.
+
+        Args:
+            features: Feature objects, or raw feature list JSON (either shape)
+            signature: Source signature recorded for change detection
+        """
+        if not (isinstance(features, list) and all(isinstance(f, Feature) for f in features)):
+            features = parse_features(features)
+
+        retry_state = {
+            row[0]: (row[1], row[2])
+            for row in self._conn.execute(
+                "SELECT id, retry_count, skipped FROM features WHERE retry_count > 0 OR skipped > 0"
+            )
+        }
+
+        rows = []
+        for feature in features:
+            retry_count, skipped = retry_state.get(feature.id, (0, 0))
+            rows.append((
+                feature.index, feature.id, int(feature.passes), feature.category,
+                retry_count, skipped, json.dumps(feature.record),
+            ))
+
+        with self._conn:
+            self._conn.execute("DELETE FROM features")
+            self._conn.executemany(
+                "INSERT INTO features (position, id, passes, category, retry_count, skipped, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)", (signature,)
+            )
+
+    def export_json(self, path: Optional[Path] = None) -> Path:
+        """
+        Write the indexed features back out in feature_list.json format.
+
+        Args:
+            path: Destination (defaults to the project's feature_list.json)
+
+        Returns:
+            Path written
+        """
+        path = path or self.feature_file
+        features = []
+        for passes, data in self._conn.execute(
+            "SELECT passes, data FROM features ORDER BY position"
+        ):
+            feature = json.loads(data)
+            feature["passes"] = bool(passes)
+            features.append(feature)
+
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(features, f, indent=2)
+        tmp_path.replace(path)
+
+        if path == self.feature_file:
+            # Our own write must not trigger a re-import
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)",
+                    (self._file_signature(),),
+                )
+        return path
+
+    def counts(self) -> Tuple[int, int]:
+        """
+        Count passing and total features.
+
+        Returns:
+            (passing_count, total_count)
+        """
+        self.sync()
+        total, passing = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(passes), 0) FROM features"
+        ).fetchone()
+        return passing, total
+
+    def _feature(self, row) -> Optional[Feature]:
+        """Build a Feature from a (position, data) row."""
+        if row is None:
+            return None
+        position, data = row
+        return Feature.from_record(json.loads(data), position)
+
+    def get(self, fid: str) -> Optional[Feature]:
+        """Get a feature by id."""
+        self.sync()
+        row = self._conn.execute(
+            "SELECT position, data FROM features WHERE id = ? ORDER BY position LIMIT 1", (fid,)
+        ).fetchone()
+        return self._feature(row)
+
+    def next_pending(self, category: Optional[str] = None, include_skipped: bool = False) -> Optional[Feature]:
+        """
+        Get the first failing feature in file order.
+
+        Args:
+            category: Only consider features in this category
+            include_skipped: Also return features skipped after max retries
+
+        Returns:
+            Feature, or None if all are passing (or skipped)
+        """
+        self.sync()
+        query = "SELECT position, data FROM features WHERE passes = 0"
+        params: List = []
+        if not include_skipped:
+            query += " AND skipped = 0"
+        if category is not None:
+            query += " AND category = ?"
+            params.append(category)
+        query += " ORDER BY position LIMIT 1"
+
+        return self._feature(self._conn.execute(query, params).fetchone())
+
+    def passing_ids(self) -> List[str]:
+        """Ids of all passing features, in file order."""
+        self.sync()
+        return [
+            row[0] for row in self._conn.execute(
+                "SELECT id FROM features WHERE passes = 1 ORDER BY position"
+            )
+        ]
+
+    def set_retry_state(self, fid: str, retry_count: int, skipped: bool) -> None:
+        """Mirror a feature's retry count and skip flag into the index."""
+        with self._conn:
+            self._conn.execute(
+                "UPDATE features SET retry_count = ?, skipped = ? WHERE id = ?",
+                (retry_count, int(skipped), fid),
+            )
+
+    def load_retry_state(self, retry_count: Dict[str, int], skipped: Iterable[str]) -> None:
+        """Replace all retry state in the index (e.g. from RetryManager on startup)."""
+        self.sync()
+        skipped = set(skipped)
+        with self._conn:
+            self._conn.execute("UPDATE features SET retry_count = 0, skipped = 0")
+            self._conn.executemany(
+                "UPDATE features SET retry_count = ?, skipped = ? WHERE id = ?",
+                [
+                    (retry_count.get(fid, 0), int(fid in skipped), fid)
+                    for fid in set(retry_count) | skipped
+                ],
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+_stores: Dict[Path, FeatureStore] = {}
+
+
+def get_feature_store(project_dir: Path) -> FeatureStore:
+    """Get the shared FeatureStore for a project (one connection per process)."""
+    key = project_dir.resolve()
+    store = _stores.get(key)
+    if store is None:
+        store = FeatureStore(project_dir)
+        _stores[key] = store
+    return store
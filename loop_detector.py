@@ -8,17 +8,77 @@ Triple Timeout Protection:
 1. No initial response (15 min) - API never responded
 2. Stall timeout (10 min) - API stopped responding mid-session
 3. Session timeout (120 min) - Overall session limit
+
+Cycle detection:
+Each tool call is hashed as (tool name, normalized input). For every period
+length 2..MAX_CYCLE_LENGTH the detector counts how many consecutive calls
+matched the call one period earlier, so a sequence like Edit -> Bash(npm
+test) -> Read with identical inputs is flagged once the whole period has
+repeated CYCLE_REPEAT_THRESHOLD times back to back. A differing call (a
+new Edit between build/test runs) breaks the run. Memory is bounded by the
+window and each call is O(1).
+
+Background work:
+With a ProgressProbe attached, idle periods are checked for project file
+changes and busy child processes every PROBE_INTERVAL_SECONDS, so a long
+npm install or build keeps the stall timer from firing.
+
+Adaptive stall timeouts:
+With a GapHistogram attached, the gap after each tool call is recorded
+under the call's category, and the stall timeout for the current wait is
+derived from that category's history (capped by stall_timeout_minutes).
 """
 
+import json
+import re
 import time
-from collections import defaultdict
-from typing import Dict, Tuple
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from progress_probe import ProgressProbe
+from stall_history import GapHistogram
+from tool_registry import classify_tool
+
+
+# Tool calls kept in the rolling cycle-detection window
+CYCLE_WINDOW = 60
+
+# Longest tool cycle looked for (n-gram length)
+MAX_CYCLE_LENGTH = 4
+
+# Back-to-back repeats of the same tool cycle that count as a loop
+CYCLE_REPEAT_THRESHOLD = 3
+
+# Minimum seconds between progress probe polls while idle
+PROBE_INTERVAL_SECONDS = 30
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def tool_signature(tool_type: str, tool_input: Any = None, path: str = "") -> int:
+    """Hash a tool call by name and whitespace-normalized input."""
+    if tool_input is None:
+        normalized = path
+    elif isinstance(tool_input, (dict, list)):
+        normalized = json.dumps(tool_input, sort_keys=True, default=str)
+    else:
+        normalized = str(tool_input)
+    return hash((tool_type, _WHITESPACE.sub(" ", normalized).strip()))
 
 
 class LoopDetector:
     """Detect when agent is stuck in a loop or hanging."""
 
-    def __init__(self, max_repeated_reads: int = 3, session_timeout_minutes: int = 120, stall_timeout_minutes: int = 10):
+    def __init__(
+        self,
+        max_repeated_reads: int = 3,
+        session_timeout_minutes: int = 120,
+        stall_timeout_minutes: int = 10,
+        cycle_window: int = CYCLE_WINDOW,
+        cycle_threshold: int = CYCLE_REPEAT_THRESHOLD,
+        progress_probe: Optional[ProgressProbe] = None,
+        gap_histogram: Optional[GapHistogram] = None,
+    ):
         """
         Initialize loop detector with timeout thresholds.
 
@@ -26,29 +86,93 @@ class LoopDetector:
             max_repeated_reads: Max times same file can be read before flagging
             session_timeout_minutes: Overall session timeout (default: 120 min)
             stall_timeout_minutes: Timeout for no tool activity (default: 10 min)
+            cycle_window: Tool calls kept for cycle detection
+            cycle_threshold: Back-to-back repeats of one tool cycle that flag a loop
+            progress_probe: Optional filesystem/child-process activity probe
+            gap_histogram: Optional per-category gap history for adaptive stall timeouts
         """
         self.max_repeated_reads = max_repeated_reads
         self.session_timeout = session_timeout_minutes * 60
         self.stall_timeout = stall_timeout_minutes * 60  # No tool activity timeout
+        self.cycle_window = cycle_window
+        self.cycle_threshold = cycle_threshold
+        self.progress_probe = progress_probe
+        self.gap_histogram = gap_histogram
 
         self.session_start = time.time()
         self.file_reads = defaultdict(int)
+        self.category_counts = defaultdict(int)  # {tool_type: count}
         self.tool_count = 0
         self.last_progress = None  # Don't start stall timer until first tool call
+        self.last_probe = 0.0
+        self.background_activity = ""  # Last activity reported by the probe
+        self.last_tool_time: Optional[float] = None
+        self.last_category: Optional[str] = None
+
+        # Rolling window of (signature, tool_type), and per period length the
+        # number of consecutive calls equal to the call one period earlier
+        self._recent: Deque[Tuple[int, str]] = deque(maxlen=max(cycle_window, MAX_CYCLE_LENGTH + 1))
+        self._period_runs: Dict[int, int] = {length: 0 for length in range(2, MAX_CYCLE_LENGTH + 1)}
+        self._cycle: Optional[Tuple[int, int, str]] = None  # (length, repeats, tools)
 
-    def track_tool(self, tool_type: str, path: str = ""):
+    def track_tool(self, tool_type: str, path: str = "", tool_input: Any = None):
         """
         Track a tool call for progress monitoring.
 
         Args:
             tool_type: Type of tool used (e.g., 'read', 'write', 'bash')
             path: File path if applicable
+            tool_input: Raw tool input, used to spot repeated tool cycles
         """
+        now = time.time()
+        if self.gap_histogram is not None and self.last_tool_time is not None:
+            self.gap_histogram.record(self.last_category, now - self.last_tool_time)
+
         self.tool_count += 1
-        self.last_progress = time.time()
+        self.category_counts[tool_type] += 1
+        self.last_progress = now
+        self.last_tool_time = now
+        self.last_category = tool_type
 
         if tool_type == "read" and path:
             self.file_reads[path] += 1
+        elif tool_type == "write":
+            # Re-reading files after changing them is normal - count reads since the last write
+            self.file_reads.clear()
+
+        self._track_cycle(tool_signature(tool_type, tool_input, path), tool_type)
+
+    def track_tool_use(self, tool_name: str, tool_input: Any = None):
+        """
+        Classify a raw SDK tool call via the tool registry and track it.
+
+        Args:
+            tool_name: Tool name as reported by the SDK (e.g. "Read", "Bash")
+            tool_input: Tool input dict
+        """
+        use = classify_tool(tool_name, tool_input)
+        self.track_tool(use.category, use.path, tool_input=tool_input)
+
+        # Bash reads can touch several files (cat a b)
+        if use.category == "read":
+            for path in use.paths[1:]:
+                self.file_reads[path] += 1
+
+    def _track_cycle(self, signature: int, tool_type: str):
+        """Push a call into the rolling window and update the per-period runs (O(1))."""
+        self._recent.append((signature, tool_type))
+
+        for length in self._period_runs:
+            if length < len(self._recent) and self._recent[-1 - length][0] == signature:
+                self._period_runs[length] += 1
+            else:
+                self._period_runs[length] = 0
+
+            # The last run + length calls repeat with this period
+            repeats = (self._period_runs[length] + length) // length
+            if repeats >= self.cycle_threshold and self._cycle is None:
+                tools = " -> ".join(t for _, t in list(self._recent)[-length:])
+                self._cycle = (length, repeats, tools)
 
     def check(self) -> Tuple[bool, str]:
         """
@@ -73,7 +197,15 @@ class LoopDetector:
         # Prevents hanging when API stops responding mid-session
         if self.last_progress is not None:
             time_since_progress = time.time() - self.last_progress
-            if time_since_progress > self.stall_timeout:
+            if time_since_progress > PROBE_INTERVAL_SECONDS and self._probe_activity():
+                time_since_progress = 0
+            stall_timeout = self.stall_threshold()
+            if time_since_progress > stall_timeout:
+                if stall_timeout < self.stall_timeout:
+                    return True, (
+                        f"No tool activity for {time_since_progress/60:.1f} minutes after "
+                        f"'{self.last_category}' (stalled, learned limit {stall_timeout/60:.1f} min)"
+                    )
                 return True, f"No tool activity for {time_since_progress/60:.0f} minutes (stalled)"
 
         # Check 4: Repeated file reads - agent stuck reading same files
@@ -85,18 +217,64 @@ class LoopDetector:
         # If agent has done 30+ tools but all reads, likely stuck
         if self.tool_count > 30:
             # Count non-read tools
-            non_reads = self.tool_count - sum(self.file_reads.values())
+            non_reads = self.tool_count - self.category_counts["read"]
             if non_reads == 0:
                 return True, f"{self.tool_count} reads, 0 writes/edits"
 
+        # Check 6: Repeated tool cycle with identical inputs
+        if self._cycle is not None:
+            length, repeats, tools = self._cycle
+            return True, f"Repeating {length}-tool cycle {repeats} times ({tools})"
+
         return False, ""
 
+    def stall_threshold(self) -> float:
+        """Stall timeout in seconds for the wait after the last tool call."""
+        if self.gap_histogram is None or self.last_category is None:
+            return self.stall_timeout
+        return self.gap_histogram.stall_threshold(self.last_category, self.stall_timeout)
+
+    def _probe_activity(self) -> bool:
+        """
+        Poll the progress probe (rate limited) and count activity as progress.
+
+        Returns:
+            True if background work was seen
+        """
+        now = time.time()
+        if self.progress_probe is None or now - self.last_probe < PROBE_INTERVAL_SECONDS:
+            return False
+        self.last_probe = now
+
+        activity = self.progress_probe.poll()
+        if activity:
+            self.last_progress = now
+            self.background_activity = activity
+            return True
+        return False
+
+    def flush(self):
+        """Persist the learned gap history (if any)."""
+        if self.gap_histogram is not None:
+            self.gap_histogram.save()
+
     def reset(self):
         """Reset detector for new session (fresh context)."""
         self.session_start = time.time()
         self.file_reads.clear()
+        self.category_counts.clear()
         self.tool_count = 0
         self.last_progress = None  # Don't start stall timer until first tool call
+        self._recent.clear()
+        self._period_runs = dict.fromkeys(self._period_runs, 0)
+        self._cycle = None
+        self.last_probe = 0.0
+        self.background_activity = ""
+        self.last_tool_time = None
+        self.last_category = None
+        self.flush()
+        if self.progress_probe is not None:
+            self.progress_probe.reset()
 
     def get_stats(self) -> Dict[str, any]:
         """
@@ -115,4 +293,10 @@ class LoopDetector:
             "tool_count": self.tool_count,
             "time_since_last_tool_minutes": time_since_progress / 60 if time_since_progress else None,
             "repeated_reads": dict(self.file_reads),
+            "tools_by_category": dict(self.category_counts),
+            "background_activity": self.background_activity,
+            "stall_threshold_minutes": self.stall_threshold() / 60,
+            "max_cycle_repeats": max(
+                (run + length) // length if run else 0 for length, run in self._period_runs.items()
+            ),
         }
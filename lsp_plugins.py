@@ -13,6 +13,8 @@ import subprocess
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from project_walker import walk_project
+
 
 class LSPPluginManager:
     """
@@ -123,6 +125,8 @@ class LSPPluginManager:
             List of detected language identifiers
         """
         detected = []
+        # One scandir of the top level instead of a glob per extension
+        suffixes = {Path(entry.name).suffix for entry in walk_project(self.project_dir, max_depth=0)}
 
         # Check for common project files/patterns
         if (self.project_dir / "package.json").exists() or \
@@ -145,20 +149,19 @@ class LSPPluginManager:
             detected.append("java")
 
         if (self.project_dir / "CMakeLists.txt").exists() or \
-           list(self.project_dir.glob("*.c")) or \
-           list(self.project_dir.glob("*.cpp")):
+           suffixes & {".c", ".cpp"}:
             detected.append("c_cpp")
 
-        if list(self.project_dir.glob("*.csproj")):
+        if ".csproj" in suffixes:
             detected.append("csharp")
 
         if (self.project_dir / "composer.json").exists():
             detected.append("php")
 
-        if list(self.project_dir.glob("*.swift")):
+        if ".swift" in suffixes:
             detected.append("swift")
 
-        if list(self.project_dir.glob("*.lua")):
+        if ".lua" in suffixes:
             detected.append("lua")
 
         return detected
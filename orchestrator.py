@@ -0,0 +1,378 @@
+"""
+Multi-Project Orchestrator
+==========================
+
+Drives several autonomous agent runs concurrently.
+
+Each job is a (project_dir, spec, mode) triple. Every job goes through
+run_autonomous_agent(), which builds its own RetryManager, ErrorHandler and
+LoopDetector for its project directory, and runs on its own thread with its
+own event loop: agent code does blocking subprocess, git, scandir and /proc
+I/O, which on a shared loop would stall every other job. The main loop only
+bounds concurrency and reports progress.
+
+Output is line-buffered per job and every line is prefixed with the job's
+project name (extended with parent directories when two projects share a
+name), so concurrent jobs don't interleave mid-line.
+
+Jobs can be given as:
+- A JSON or YAML file containing a list of jobs (or {"jobs": [...]})
+- A directory of JSON/YAML job files (one job per file)
+"""
+
+import asyncio
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+from progress import count_passing_tests
+
+
+# Configuration
+DEFAULT_CONCURRENCY = 4
+PROGRESS_INTERVAL_SECONDS = 60
+JOB_FILE_SUFFIXES = (".json", ".yaml", ".yml")
+
+# Job whose code is running (None on the orchestrator itself)
+_current_job: contextvars.ContextVar[Optional["ProjectJob"]] = contextvars.ContextVar("current_job", default=None)
+
+
+@dataclass
+class ProjectJob:
+    """One project to drive with the autonomous agent."""
+    project_dir: Path
+    spec: Optional[str] = None
+    mode: str = "greenfield"
+    max_iterations: Optional[int] = None
+    status: str = "pending"
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: str = ""
+    label: str = ""  # Set by run_projects when project names collide
+
+    @property
+    def name(self) -> str:
+        return self.label or self.project_dir.name
+
+
+@dataclass
+class OrchestratorResult:
+    """Outcome of an orchestrated run."""
+    jobs: List[ProjectJob] = field(default_factory=list)
+
+    @property
+    def failed(self) -> List[ProjectJob]:
+        return [job for job in self.jobs if job.status == "failed"]
+
+
+def _job_from_dict(entry: dict, base_dir: Path) -> ProjectJob:
+    """Build a ProjectJob from a job file entry (relative paths resolve against base_dir)."""
+    if "project_dir" not in entry:
+        raise ValueError(f"Job entry is missing 'project_dir': {entry}")
+
+    project_dir = Path(entry["project_dir"])
+    if not project_dir.is_absolute():
+        project_dir = base_dir / project_dir
+
+    spec = entry.get("spec")
+    if spec and not Path(spec).is_absolute():
+        spec = str(base_dir / spec)
+
+    mode = entry.get("mode", "greenfield")
+    if mode in ["enhancement", "bugfix"] and not spec:
+        raise ValueError(f"Job for {project_dir} needs a 'spec' in {mode} mode")
+
+    return ProjectJob(
+        project_dir=project_dir,
+        spec=spec,
+        mode=mode,
+        max_iterations=entry.get("max_iterations"),
+    )
+
+
+def _read_job_file(path: Path) -> list:
+    """Read a JSON or YAML job file and return its raw entries."""
+    with open(path) as f:
+        if path.suffix == ".json":
+            data = json.load(f)
+        else:
+            data = yaml.safe_load(f)
+
+    if isinstance(data, dict):
+        data = data.get("jobs", [data])
+    return data or []
+
+
+def load_jobs(source: Path) -> List[ProjectJob]:
+    """
+    Load jobs from a job file or a directory of job files.
+
+    Args:
+        source: JSON/YAML job file, or directory containing job files
+
+    Returns:
+        List of ProjectJob, in file order
+    """
+    if source.is_dir():
+        job_files = sorted(
+            p for p in source.iterdir()
+            if p.is_file() and p.suffix in JOB_FILE_SUFFIXES
+        )
+    else:
+        job_files = [source]
+
+    jobs = []
+    for job_file in job_files:
+        for entry in _read_job_file(job_file):
+            jobs.append(_job_from_dict(entry, job_file.parent))
+
+    # Two jobs writing into the same project directory would corrupt each other
+    seen = set()
+    for job in jobs:
+        key = job.project_dir.resolve()
+        if key in seen:
+            raise ValueError(f"Duplicate project_dir in jobs: {job.project_dir}")
+        seen.add(key)
+
+    return jobs
+
+
+def _label_jobs(jobs: List[ProjectJob]) -> None:
+    """Label jobs whose project directories share a name by their path below a common parent."""
+    by_name: Dict[str, List[ProjectJob]] = {}
+    for job in jobs:
+        by_name.setdefault(job.project_dir.name, []).append(job)
+    for same in by_name.values():
+        if len(same) < 2:
+            continue
+        common = os.path.commonpath([job.project_dir.resolve().parent for job in same])
+        for job in same:
+            job.label = os.path.relpath(job.project_dir.resolve(), common)
+
+
+class JobOutput:
+    """
+    stdout wrapper that prefixes each job's lines with its project name.
+
+    Text written from a job's context is buffered until a newline, so lines
+    from concurrent jobs never interleave; other writes pass straight through.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._partial: Dict[int, str] = {}  # {id(job): text after the last newline}
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        job = _current_job.get()
+        with self._lock:
+            if job is None:
+                self.stream.write(text)
+                return len(text)
+            *lines, rest = (self._partial.pop(id(job), "") + text).split("\n")
+            for line in lines:
+                self.stream.write(f"[{job.name}] {line}\n")
+            if rest:
+                self._partial[id(job)] = rest
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            self.stream.flush()
+
+    def finish(self, job: ProjectJob):
+        """Write out a job's unterminated last line."""
+        with self._lock:
+            rest = self._partial.pop(id(job), "")
+            if rest:
+                self.stream.write(f"[{job.name}] {rest}\n")
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _run_job_in_thread(job: ProjectJob, run_agent: Callable, kwargs: dict, loops: Dict[int, tuple]):
+    """Run one job's agent on a fresh event loop in the calling (worker) thread."""
+    _current_job.set(job)
+    loop = asyncio.new_event_loop()
+    try:
+        task = loop.create_task(run_agent(**kwargs))
+        loops[id(job)] = (loop, task)
+        loop.run_until_complete(task)
+    finally:
+        loops.pop(id(job), None)
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+        if isinstance(sys.stdout, JobOutput):
+            sys.stdout.finish(job)
+
+
+def print_combined_progress(jobs: List[ProjectJob]) -> None:
+    """Print one progress line per job, built on count_passing_tests()."""
+    print("\n" + "=" * 70)
+    print("  ORCHESTRATOR PROGRESS")
+    print("=" * 70)
+
+    total_passing = 0
+    total_features = 0
+    for job in jobs:
+        passing, total = count_passing_tests(job.project_dir)
+        total_passing += passing
+        total_features += total
+
+        if total > 0:
+            progress = f"{passing}/{total} ({passing / total * 100:.1f}%)"
+        else:
+            progress = "no feature_list.json yet"
+
+        elapsed = ""
+        if job.started_at is not None:
+            end = job.finished_at if job.finished_at is not None else time.time()
+            elapsed = f" [{(end - job.started_at) / 60:.0f} min]"
+
+        print(f"  {job.name:<30} {job.status:<10} {progress}{elapsed}")
+
+    if total_features > 0:
+        print(f"\n  Overall: {total_passing}/{total_features} features passing "
+              f"({total_passing / total_features * 100:.1f}%)")
+    print("=" * 70 + "\n")
+
+
+async def _run_job(
+    job: ProjectJob,
+    semaphore: asyncio.Semaphore,
+    executor: ThreadPoolExecutor,
+    run_agent: Callable,
+    loops: Dict[int, tuple],
+    model: str,
+    session_timeout_minutes: int,
+    stall_timeout_minutes: int,
+    max_retries: int,
+) -> None:
+    """Run one job on its own thread once a concurrency slot is free."""
+    async with semaphore:
+        job.status = "running"
+        job.started_at = time.time()
+        kwargs = dict(
+            project_dir=job.project_dir,
+            model=model,
+            max_iterations=job.max_iterations,
+            mode=job.mode,
+            spec_file=job.spec,
+            session_timeout_minutes=session_timeout_minutes,
+            stall_timeout_minutes=stall_timeout_minutes,
+            max_retries=max_retries,
+        )
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                executor, _run_job_in_thread, job, run_agent, kwargs, loops,
+            )
+            job.status = "done"
+        except asyncio.CancelledError:
+            # The thread can't be cancelled from here: cancel the job's own task
+            loop, task = loops.get(id(job), (None, None))
+            if loop is not None:
+                loop.call_soon_threadsafe(task.cancel)
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            # One failing project must not take down the others
+            job.status = "failed"
+            job.error = str(e)
+            print(f"\n❌ Job {job.name} failed: {e}\n")
+        finally:
+            job.finished_at = time.time()
+
+
+async def _report_progress(jobs: List[ProjectJob], interval: float) -> None:
+    """Periodically print the combined progress view until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        print_combined_progress(jobs)
+
+
+async def run_projects(
+    jobs: List[ProjectJob],
+    model: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    session_timeout_minutes: int = 120,
+    stall_timeout_minutes: int = 10,
+    max_retries: int = 3,
+    progress_interval: float = PROGRESS_INTERVAL_SECONDS,
+    run_agent: Optional[Callable] = None,
+) -> OrchestratorResult:
+    """
+    Run several projects concurrently with a bounded number of active jobs.
+
+    Args:
+        jobs: Jobs to run
+        model: Claude model to use for every job
+        concurrency: Maximum number of jobs running at once
+        session_timeout_minutes: Overall session timeout per job
+        stall_timeout_minutes: No-activity timeout per job
+        max_retries: Max retry attempts per feature per job
+        progress_interval: Seconds between combined progress reports
+        run_agent: Coroutine function run per job (default: run_autonomous_agent)
+
+    Returns:
+        OrchestratorResult with the final status of every job
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if run_agent is None:
+        from agent import run_autonomous_agent as run_agent
+    _label_jobs(jobs)
+
+    print("\n" + "=" * 70)
+    print("  MULTI-PROJECT ORCHESTRATOR")
+    print("=" * 70)
+    print(f"\nJobs: {len(jobs)}")
+    print(f"Concurrency: {concurrency}")
+    print(f"Model: {model}")
+    for job in jobs:
+        print(f"   - {job.project_dir} ({job.mode})")
+    print()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job")
+    loops: Dict[int, tuple] = {}  # {id(job): (event loop, agent task)} of running jobs
+    stdout = sys.stdout
+    sys.stdout = JobOutput(stdout)
+    reporter = asyncio.create_task(_report_progress(jobs, progress_interval))
+
+    try:
+        await asyncio.gather(*[
+            _run_job(
+                job, semaphore, executor, run_agent, loops, model,
+                session_timeout_minutes, stall_timeout_minutes, max_retries,
+            )
+            for job in jobs
+        ])
+    finally:
+        sys.stdout = stdout
+        executor.shutdown(wait=False)
+        reporter.cancel()
+        try:
+            await reporter
+        except asyncio.CancelledError:
+            pass
+
+    print_combined_progress(jobs)
+
+    result = OrchestratorResult(jobs=jobs)
+    if result.failed:
+        print("Failed jobs:")
+        for job in result.failed:
+            print(f"   - {job.name}: {job.error}")
+    return result
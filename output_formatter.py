@@ -5,6 +5,9 @@ Output Formatter for Better Readability
 Formats agent tool use output to be more human-readable.
 """
 
+from tool_registry import CATEGORY_EMOJI, classify_tool
+
+
 def format_tool_output(tool_name: str, tool_input: dict, result: str = None) -> str:
     """Format tool usage in a readable way (compact version)."""
     
@@ -22,7 +25,8 @@ def format_tool_output(tool_name: str, tool_input: dict, result: str = None) ->
         "Glob": "📂",
     }
     
-    emoji = tool_labels.get(tool_name, "🔧")
+    use = classify_tool(tool_name, tool_input)
+    emoji = tool_labels.get(tool_name, CATEGORY_EMOJI.get(use.category, "🔧"))
     
     output = f"\n{emoji} {tool_name}: "
     
@@ -44,7 +48,7 @@ def format_tool_output(tool_name: str, tool_input: dict, result: str = None) ->
         output += file
     
     elif tool_name == "Read":
-        file = tool_input.get('target_file', '').split('/')[-1]
+        file = use.path.split('/')[-1]
         output += file
     
     elif tool_name == "Bash":
@@ -65,6 +69,9 @@ def format_tool_output(tool_name: str, tool_input: dict, result: str = None) ->
         else:
             output += "browser action"
     
+    elif use.path:
+        output += use.path.split('/')[-1]
+
     else:
         # Generic fallback - just show tool name
         output += "executing..."
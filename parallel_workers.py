@@ -0,0 +1,474 @@
+"""
+Parallel Feature Workers
+========================
+
+Runs N coding sessions at once against one project, each in its own git
+worktree and each on a different failing feature from spec/feature_list.json.
+
+Flow per worker:
+1. Claim the next "passes": false feature nobody else is working on
+2. Reset the worker's worktree to the current main-checkout HEAD
+3. Run a coding session restricted to the claimed feature
+4. Merge the worker branch back into the main checkout (serialized),
+   re-run validation, and only keep the merge if validation passes
+
+Worktrees live next to the project (<project>.worktrees/worker-N) so they
+never show up inside the project tree, its git status or its scanners.
+"""
+
+import asyncio
+import subprocess
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from progress import print_progress_summary
+from prompts import get_coding_prompt
+from loop_detector import LoopDetector
+from progress_probe import ProgressProbe
+from stall_history import GapHistogram
+from retry_manager import RetryManager
+from error_handler import ErrorHandler
+from security_audit import flush_all as flush_security_audit
+from feature_loader import Feature, load_features, set_feature_passes
+from validators.test_runner import TestRunner
+
+
+FEATURE_LIST_PATH = "spec/feature_list.json"
+WORKER_BRANCH_PREFIX = "harness/worker-"
+
+# Harness state (error/audit logs, retry journal, stores) - never part of a worker's commits
+HARNESS_STATE_DIR = ".claude"
+
+# Line added to info/exclude so `git add .` in a worktree skips harness state
+HARNESS_STATE_EXCLUDE = f"/{HARNESS_STATE_DIR}/"
+
+
+class GitError(RuntimeError):
+    """A git command failed."""
+
+
+def _git(cwd: Path, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+    """Run a git command in cwd."""
+    result = subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if check and result.returncode != 0:
+        raise GitError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result
+
+
+async def _git_async(cwd: Path, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+    """_git() on a worker thread, so other workers' sessions keep streaming."""
+    return await asyncio.to_thread(_git, cwd, *args, check=check)
+
+
+def build_worker_prompt(base_prompt: str, feature: Feature, worker_id: int, workers: int) -> str:
+    """Append a single-feature assignment to the normal coding prompt."""
+    index = feature.index
+    steps = "\n".join(f"   - {step}" for step in feature.steps)
+    return f"""{base_prompt}
+
+---
+
+## PARALLEL WORKER ASSIGNMENT
+
+You are worker {worker_id} of {workers}, running in an isolated git worktree.
+Other workers are implementing other features at the same time.
+
+Work ONLY on feature #{index} in {FEATURE_LIST_PATH}:
+
+   Category: {feature.category or "unknown"}
+   Description: {feature.description}
+   Steps:
+{steps}
+
+Rules for this session:
+- Do NOT start any other feature, even if this one finishes early
+- When this feature is implemented and verified, set "passes": true for
+  feature #{index} ONLY, then commit all of your work
+- If you cannot finish it, commit nothing and leave "passes": false
+"""
+
+
+class FeatureClaims:
+    """Hands out distinct failing features to workers."""
+
+    def __init__(self, project_dir: Path, retry_manager: RetryManager):
+        self.project_dir = project_dir
+        self.retry_manager = retry_manager
+        self.claimed: Dict[int, int] = {}  # {feature_index: worker_id}
+        self._lock = asyncio.Lock()
+
+    async def claim(self, worker_id: int) -> Optional[Feature]:
+        """
+        Claim the next unclaimed, failing, non-skipped feature.
+
+        Returns:
+            The claimed feature, or None if nothing is left
+        """
+        async with self._lock:
+            for feature in load_features(self.project_dir / FEATURE_LIST_PATH):
+                if feature.passes or feature.index in self.claimed:
+                    continue
+                if self.retry_manager.should_skip(feature.id):
+                    continue
+                self.claimed[feature.index] = worker_id
+                return feature
+            return None
+
+    def release(self, index: int) -> None:
+        """Release a claim so the feature can be picked up again."""
+        self.claimed.pop(index, None)
+
+
+class ParallelRunner:
+    """Coordinates worktrees, sessions and the serialized merge step."""
+
+    def __init__(
+        self,
+        project_dir: Path,
+        model: str,
+        workers: int,
+        mode: str = "greenfield",
+        max_iterations: Optional[int] = None,
+        session_timeout_minutes: int = 120,
+        stall_timeout_minutes: int = 10,
+        max_retries: int = 3,
+    ):
+        """
+        Initialize parallel runner.
+
+        Args:
+            project_dir: Main project checkout (must be a git repository)
+            model: Claude model to use
+            workers: Number of concurrent workers
+            mode: Development mode (greenfield, enhancement, bugfix)
+            max_iterations: Max sessions per worker (None for unlimited)
+            session_timeout_minutes: Overall session timeout per worker
+            stall_timeout_minutes: No-activity timeout per worker
+            max_retries: Max retry attempts per feature
+        """
+        self.project_dir = project_dir
+        self.model = model
+        self.workers = workers
+        self.mode = mode
+        self.max_iterations = max_iterations
+        self.session_timeout_minutes = session_timeout_minutes
+        self.stall_timeout_minutes = stall_timeout_minutes
+
+        self.worktree_root = project_dir.parent / f"{project_dir.name}.worktrees"
+        # Shared by all workers so their samples don't overwrite each other
+        self.gap_histogram = GapHistogram(project_dir / ".claude" / "tool_gaps.json")
+        self.retry_manager = RetryManager(project_dir, max_retries=max_retries)
+        self.claims = FeatureClaims(project_dir, self.retry_manager)
+        self._merge_lock = asyncio.Lock()
+        self.merged = 0
+        self.rejected = 0
+
+    def _worktree(self, worker_id: int) -> Path:
+        return self.worktree_root / f"worker-{worker_id}"
+
+    def _branch(self, worker_id: int) -> str:
+        return f"{WORKER_BRANCH_PREFIX}{worker_id}"
+
+    async def _exclude_harness_state(self, worktree: Path) -> None:
+        """
+        Add HARNESS_STATE_EXCLUDE to the repository's info/exclude.
+
+        Every worker writes its logs under .claude/ and the agent commits
+        with `git add .`, so without this worker branches carry harness
+        state that conflicts on merge. info/ is shared by all worktrees,
+        so the main checkout skips untracked harness state too.
+        """
+        exclude = Path((await _git_async(worktree, "rev-parse", "--git-path", "info/exclude")).stdout.strip())
+        if not exclude.is_absolute():
+            exclude = worktree / exclude
+
+        def add_line():
+            lines = exclude.read_text().splitlines() if exclude.exists() else []
+            if HARNESS_STATE_EXCLUDE not in lines:
+                exclude.parent.mkdir(parents=True, exist_ok=True)
+                with open(exclude, "a") as f:
+                    if lines and lines[-1]:
+                        f.write("\n")
+                    f.write(f"# Harness state (parallel workers)\n{HARNESS_STATE_EXCLUDE}\n")
+
+        await asyncio.to_thread(add_line)
+
+    async def _prepare_worktree(self, worker_id: int) -> Tuple[Path, str]:
+        """Create or reset the worker's worktree at the main checkout's HEAD."""
+        worktree = self._worktree(worker_id)
+        branch = self._branch(worker_id)
+
+        async with self._merge_lock:
+            base = (await _git_async(self.project_dir, "rev-parse", "HEAD")).stdout.strip()
+            if not worktree.exists():
+                self.worktree_root.mkdir(parents=True, exist_ok=True)
+                await _git_async(self.project_dir, "worktree", "add", "-B", branch, str(worktree), base)
+                await self._exclude_harness_state(worktree)
+            else:
+                await _git_async(worktree, "checkout", "-B", branch, base)
+                await _git_async(worktree, "reset", "--hard", base)
+                # Keep ignored files (node_modules, venv) so installs are reused,
+                # and .claude/ so the worker's error and audit logs survive
+                await _git_async(worktree, "clean", "-fd", "-e", f"{HARNESS_STATE_DIR}/")
+        return worktree, base
+
+    async def _resolve_harness_state(self, pre_merge: str) -> None:
+        """Keep the main checkout's .claude/ through a merge (a backstop for tracked state files)."""
+        changed = set()
+        for args in (("--cached", pre_merge), ("--diff-filter=U",)):
+            output = (await _git_async(
+                self.project_dir, "diff", "--name-only", "-z", *args, "--", HARNESS_STATE_DIR
+            )).stdout
+            changed.update(path for path in output.split("\0") if path)
+        for path in sorted(changed):
+            in_main = (await _git_async(
+                self.project_dir, "cat-file", "-e", f"{pre_merge}:{path}", check=False
+            )).returncode == 0
+            if in_main:
+                await _git_async(self.project_dir, "checkout", pre_merge, "--", path)
+            else:
+                await _git_async(self.project_dir, "rm", "-q", "-f", "--", path)
+
+    async def _merge(self, worker_id: int, feature: Feature, base: str) -> bool:
+        """
+        Merge a finished worker branch into the main checkout and re-validate.
+
+        The worker's copy of feature_list.json is never merged directly (every
+        worker edits it, so it would conflict); instead the claimed feature is
+        flipped to passing in the main checkout's copy.
+
+        Returns:
+            True if the work was merged and committed
+        """
+        worktree = self._worktree(worker_id)
+        branch = self._branch(worker_id)
+        index = feature.index
+        feature_id = feature.id
+
+        # Only merge work the agent committed and marked as passing
+        worker_features = load_features(worktree / FEATURE_LIST_PATH)
+        if index >= len(worker_features) or not worker_features[index].passes:
+            self.retry_manager.record_failure(feature_id, "Worker did not mark feature as passing")
+            return False
+        if (await _git_async(worktree, "rev-parse", "HEAD")).stdout.strip() == base:
+            self.retry_manager.record_failure(feature_id, "Worker made no commits")
+            return False
+
+        async with self._merge_lock:
+            pre_merge = (await _git_async(self.project_dir, "rev-parse", "HEAD")).stdout.strip()
+            merge = await _git_async(
+                self.project_dir, "merge", "--no-ff", "--no-commit", branch, check=False
+            )
+
+            # Resolve feature_list.json and harness state to the main copy, whatever happened to them
+            await _git_async(self.project_dir, "checkout", pre_merge, "--", FEATURE_LIST_PATH, check=False)
+            await self._resolve_harness_state(pre_merge)
+
+            conflicts = (await _git_async(
+                self.project_dir, "diff", "--name-only", "--diff-filter=U"
+            )).stdout.split()
+            merging = (await _git_async(
+                self.project_dir, "rev-parse", "-q", "--verify", "MERGE_HEAD", check=False
+            )).returncode == 0
+            if conflicts or not merging:
+                await _git_async(self.project_dir, "reset", "--hard", pre_merge)
+                reason = f"Merge conflict in: {', '.join(conflicts)}" if conflicts else \
+                    f"Merge failed: {merge.stderr.strip() or merge.stdout.strip()}"
+                self.retry_manager.record_failure(feature_id, reason)
+                print(f"\n⚠️  Worker {worker_id}: could not merge feature #{index} - will retry\n")
+                return False
+
+            # Only what the merge brought in is committed - never the user's other files
+            merged_paths = [path for path in (await _git_async(
+                self.project_dir, "diff", "--name-only", "-z", "--cached", pre_merge
+            )).stdout.split("\0") if path]
+
+            # Flip the claimed feature in the main copy, keeping the file's shape
+            set_feature_passes(self.project_dir / FEATURE_LIST_PATH, index)
+
+            print(f"\n🔍 Worker {worker_id}: validating merge of feature #{index}...")
+            result = await asyncio.to_thread(TestRunner(self.project_dir).run_tests)
+            if not result.passed:
+                await _git_async(self.project_dir, "reset", "--hard", pre_merge)
+                self.retry_manager.record_failure(
+                    feature_id, f"Validation failed after merge: {result.output[-500:]}"
+                )
+                print(f"\n❌ Worker {worker_id}: validation failed for feature #{index} - merge discarded\n")
+                return False
+
+            # Stage the merge's paths (deletions already are) and the flipped feature list
+            stage = [path for path in merged_paths if (self.project_dir / path).exists()]
+            await _git_async(self.project_dir, "add", "--", *stage, FEATURE_LIST_PATH)
+            await _git_async(
+                self.project_dir, "commit", "-m",
+                f"Merge feature #{index} from {branch}: {feature.description[:60]}",
+            )
+
+        self.retry_manager.record_success(feature_id)
+        print(f"\n✅ Worker {worker_id}: merged feature #{index}\n")
+        return True
+
+    async def _worker(self, worker_id: int) -> None:
+        """Claim features and run sessions until nothing is left."""
+        from agent import run_agent_session, AUTO_CONTINUE_DELAY_SECONDS
+        from client import create_client
+
+        loop_detector = LoopDetector(
+            session_timeout_minutes=self.session_timeout_minutes,
+            stall_timeout_minutes=self.stall_timeout_minutes,
+            progress_probe=ProgressProbe(self._worktree(worker_id)),
+            gap_histogram=self.gap_histogram,
+        )
+        sessions = 0
+
+        while self.max_iterations is None or sessions < self.max_iterations:
+            feature = await self.claims.claim(worker_id)
+            if feature is None:
+                break
+            index = feature.index
+            sessions += 1
+
+            try:
+                worktree, base = await self._prepare_worktree(worker_id)
+            except GitError as e:
+                print(f"\n❌ Worker {worker_id}: could not prepare worktree: {e}")
+                self.claims.release(index)
+                break
+
+            print(f"\n👷 Worker {worker_id}: feature #{index} - {feature.description[:60]}")
+
+            # Error log lives in the worktree so workers never rewrite the same file
+            error_handler = ErrorHandler(worktree)
+            prompt = build_worker_prompt(
+                get_coding_prompt(self.mode), feature, worker_id, self.workers
+            )
+            loop_detector.reset()
+
+            client = create_client(worktree, self.model, self.mode)
+            async with client:
+                status, response = await run_agent_session(
+                    client, prompt, worktree,
+                    loop_detector=loop_detector,
+                    error_handler=error_handler,
+                )
+            flush_security_audit()
+
+            if status == "continue":
+                if await self._merge(worker_id, feature, base):
+                    self.merged += 1
+                else:
+                    self.rejected += 1
+            else:
+                self.retry_manager.record_failure(
+                    feature.id, f"Session ended with status: {status}"
+                )
+                self.rejected += 1
+
+            self.claims.release(index)
+            await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
+
+    def cleanup(self) -> None:
+        """Remove worker worktrees and branches."""
+        for worker_id in range(1, self.workers + 1):
+            worktree = self._worktree(worker_id)
+            if worktree.exists():
+                _git(self.project_dir, "worktree", "remove", "--force", str(worktree), check=False)
+            _git(self.project_dir, "branch", "-D", self._branch(worker_id), check=False)
+        _git(self.project_dir, "worktree", "prune", check=False)
+        if self.worktree_root.exists() and not any(self.worktree_root.iterdir()):
+            self.worktree_root.rmdir()
+
+    async def run(self) -> None:
+        """Run all workers to completion."""
+        try:
+            await asyncio.gather(*[
+                self._worker(worker_id) for worker_id in range(1, self.workers + 1)
+            ])
+        finally:
+            await asyncio.to_thread(self.cleanup)
+
+
+async def run_parallel_features(
+    project_dir: Path,
+    model: str,
+    workers: int,
+    mode: str = "greenfield",
+    spec_file: Optional[str] = None,
+    max_iterations: Optional[int] = None,
+    session_timeout_minutes: int = 120,
+    stall_timeout_minutes: int = 10,
+    max_retries: int = 3,
+) -> None:
+    """
+    Run N feature workers in parallel git worktrees of one project.
+
+    A fresh project is first initialized with one serial initializer session,
+    since workers need an existing feature_list.json and git history.
+
+    Args:
+        project_dir: Directory for the project
+        model: Claude model to use
+        workers: Number of parallel workers
+        mode: Development mode (greenfield, enhancement, bugfix)
+        spec_file: Path to specification file (used for initialization)
+        max_iterations: Max sessions per worker (None for unlimited)
+        session_timeout_minutes: Overall session timeout (default: 120 min)
+        stall_timeout_minutes: No-activity timeout (default: 10 min)
+        max_retries: Max retry attempts per feature (default: 3)
+    """
+    if not (project_dir / FEATURE_LIST_PATH).exists():
+        from agent import run_autonomous_agent
+
+        print("No feature_list.json yet - running initializer session first\n")
+        await run_autonomous_agent(
+            project_dir=project_dir,
+            model=model,
+            max_iterations=1,
+            mode=mode,
+            spec_file=spec_file,
+            session_timeout_minutes=session_timeout_minutes,
+            stall_timeout_minutes=stall_timeout_minutes,
+            max_retries=max_retries,
+        )
+
+    if (await _git_async(project_dir, "rev-parse", "--git-dir", check=False)).returncode != 0:
+        print(f"Error: {project_dir} is not a git repository - parallel mode needs git worktrees")
+        return
+
+    # Merges are rolled back with reset --hard, so never run on top of local edits
+    dirty = (await _git_async(project_dir, "status", "--porcelain", "--untracked-files=no")).stdout.strip()
+    if dirty:
+        print("Error: main checkout has uncommitted changes - commit or stash them first")
+        print(dirty)
+        return
+
+    print("\n" + "=" * 70)
+    print(f"  PARALLEL MODE: {workers} workers")
+    print("=" * 70)
+    print(f"\nProject directory: {project_dir}")
+    print(f"Worktrees: {project_dir.parent / (project_dir.name + '.worktrees')}")
+    print_progress_summary(project_dir)
+
+    runner = ParallelRunner(
+        project_dir=project_dir,
+        model=model,
+        workers=workers,
+        mode=mode,
+        max_iterations=max_iterations,
+        session_timeout_minutes=session_timeout_minutes,
+        stall_timeout_minutes=stall_timeout_minutes,
+        max_retries=max_retries,
+    )
+    await runner.run()
+
+    print("\n" + "=" * 70)
+    print("  PARALLEL RUN COMPLETE")
+    print("=" * 70)
+    print(f"\nMerged features: {runner.merged}")
+    print(f"Rejected attempts: {runner.rejected}")
+    print_progress_summary(project_dir)
@@ -7,37 +7,135 @@ Functions for tracking and displaying progress of the autonomous coding agent.
 
 import json
 from pathlib import Path
+from typing import Dict, Tuple
 
+from feature_loader import find_feature_list, feature_records, record_passes
 
-def count_passing_tests(project_dir: Path) -> tuple[int, int]:
+
+# Bytes read per chunk when streaming feature_list.json
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# {path: ((mtime_ns, size), (passing, total))}
+_count_cache: Dict[str, Tuple[Tuple[int, int], Tuple[int, int]]] = {}
+
+
+def _stream_count(path: Path) -> Tuple[int, int]:
     """
-    Count passing and total tests in feature_list.json.
+    Count features by decoding the top-level JSON array one element at a time.
+
+    Memory stays bounded by the largest single feature plus one read chunk,
+    regardless of file size.
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    decoder = json.JSONDecoder()
+    passing = 0
+    total = 0
+
+    with open(path, "r", encoding="utf-8") as f:
+        buf = f.read(STREAM_CHUNK_SIZE)
+
+        # Skip to the opening bracket
+        while True:
+            stripped = buf.lstrip()
+            if stripped or not buf:
+                break
+            buf = f.read(STREAM_CHUNK_SIZE)
+        buf = buf.lstrip()
+
+        if buf.startswith("{"):
+            # Legacy {"features": [...]} shape - small files, parse normally
+            features = feature_records(json.loads(buf + f.read()))
+            return sum(1 for feature in features if record_passes(feature)), len(features)
+
+        if not buf.startswith("["):
+            raise json.JSONDecodeError("Expected a JSON array", buf, 0)
+        pos = 1
+
+        while True:
+            # Skip whitespace and separators between elements
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+
+            if pos >= len(buf):
+                chunk = f.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    raise json.JSONDecodeError("Unterminated array", buf, pos)
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+
+            if buf[pos] == "]":
+                return passing, total
+
+            try:
+                feature, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Element spans the chunk boundary - read more and retry
+                chunk = f.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    raise
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+
+            total += 1
+            if record_passes(feature):
+                passing += 1
+            pos = end
+
+            # Drop consumed text so the buffer never grows with the file
+            if pos > STREAM_CHUNK_SIZE:
+                buf = buf[pos:]
+                pos = 0
+
+
+def count_feature_file(path: Path) -> Tuple[int, int]:
+    """
+    Count passing and total features in a feature list file.
+
+    Results are memoized by the file's (mtime, size), so an unchanged file is
+    never re-read between iterations.
 
     Args:
-        project_dir: Directory containing feature_list.json
+        path: Path to feature_list.json
 
     Returns:
-        (passing_count, total_count)
+        (passing_count, total_count), or (0, 0) if missing or unreadable
     """
-    # Check spec/ folder first (new structure), then fallback to root (old structure)
-    tests_file = project_dir / "spec" / "feature_list.json"
-    
-    if not tests_file.exists():
-        tests_file = project_dir / "feature_list.json"
-    
-    if not tests_file.exists():
+    try:
+        stat = path.stat()
+    except OSError:
         return 0, 0
 
+    key = str(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _count_cache.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
     try:
-        with open(tests_file, "r") as f:
-            tests = json.load(f)
+        result = _stream_count(path)
+    except (json.JSONDecodeError, UnicodeDecodeError, IOError):
+        return 0, 0
 
-        total = len(tests)
-        passing = sum(1 for test in tests if test.get("passes", False))
+    _count_cache[key] = (signature, result)
+    return result
 
-        return passing, total
-    except (json.JSONDecodeError, IOError):
-        return 0, 0
+
+def count_passing_tests(project_dir: Path) -> tuple[int, int]:
+    """
+    Count passing and total tests in feature_list.json.
+
+    Args:
+        project_dir: Directory containing feature_list.json
+
+    Returns:
+        (passing_count, total_count)
+    """
+    # Check spec/ folder first (new structure), then fallback to root (old structure)
+    return count_feature_file(find_feature_list(project_dir))
 
 
 def print_session_header(session_num: int, is_initializer: bool) -> None:
@@ -0,0 +1,149 @@
+"""
+Progress Probe
+==============
+
+Background-work signal for LoopDetector's stall timeout.
+
+Tool-use messages stop while a long Bash command runs (npm install,
+docker compose build), so on its own the stall timer cannot tell a busy
+session from a dead one. The probe looks for real work instead:
+
+1. Filesystem: newest mtime of the project directory tree, scanned to a
+   shallow depth (package installs and builds create/replace entries in
+   node_modules/, dist/, build/ ...)
+2. Processes: CPU time consumed by descendants of this process whose
+   working directory is inside the project (Linux /proc only). Direct
+   children are ignored - that is the Claude CLI itself, which idles
+   while the API is silent - so only commands it spawned count.
+
+A session whose files don't change and whose child processes don't use
+CPU is still reported as stalled.
+"""
+
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Optional
+
+from project_walker import walk_project
+
+
+# How deep to scan for changed directory entries
+PROBE_MAX_DEPTH = 2
+
+# Stop scanning after this many entries (keeps each poll cheap)
+PROBE_MAX_ENTRIES = 5000
+
+# CPU seconds descendants must burn between polls to count as busy
+PROBE_MIN_CPU_SECONDS = 1.0
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class ProgressProbe:
+    """Detect filesystem and child-process activity in a project."""
+
+    def __init__(
+        self,
+        project_dir: Path,
+        max_depth: int = PROBE_MAX_DEPTH,
+        max_entries: int = PROBE_MAX_ENTRIES,
+        min_cpu_seconds: float = PROBE_MIN_CPU_SECONDS,
+    ):
+        """
+        Initialize progress probe.
+
+        Args:
+            project_dir: Project directory to watch
+            max_depth: Directory depth scanned for mtime changes
+            max_entries: Max directory entries looked at per poll
+            min_cpu_seconds: CPU time descendants must use between polls
+        """
+        self.project_dir = project_dir
+        self.max_depth = max_depth
+        self.max_entries = max_entries
+        self.min_cpu_seconds = min_cpu_seconds
+
+        self._root = str(project_dir.resolve())
+        self._last_mtime: Optional[float] = None
+        self._last_cpu: Dict[int, float] = {}  # {pid: cpu_seconds}
+
+    def _newest_mtime(self) -> float:
+        """Newest mtime among entries up to max_depth below the project dir."""
+        newest = 0.0
+        # node_modules/, build/ ... are where installs and builds show up: walk them too
+        entries = walk_project(self.project_dir, excluded_dirs=(), gitignore=False, max_depth=self.max_depth)
+        for entry in islice(entries, self.max_entries):
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            newest = max(newest, stat.st_mtime)
+        return newest
+
+    def _descendant_cpu(self) -> Dict[int, float]:
+        """CPU seconds of grandchild-or-deeper processes working inside the project."""
+        try:
+            pids = [int(name) for name in os.listdir("/proc") if name.isdigit()]
+        except OSError:
+            return {}  # No /proc (macOS, Windows)
+
+        children: Dict[int, list] = {}
+        cpu: Dict[int, float] = {}
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    stat = f.read()
+            except OSError:
+                continue
+            # Fields after "(comm)": state ppid ... utime(14) stime(15)
+            fields = stat[stat.rfind(")") + 2:].split()
+            if len(fields) < 13:
+                continue
+            children.setdefault(int(fields[1]), []).append(pid)
+            cpu[pid] = (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+
+        result = {}
+        stack = [(pid, 1) for pid in children.get(os.getpid(), [])]
+        while stack:
+            pid, depth = stack.pop()
+            stack.extend((child, depth + 1) for child in children.get(pid, []))
+            if depth < 2:
+                continue
+            try:
+                cwd = os.readlink(f"/proc/{pid}/cwd")
+            except OSError:
+                continue
+            if cwd == self._root or cwd.startswith(self._root + os.sep):
+                result[pid] = cpu.get(pid, 0.0)
+        return result
+
+    def poll(self) -> Optional[str]:
+        """
+        Check for activity since the previous poll.
+
+        The first poll only records a baseline.
+
+        Returns:
+            Description of the activity seen, or None if nothing happened
+        """
+        mtime = self._newest_mtime()
+        cpu = self._descendant_cpu()
+
+        activity = None
+        if self._last_mtime is not None and mtime > self._last_mtime:
+            activity = "project files changed"
+        else:
+            # Only count CPU used since the last poll (new processes count from zero)
+            used = sum(seconds - self._last_cpu.get(pid, 0.0) for pid, seconds in cpu.items())
+            if self._last_mtime is not None and used >= self.min_cpu_seconds:
+                activity = f"child processes busy ({used:.0f}s CPU)"
+
+        self._last_mtime = mtime
+        self._last_cpu = cpu
+        return activity
+
+    def reset(self):
+        """Forget the baseline (new session)."""
+        self._last_mtime = None
+        self._last_cpu = {}
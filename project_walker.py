@@ -0,0 +1,217 @@
+"""
+Project Walker
+==============
+
+Shared directory walk for scanners and detectors.
+
+Path.rglob() descends into node_modules/, .git/ and venv/ before callers
+get a chance to filter, so in a JS project the walk - not the scanning -
+dominates. walk_project() uses os.scandir and decides per directory
+whether to descend:
+
+- Excluded directory names are pruned before they are opened
+- .gitignore files (root and nested) and .git/info/exclude are honoured
+- Entries are os.DirEntry objects, so is_dir()/stat() reuse the data
+  scandir already fetched instead of issuing a stat per path
+- Entries are yielded in name order, so results are deterministic
+
+Supported .gitignore syntax: comments, `!` negation, trailing `/` for
+directories, patterns anchored by a `/`, `*`, `?`, `[...]` and `**`.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
+
+
+# Directories never worth descending into
+DEFAULT_EXCLUDED_DIRS = frozenset({
+    ".git", "node_modules", "venv", ".venv", "__pycache__", "dist", "build",
+})
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    """One .gitignore pattern."""
+    regex: Pattern
+    base: str  # Directory of the .gitignore, relative to the root ("" = root)
+    anchored: bool  # Matched against the path below base, not just the name
+    negate: bool
+    dir_only: bool
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob to a regex over '/'-separated paths."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and i + 2 == len(pattern) and (i == 0 or pattern[i - 1] == "/"):
+            out.append(".*")
+            i += 2
+        elif char == "*":
+            out.append("[^/]*")
+            i += 1
+        elif char == "?":
+            out.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(char))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        elif char == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(char))
+            i += 1
+    return "".join(out)
+
+
+def parse_gitignore(lines: Iterable[str], base: str = "") -> List[IgnoreRule]:
+    """
+    Parse .gitignore lines.
+
+    Args:
+        lines: File lines
+        base: Directory containing the file, relative to the walk root
+
+    Returns:
+        Rules in file order (later rules win)
+    """
+    rules = []
+    for line in lines:
+        line = line.rstrip("\n")
+        # Trailing spaces are ignored unless escaped
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "
+        line = stripped
+        if not line or line.startswith("#"):
+            continue
+
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\#") or line.startswith("\\!"):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        # A slash anywhere but the end anchors the pattern to base
+        anchored = "/" in line
+        line = line.lstrip("/")
+        rules.append(IgnoreRule(
+            regex=re.compile(_glob_to_regex(line)),
+            base=base,
+            anchored=anchored,
+            negate=negate,
+            dir_only=dir_only,
+        ))
+    return rules
+
+
+def _read_rules(path: str, base: str) -> List[IgnoreRule]:
+    try:
+        with open(path, errors="replace") as f:
+            return parse_gitignore(f, base)
+    except OSError:
+        return []
+
+
+def is_ignored(rules: Iterable[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """
+    Whether rules ignore a path (the last matching rule decides).
+
+    Args:
+        rules: Rules from the root and every directory above rel_path
+        rel_path: '/'-separated path relative to the walk root
+        is_dir: Whether the path is a directory
+    """
+    name = rel_path.rsplit("/", 1)[-1]
+    ignored = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.anchored:
+            if rule.base:
+                if not rel_path.startswith(rule.base + "/"):
+                    continue
+                target = rel_path[len(rule.base) + 1:]
+            else:
+                target = rel_path
+        else:
+            target = name
+        if rule.regex.fullmatch(target):
+            ignored = not rule.negate
+    return ignored
+
+
+def walk_project(
+    root: Path,
+    excluded_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS,
+    gitignore: bool = True,
+    max_depth: Optional[int] = None,
+) -> Iterator[os.DirEntry]:
+    """
+    Walk a project tree, pruning excluded and ignored directories.
+
+    Args:
+        root: Directory to walk
+        excluded_dirs: Directory names never descended into (nor yielded)
+        gitignore: Honour .gitignore files and .git/info/exclude
+        max_depth: Deepest level descended into (0 = root entries only, None = all)
+
+    Yields:
+        DirEntry for every file and directory kept; each directory's entries
+        come in name order, before its subdirectories are walked
+    """
+    excluded = frozenset(excluded_dirs)
+    root_path = os.fspath(root)
+    rules: Tuple[IgnoreRule, ...] = ()
+    if gitignore:
+        rules = tuple(_read_rules(os.path.join(root_path, ".git", "info", "exclude"), ""))
+
+    # (directory path, path relative to root, depth, rules in effect above it)
+    stack = [(root_path, "", 0, rules)]
+    while stack:
+        path, rel_dir, depth, rules = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        if gitignore and any(entry.name == ".gitignore" for entry in entries):
+            rules = rules + tuple(_read_rules(os.path.join(path, ".gitignore"), rel_dir))
+
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir and entry.name in excluded:
+                continue
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if rules and is_ignored(rules, rel_path, is_dir):
+                continue
+            yield entry
+            if is_dir and (max_depth is None or depth < max_depth):
+                subdirs.append((entry.path, rel_path, depth + 1, rules))
+
+        stack.extend(reversed(subdirs))
@@ -133,7 +133,7 @@ def copy_spec_to_project(project_dir: Path, spec_file: str = None, mode: str = "
 
     # Copy helper tools to project from harness root
     harness_root = Path(__file__).parent.parent
-    tools_to_copy = ["regression_tester.py"]
+    tools_to_copy = ["regression_tester.py", "feature_loader.py"]
 
     for tool in tools_to_copy:
         tool_source = harness_root / tool
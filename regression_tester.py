@@ -6,21 +6,21 @@ Runs every 5 sessions to catch breaking changes.
 Tests random sample of passing features to ensure they still work.
 """
 
-import json
 import random
 import sys
 from pathlib import Path
 
+from feature_loader import find_feature_list, load_features as load_feature_list
+
 
 def load_features(feature_list_path: Path):
-    """Load feature list."""
-    with open(feature_list_path) as f:
-        return json.load(f)
+    """Load feature list (normalized Feature objects)."""
+    return load_feature_list(feature_list_path, strict=True)
 
 
 def get_passing_features(features):
     """Get all passing features."""
-    return [f for f in features if f.get('passes', False)]
+    return [f for f in features if f.passes]
 
 
 def run_regression_tests(feature_list_path: Path, sample_size: int = None):
@@ -57,13 +57,13 @@ def run_regression_tests(feature_list_path: Path, sample_size: int = None):
     failures = []
     
     for i, feature in enumerate(sample, 1):
-        desc = feature['description'][:60] + "..." if len(feature['description']) > 60 else feature['description']
+        desc = feature.description[:60] + "..." if len(feature.description) > 60 else feature.description
         print(f"[{i}/{len(sample)}] {desc}")
         
         # For now, print the test steps
         # In full implementation, would execute these
-        print(f"  Category: {feature.get('category', 'unknown')}")
-        print(f"  Steps: {len(feature.get('steps', []))}")
+        print(f"  Category: {feature.category or 'unknown'}")
+        print(f"  Steps: {len(feature.steps)}")
         
         # TODO: Actually execute test steps
         # For now, just verify feature exists in feature_list
@@ -79,7 +79,7 @@ def run_regression_tests(feature_list_path: Path, sample_size: int = None):
         print()
         print("Failed features:")
         for f in failures:
-            print(f"  - {f['description']}")
+            print(f"  - {f.description}")
         print()
         print("🛑 FIX REGRESSIONS before continuing with new features!")
         return False
@@ -91,10 +91,7 @@ def run_regression_tests(feature_list_path: Path, sample_size: int = None):
 
 if __name__ == "__main__":
     # Check spec/ folder first, then fallback to root
-    feature_list = Path("spec/feature_list.json")
-    
-    if not feature_list.exists():
-        feature_list = Path("feature_list.json")
+    feature_list = find_feature_list(Path("."))
     
     if not feature_list.exists():
         print("feature_list.json not found in spec/ or current directory")
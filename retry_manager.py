@@ -8,36 +8,72 @@ Features:
 - Skip features stuck in retry loop after max retries
 - Track retry history for debugging
 - Smart feature selection (skips completed and failed-after-retries)
+- Heap-backed work queue with pluggable scheduling policies
+- Append-only journal with periodic snapshot compaction (crash-safe, O(1) updates)
 """
 
 import json
+import os
+import sqlite3
 from pathlib import Path
-from typing import Optional, Dict, List, Set
+from typing import Optional, Dict, List, Set, Union
+
+from feature_loader import Feature, find_feature_list
+from feature_queue import FeatureQueue
+from feature_store import FeatureStore, get_feature_store
+
+
+# Journal entries between snapshot compactions
+COMPACT_EVERY = 100
+
+# Retry history entries kept in the snapshot
+RETRY_HISTORY_LIMIT = 1000
 
 
 class RetryManager:
     """Manage retry logic for failed features."""
 
-    def __init__(self, project_dir: Path, max_retries: int = 3):
+    def __init__(
+        self,
+        project_dir: Path,
+        max_retries: int = 3,
+        queue_policy: str = "file_order",
+        category_order: Optional[List[str]] = None,
+    ):
         """
         Initialize retry manager.
 
         Args:
             project_dir: Project directory for state tracking
             max_retries: Maximum retry attempts per feature (default: 3)
+            queue_policy: Next-feature scheduling policy (see feature_queue.POLICIES)
+            category_order: Category ranking for the "category" policy
         """
         self.project_dir = project_dir
         self.max_retries = max_retries
+        self.queue_policy = queue_policy
+        self.category_order = category_order
         self.retry_count: Dict[str, int] = {}  # {feature_id: count}
         self.skipped_features: Set[str] = set()
         self.retry_history: List[Dict] = []  # Track all retry attempts
 
-        # State file for persistence across sessions
+        # State for persistence across sessions: snapshot + append-only journal
         self.state_file = project_dir / ".claude" / "retry_state.json"
+        self.journal_file = project_dir / ".claude" / "retry_state.jsonl"
+        self._seq = 0  # Sequence number of the last applied change
+        self._journal_entries = 0  # Entries written since the last compaction
+        self._torn_tail = False  # Journal ends mid-line (the next append starts a new one)
         self._load_state()
 
+        # Indexed feature store, opened lazily once feature_list.json exists
+        self._feature_store: Optional[FeatureStore] = None
+
+        # Work queue, built on the first get_next_feature() call with a list
+        self._queue: Optional[FeatureQueue] = None
+        self._queue_source: Optional[list] = None
+
     def _load_state(self):
-        """Load retry state from disk."""
+        """Load the snapshot, then replay journal entries newer than it."""
         if self.state_file.exists():
             try:
                 with open(self.state_file, 'r') as f:
@@ -45,19 +81,126 @@ class RetryManager:
                     self.retry_count = state.get('retry_count', {})
                     self.skipped_features = set(state.get('skipped_features', []))
                     self.retry_history = state.get('retry_history', [])
+                    self._seq = state.get('seq', 0)
             except (json.JSONDecodeError, IOError):
                 pass  # Start fresh if state file is corrupted
 
+        if self.journal_file.exists():
+            try:
+                with open(self.journal_file, 'rb') as f:
+                    data = f.read()
+            except IOError:
+                return
+
+            complete = data.rfind(b'\n') + 1
+            if complete < len(data):
+                # Torn write from a crash: drop it, or the next append would be
+                # glued onto the fragment and lost on the following load
+                try:
+                    os.truncate(self.journal_file, complete)
+                except OSError:
+                    self._torn_tail = True
+
+            for line in data[:complete].decode('utf-8', errors='replace').splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Corrupted line - skip it
+                self._journal_entries += 1
+                # Entries at or below the snapshot seq are already in it
+                if entry.get('seq', 0) > self._seq:
+                    self._apply(entry)
+                    self._seq = entry['seq']
+
+    def _apply(self, entry: Dict):
+        """Apply one journal entry to the in-memory state."""
+        op = entry.get('op')
+        feature_id = entry.get('feature_id', '')
+
+        if op == 'failure':
+            self.retry_count[feature_id] = self.retry_count.get(feature_id, 0) + 1
+            self.retry_history.append({
+                'feature_id': feature_id,
+                'attempt': self.retry_count[feature_id],
+                'error': entry.get('error', ''),
+            })
+            if self.retry_count[feature_id] >= self.max_retries:
+                self.skipped_features.add(feature_id)
+        elif op == 'success':
+            self.retry_count.pop(feature_id, None)
+            self.skipped_features.discard(feature_id)
+        elif op == 'reset':
+            self.retry_count.clear()
+            self.skipped_features.clear()
+            self.retry_history.clear()
+
+    def _record(self, op: str, **fields):
+        """Apply a change and append it to the journal (compacting periodically)."""
+        self._seq += 1
+        entry = {'seq': self._seq, 'op': op, **fields}
+        self._apply(entry)
+
+        self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_file, 'a') as f:
+            if self._torn_tail:
+                f.write('\n')
+                self._torn_tail = False
+            f.write(json.dumps(entry) + '\n')
+        self._journal_entries += 1
+
+        # The first change also establishes the snapshot file
+        if self._journal_entries >= COMPACT_EVERY or not self.state_file.exists():
+            self._save_state()
+
     def _save_state(self):
-        """Save retry state to disk."""
+        """Compact: atomically write a snapshot of the state, then clear the journal."""
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
         state = {
+            'seq': self._seq,
             'retry_count': self.retry_count,
             'skipped_features': list(self.skipped_features),
-            'retry_history': self.retry_history,
+            'retry_history': self.retry_history[-RETRY_HISTORY_LIMIT:],
         }
-        with open(self.state_file, 'w') as f:
+        tmp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(tmp_file, 'w') as f:
             json.dump(state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.state_file)
+
+        # The snapshot records seq, so a crash before this truncation only
+        # leaves entries that replay will skip
+        with open(self.journal_file, 'w'):
+            pass
+        self._journal_entries = 0
+        self._torn_tail = False
+        del self.retry_history[:-RETRY_HISTORY_LIMIT]
+
+    def _store(self) -> Optional[FeatureStore]:
+        """Get the project's feature store, seeded with this manager's retry state."""
+        if self._feature_store is None:
+            if not find_feature_list(self.project_dir).exists():
+                return None
+            try:
+                store = get_feature_store(self.project_dir)
+                store.load_retry_state(self.retry_count, self.skipped_features)
+            except sqlite3.Error:
+                return None
+            self._feature_store = store
+        return self._feature_store
+
+    def _sync_store(self, feature_id: str):
+        """Mirror one feature's retry state into the feature store index."""
+        store = self._store()
+        if store is not None:
+            try:
+                store.set_retry_state(
+                    feature_id,
+                    self.retry_count.get(feature_id, 0),
+                    feature_id in self.skipped_features,
+                )
+            except sqlite3.Error:
+                pass  # Index is an optimization - retry_state.json stays authoritative
 
     def should_retry(self, feature_id: str) -> bool:
         """
@@ -80,22 +223,18 @@ class RetryManager:
             feature_id: Unique feature identifier
             error: Error message or reason for failure
         """
-        self.retry_count[feature_id] = self.retry_count.get(feature_id, 0) + 1
-
-        # Log to history
-        self.retry_history.append({
-            'feature_id': feature_id,
-            'attempt': self.retry_count[feature_id],
-            'error': error,
-        })
+        self._record('failure', feature_id=feature_id, error=error)
 
         # Check if we should skip this feature
         if self.retry_count[feature_id] >= self.max_retries:
-            self.skipped_features.add(feature_id)
             print(f"\n⚠️  Feature {feature_id} failed {self.max_retries} times - SKIPPING")
             print(f"   Will continue with remaining features\n")
+            if self._queue is not None:
+                self._queue.mark_skipped(feature_id)
+        elif self._queue is not None:
+            self._queue.mark_failed(feature_id)
 
-        self._save_state()
+        self._sync_store(feature_id)
 
     def record_success(self, feature_id: str):
         """
@@ -104,13 +243,14 @@ class RetryManager:
         Args:
             feature_id: Unique feature identifier
         """
-        # Remove from retry tracking on success
-        if feature_id in self.retry_count:
-            del self.retry_count[feature_id]
-        if feature_id in self.skipped_features:
-            self.skipped_features.remove(feature_id)
+        if self._queue is not None:
+            self._queue.unskip(feature_id)
+            self._queue.mark_passed(feature_id)
 
-        self._save_state()
+        # Remove from retry tracking on success
+        if feature_id in self.retry_count or feature_id in self.skipped_features:
+            self._record('success', feature_id=feature_id)
+            self._sync_store(feature_id)
 
     def should_skip(self, feature_id: str) -> bool:
         """
@@ -124,7 +264,9 @@ class RetryManager:
         """
         return feature_id in self.skipped_features
 
-    def get_next_feature(self, features: List[Dict]) -> Optional[Dict]:
+    def get_next_feature(
+        self, features: Optional[List[Union[Dict, Feature]]] = None
+    ) -> Optional[Union[Dict, Feature]]:
         """
         Get next feature to work on (smart selection).
 
@@ -132,26 +274,40 @@ class RetryManager:
         - Completed features (passes: true)
         - Features that failed after max retries
 
+        Selection runs through a heap-backed FeatureQueue that is built once
+        and updated incrementally, ordered by the configured queue policy.
+
         Args:
-            features: List of features from feature_list.json
+            features: Features from feature_list.json (raw dicts or loaded
+                Feature objects). If omitted, the project's indexed feature
+                store is queried instead.
 
         Returns:
             Next feature to work on, or None if all done/skipped
         """
-        for feature in features:
-            feature_id = feature.get('id', feature.get('name', ''))
-
-            # Skip completed features
-            if feature.get('passes', False):
-                continue
-
-            # Skip features that failed after retries
-            if self.should_skip(feature_id):
-                continue
-
-            return feature
-
-        return None
+        if features is None:
+            store = self._store()
+            if store is None:
+                return None
+            try:
+                return store.next_pending()
+            except sqlite3.Error:
+                return None
+
+        if self._queue is None:
+            self._queue = FeatureQueue(
+                features,
+                policy=self.queue_policy,
+                category_order=self.category_order,
+                retry_count=self.retry_count,
+                skipped=self.skipped_features,
+            )
+        elif features is not self._queue_source:
+            # Different list (e.g. feature_list.json changed) - apply the diff
+            self._queue.sync(features)
+        self._queue_source = features
+
+        return self._queue.peek()
 
     def get_retry_count(self, feature_id: str) -> int:
         """
@@ -184,7 +340,14 @@ class RetryManager:
 
     def reset(self):
         """Reset retry manager (clear all state)."""
-        self.retry_count.clear()
-        self.skipped_features.clear()
-        self.retry_history.clear()
+        self._record('reset')
         self._save_state()
+        self._queue = None
+        self._queue_source = None
+
+        store = self._store()
+        if store is not None:
+            try:
+                store.load_retry_state({}, set())
+            except sqlite3.Error:
+                pass
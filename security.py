@@ -4,10 +4,21 @@ Security Hooks for Autonomous Coding Agent
 
 Pre-tool-use hooks that validate bash commands for security.
 Uses an allowlist approach - only explicitly permitted commands can run.
+
+The constants below are the built-in policy; projects extend or narrow it
+with .claude/security_policy.yaml (see security_policy.py).
 """
 
 import os
+import re
 import shlex
+import time
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+from security_audit import get_audit_log
+from security_policy import PolicyLoader, SecurityPolicy
 
 
 # Allowed commands for development tasks
@@ -100,183 +111,574 @@ ALLOWED_COMMANDS = {
 COMMANDS_NEEDING_EXTRA_VALIDATION = {"pkill", "chmod", "init.sh"}
 
 
-def split_command_segments(command_string: str) -> list[str]:
-    """
-    Split a compound command into individual command segments.
+# Shell keywords that precede a command name
+SHELL_KEYWORDS = frozenset({
+    "if", "then", "else", "elif", "fi", "while", "until", "do", "done",
+    "esac", "in", "!", "{", "}",
+})
 
-    Handles command chaining (&&, ||, ;) but not pipes (those are single commands).
+# Keywords whose remaining words are data (loop variables, word lists, patterns)
+LOOP_KEYWORDS = frozenset({"for", "select", "case"})
 
-    Args:
-        command_string: The full shell command
+# Interpreters whose `-c` argument is itself parsed as a command
+SHELL_INTERPRETERS = frozenset({"bash", "sh"})
 
-    Returns:
-        List of individual command segments
-    """
-    import re
+# find actions whose arguments (up to `;` or `+`) are run as a command
+FIND_EXEC_ACTIONS = frozenset({"-exec", "-execdir", "-ok", "-okdir"})
 
-    # Split on && and || while preserving the ability to handle each segment
-    # This regex splits on && or || that aren't inside quotes
-    segments = re.split(r"\s*(?:&&|\|\|)\s*", command_string)
+# Max nesting of $(...) / `...` / `sh -c` before a command is rejected
+MAX_SUBSTITUTION_DEPTH = 16
 
-    # Further split on semicolons
-    result = []
-    for segment in segments:
-        sub_segments = re.split(r'(?<!["\'])\s*;\s*(?!["\'])', segment)
-        for sub in sub_segments:
-            sub = sub.strip()
-            if sub:
-                result.append(sub)
+# Parsed commands and hook decisions kept in the LRU caches
+PARSE_CACHE_SIZE = 1024
+DECISION_CACHE_SIZE = 1024
 
-    return result
+# Runs of characters with no special meaning to the scanner
+_PLAIN_CHARS = re.compile(r"[^\s'\"\\$`|&;<>()#]+")
 
+# Runs of characters with no special meaning inside double quotes
+_DOUBLE_QUOTED_CHARS = re.compile(r'[^"\\$`]+')
 
-def extract_commands(command_string: str) -> list[str]:
-    """
-    Extract command names from a shell command string.
+# NAME=value / NAME+=value / NAME[i]=value
+_ASSIGNMENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(?:\[[^\]]*\])?\+?=")
 
-    Handles pipes, command chaining (&&, ||, ;), and subshells.
-    Returns the base command names (without paths).
+# chmod modes that only add execute permission (+x, u+x, ug+x, ...)
+_CHMOD_EXECUTE_MODE = re.compile(r"^[ugoa]*\+x$")
 
-    Args:
-        command_string: The full shell command
 
-    Returns:
-        List of command names found in the string
-    """
-    commands = []
+@dataclass(frozen=True)
+class SimpleCommand:
+    """One pipeline stage: its words (quotes removed) and command name."""
+    text: str
+    words: Tuple[str, ...]
+    name: Optional[str] = None  # Base command name (None for assignments, loop headers)
+    name_index: int = 0  # Index of the command word in words
+    dynamic: bool = False  # Command word is built from a substitution
+    substitutions: Tuple["CommandAST", ...] = ()  # $(...), `...` and `sh -c` bodies
 
-    # shlex doesn't treat ; as a separator, so we need to pre-process
-    import re
+    @property
+    def argv(self) -> Tuple[str, ...]:
+        """Words from the command name on."""
+        return self.words[self.name_index:]
 
-    # Split on semicolons that aren't inside quotes (simple heuristic)
-    # This handles common cases like "echo hello; ls"
-    segments = re.split(r'(?<!["\'])\s*;\s*(?!["\'])', command_string)
 
-    for segment in segments:
-        segment = segment.strip()
-        if not segment:
-            continue
+@dataclass(frozen=True)
+class Segment:
+    """Commands joined by pipes, between &&, ||, ;, & or newlines."""
+    text: str
+    pipeline: Tuple[SimpleCommand, ...]
 
-        try:
-            tokens = shlex.split(segment)
-        except ValueError:
-            # Malformed command (unclosed quotes, etc.)
-            # Return empty to trigger block (fail-safe)
-            return []
 
-        if not tokens:
+@dataclass(frozen=True)
+class CommandAST:
+    """Parsed shell command line."""
+    text: str
+    segments: Tuple[Segment, ...]
+    error: Optional[str] = None  # Set for malformed input (unclosed quotes, ...)
+
+    def stages(self) -> Iterator[SimpleCommand]:
+        """All simple commands in execution order, substitutions first."""
+        for segment in self.segments:
+            for stage in segment.pipeline:
+                for substitution in stage.substitutions:
+                    yield from substitution.stages()
+                yield stage
+
+    @property
+    def commands(self) -> Tuple[str, ...]:
+        """Command names of all stages, including substitutions."""
+        return tuple(stage.name for stage in self.stages() if stage.name)
+
+
+def _command_name(words: List[str], dynamic: List[bool]) -> Tuple[Optional[str], int, bool]:
+    """Find the command word of a stage: (name, index, dynamic)."""
+    for index, word in enumerate(words):
+        if word in LOOP_KEYWORDS:
+            return None, index, False
+        if word in SHELL_KEYWORDS:
             continue
+        if word.startswith("-") and word != "-":
+            continue
+        if _ASSIGNMENT.match(word):
+            continue
+        if dynamic[index]:
+            return None, index, True
+        name = os.path.basename(word)
+        if name:
+            return name, index, False
+    return None, len(words), False
 
-        # Track when we expect a command vs arguments
-        expect_command = True
 
-        for token in tokens:
-            # Shell operators indicate a new command follows
-            if token in ("|", "||", "&&", "&"):
-                expect_command = True
-                continue
+class _Scanner:
+    """
+    Single-pass shell scanner producing a CommandAST.
 
-            # Skip shell keywords that precede commands
-            if token in (
-                "if",
-                "then",
-                "else",
-                "elif",
-                "fi",
-                "for",
-                "while",
-                "until",
-                "do",
-                "done",
-                "case",
-                "esac",
-                "in",
-                "!",
-                "{",
-                "}",
-            ):
-                continue
+    Quoting and escapes follow shlex.split (POSIX mode). Unquoted &&, ||, ;,
+    &, | and newlines separate commands, here-doc bodies are skipped and
+    $(...) / `...` are scanned recursively into their own CommandAST -
+    including inside ${...}, $((...)) and unquoted here-doc bodies, which
+    bash expands too.
+    """
 
-            # Skip flags/options (but not redirection operators)
-            if token.startswith("-") and token not in ("-", "<", ">"):
+    def __init__(self, text: str, pos: int = 0, closer: Optional[str] = None, depth: int = 0):
+        self.text = text
+        self.start = pos
+        self.pos = pos
+        self.closer = closer  # ")" or "`" while scanning a substitution
+        self.depth = depth
+        self.error: Optional[str] = None
+
+        self.segments: List[Segment] = []
+        self.pipeline: List[SimpleCommand] = []
+        self.segment_start = pos
+        self.stage_start = pos
+
+        self.words: List[str] = []
+        self.word_dynamic: List[bool] = []
+        self.substitutions: List[CommandAST] = []
+        self.word: List[str] = []
+        self.in_word = False
+        self.dynamic = False
+        self.quoted = False  # Current word contains quotes or escapes
+
+        self.heredocs: List[Tuple[str, bool, bool]] = []  # Pending (delimiter, strip_tabs, expand)
+        self.expect_delimiter: Optional[bool] = None
+
+    def fail(self, message: str):
+        if self.error is None:
+            self.error = message
+
+    def end_word(self):
+        if not self.in_word:
+            return
+        word = "".join(self.word)
+        if self.expect_delimiter is not None:
+            # A quoted delimiter (<<'EOF') leaves the body unexpanded
+            self.heredocs.append((word, self.expect_delimiter, not self.quoted))
+            self.expect_delimiter = None
+        self.words.append(word)
+        self.word_dynamic.append(self.dynamic)
+        self.word = []
+        self.in_word = False
+        self.dynamic = False
+        self.quoted = False
+
+    def end_stage(self, end: int, next_start: int):
+        self.end_word()
+        if self.words or self.substitutions:
+            name, index, dynamic = _command_name(self.words, self.word_dynamic)
+            substitutions = self.substitutions
+            if name in SHELL_INTERPRETERS:
+                substitutions = substitutions + self.interpreter_script(self.words[index:])
+            elif name == "find":
+                substitutions = substitutions + self.find_actions(self.words[index:])
+            self.pipeline.append(SimpleCommand(
+                text=self.text[self.stage_start:end].strip(),
+                words=tuple(self.words),
+                name=name,
+                name_index=index,
+                dynamic=dynamic,
+                substitutions=tuple(substitutions),
+            ))
+        self.words = []
+        self.word_dynamic = []
+        self.substitutions = []
+        self.stage_start = next_start
+
+    def end_segment(self, end: int, next_start: int):
+        self.end_stage(end, next_start)
+        if self.pipeline:
+            self.segments.append(Segment(
+                text=self.text[self.segment_start:end].strip(),
+                pipeline=tuple(self.pipeline),
+            ))
+        self.pipeline = []
+        self.segment_start = next_start
+
+    def interpreter_script(self, argv: List[str]) -> List[CommandAST]:
+        """Parse the script passed to `bash -c` / `sh -c`."""
+        if "-c" not in argv[1:-1]:
+            return []
+        script = argv[argv.index("-c", 1) + 1]
+        if self.depth >= MAX_SUBSTITUTION_DEPTH:
+            self.fail("Command is nested too deeply")
+            return []
+        ast = _Scanner(script, depth=self.depth + 1).run()
+        if ast.error:
+            self.fail(ast.error)
+        return [ast]
+
+    def find_actions(self, argv: List[str]) -> List[CommandAST]:
+        """Parse the commands run by `find -exec ... ;` (and -execdir, -ok, -okdir)."""
+        commands = []
+        i = 1
+        while i < len(argv):
+            if argv[i] not in FIND_EXEC_ACTIONS:
+                i += 1
                 continue
-
-            # Skip simple variable assignments (VAR=value) but NOT command substitution (VAR=$(cmd))
-            if "=" in token and not token.startswith("=") and "=$(" not in token and not token.startswith("`"):
+            end = i + 1
+            while end < len(argv) and argv[end] != ";" and not (argv[end] == "+" and argv[end - 1] == "{}"):
+                end += 1
+            if end > i + 1:
+                ast = _Scanner(shlex.join(argv[i + 1:end]), depth=self.depth + 1).run()
+                if ast.error:
+                    self.fail(ast.error)
+                commands.append(ast)
+            i = end + 1
+        return commands
+
+    def nested(self, start: int, closer: str) -> int:
+        """Scan a $(...) or `...` body starting at start into substitutions; returns the position after it."""
+        if self.depth >= MAX_SUBSTITUTION_DEPTH:
+            self.fail("Command is nested too deeply")
+            return len(self.text)
+        inner = _Scanner(self.text, start, closer, self.depth + 1)
+        ast = inner.run()
+        if ast.error:
+            self.fail(ast.error)
+        self.substitutions.append(ast)
+        return inner.pos
+
+    def substitution(self, start: int, closer: str) -> int:
+        """Scan a $(...) or `...` word part starting at start; returns the position after it."""
+        end = self.nested(start, closer)
+        opener = "$(" if closer == ")" else "`"
+        self.word.append(self.text[start - len(opener):end])
+        self.in_word = True
+        self.dynamic = True
+        return end
+
+    def expansion(self, i: int) -> int:
+        """
+        Scan a ${...} or $((...)) expansion starting at its '$'.
+
+        The expansion is kept literally in the word, but command
+        substitutions inside it run, so they are parsed like any other.
+        Returns the position after it.
+        """
+        text = self.text
+        arithmetic = text.startswith("$((", i)
+        closers = [")", ")"] if arithmetic else ["}"]
+        pos = i + len("$((" if arithmetic else "${")
+        found = len(self.substitutions)
+        in_double = False
+        while pos < len(text) and closers:
+            char = text[pos]
+            if char == "\\":
+                pos += 2
+            elif char == '"':
+                in_double = not in_double
+                pos += 1
+            elif char == "'" and not in_double:
+                end = text.find("'", pos + 1)
+                pos = len(text) if end < 0 else end + 1
+            elif text.startswith("$((", pos) or text.startswith("${", pos):
+                pos = self.expansion(pos)
+                self.word.pop()  # Kept as part of this expansion's text
+            elif text.startswith("$(", pos):
+                pos = self.nested(pos + 2, ")")
+            elif char == "`":
+                pos = self.nested(pos + 1, "`")
+            elif in_double:
+                pos += 1
+            elif char == closers[-1]:
+                closers.pop()
+                pos += 1
+                if arithmetic and len(closers) == 1 and text[pos:pos + 1] != ")":
+                    # $((cmd) ...) is a command substitution of a subshell, not arithmetic
+                    del self.substitutions[found:]
+                    return self.substitution(i + 2, ")")
+            elif char in "({":
+                closers.append(")" if char == "(" else "}")
+                pos += 1
+            else:
+                pos += 1
+        if closers:
+            self.fail(f"No closing {closers[-1]!r}")
+            pos = len(text)
+        self.word.append(text[i:pos])
+        self.in_word = True
+        if len(self.substitutions) > found:
+            self.dynamic = True
+        return pos
+
+    def dollar(self, i: int) -> int:
+        text = self.text
+        if text.startswith("$((", i) or text.startswith("${", i):
+            return self.expansion(i)
+        if text.startswith("$(", i):
+            return self.substitution(i + 2, ")")
+        self.word.append("$")
+        self.in_word = True
+        return i + 1
+
+    def double_quoted(self, i: int) -> int:
+        text = self.text
+        self.in_word = True
+        self.quoted = True
+        while i < len(text):
+            match = _DOUBLE_QUOTED_CHARS.match(text, i)
+            if match:
+                self.word.append(match.group())
+                i = match.end()
+                continue
+            char = text[i]
+            if char == '"':
+                return i + 1
+            if char == "\\":
+                if text[i + 1:i + 2] in ("\\", '"'):
+                    self.word.append(text[i + 1])
+                    i += 2
+                else:
+                    self.word.append(char)
+                    i += 1
+            elif char == "$":
+                i = self.dollar(i)
+            else:  # Backtick
+                i = self.substitution(i + 1, "`")
+        self.fail("No closing quotation")
+        return len(text)
+
+    def skip_heredocs(self, i: int) -> int:
+        """
+        Skip the bodies of here-docs started on the previous line.
+
+        Bodies with an unquoted delimiter are expanded by bash, so their
+        command substitutions are parsed and attached to the last stage.
+        """
+        text = self.text
+        found = len(self.substitutions)
+        for delimiter, strip_tabs, expand in self.heredocs:
+            while i < len(text):
+                newline = text.find("\n", i)
+                line_end = len(text) if newline < 0 else newline
+                line = text[i:line_end]
+                if (line.lstrip("\t") if strip_tabs else line) == delimiter:
+                    i = line_end + 1
+                    break
+                i = self.heredoc_line(i) if expand else line_end + 1
+            else:
+                self.fail(f"Here-document delimited by {delimiter!r} is not closed")
+        self.heredocs = []
+
+        if len(self.substitutions) > found:
+            body = tuple(self.substitutions[found:])
+            del self.substitutions[found:]
+            if self.segments:
+                segment = self.segments[-1]
+                stage = segment.pipeline[-1]
+                stage = replace(stage, substitutions=stage.substitutions + body)
+                self.segments[-1] = replace(segment, pipeline=segment.pipeline[:-1] + (stage,))
+            else:
+                self.substitutions.extend(body)
+        return min(i, len(text))
+
+    def heredoc_line(self, i: int) -> int:
+        """Scan one expanded here-doc body line for substitutions; returns the next line's start."""
+        text = self.text
+        word = self.word
+        self.word = []  # Expansion text is not part of any word
+        while i < len(text) and text[i] != "\n":
+            char = text[i]
+            if char == "\\":
+                i += 2
+            elif text.startswith("$((", i) or text.startswith("${", i):
+                i = self.expansion(i)
+            elif text.startswith("$(", i):
+                i = self.nested(i + 2, ")")
+            elif char == "`":
+                i = self.nested(i + 1, "`")
+            else:
+                i += 1
+        self.word = word
+        self.in_word = bool(word)
+        self.dynamic = False
+        return i + 1
+
+    def run(self) -> CommandAST:
+        text = self.text
+        n = len(text)
+        while self.pos < n:
+            i = self.pos
+            match = _PLAIN_CHARS.match(text, i)
+            if match:
+                self.word.append(match.group())
+                self.in_word = True
+                self.pos = match.end()
                 continue
 
-            # Check for command substitution even when not expecting a command
-            # Handles: $(cmd, `cmd`, var=$(cmd
-            has_cmd_substitution = "=$(" in token or token.startswith("$(") or "`" in token
+            char = text[i]
+            if char == self.closer:
+                self.end_segment(i, i + 1)
+                self.pos = i + 1
+                return self.result(i)
+
+            if char in " \t\r":
+                self.end_word()
+                self.pos = i + 1
+            elif char == "\n":
+                self.end_segment(i, i + 1)
+                self.pos = self.skip_heredocs(i + 1)
+                self.segment_start = self.stage_start = self.pos
+            elif char == "#" and not self.in_word:
+                newline = text.find("\n", i)
+                self.pos = n if newline < 0 else newline
+            elif char == "\\":
+                if i + 1 >= n:
+                    self.fail("No escaped character")
+                    self.pos = n
+                elif text[i + 1] == "\n":
+                    self.pos = i + 2  # Line continuation
+                else:
+                    self.word.append(text[i + 1])
+                    self.in_word = True
+                    self.quoted = True
+                    self.pos = i + 2
+            elif char == "'":
+                end = text.find("'", i + 1)
+                if end < 0:
+                    self.fail("No closing quotation")
+                    end = n
+                self.word.append(text[i + 1:end])
+                self.in_word = True
+                self.quoted = True
+                self.pos = end + 1
+            elif char == '"':
+                self.pos = self.double_quoted(i + 1)
+            elif char == "$":
+                self.pos = self.dollar(i)
+            elif char == "`":
+                self.pos = self.substitution(i + 1, "`")
+            elif char == "|":
+                if text.startswith("||", i):
+                    self.end_segment(i, i + 2)
+                    self.pos = i + 2
+                else:
+                    step = 2 if text.startswith("|&", i) else 1
+                    self.end_stage(i, i + step)
+                    self.pos = i + step
+            elif char == "&" and not text.startswith("&&", i) and (
+                text.startswith("&>", i) or (self.word and self.word[-1].endswith(("<", ">")))
+            ):
+                # Redirection (2>&1, >&2, &>file), not a separator
+                self.word.append(char)
+                self.in_word = True
+                self.pos = i + 1
+            elif char in "&;":
+                step = 2 if text.startswith("&&", i) else 1
+                self.end_segment(i, i + step)
+                self.pos = i + step
+            elif text.startswith("<<", i) and not text.startswith("<<<", i):
+                operator = "<<-" if text.startswith("<<-", i) else "<<"
+                self.end_word()
+                self.word.append(operator)
+                self.in_word = True
+                self.end_word()
+                self.expect_delimiter = operator == "<<-"
+                self.pos = i + len(operator)
+            else:
+                # Other redirections and parentheses stay part of the word
+                self.word.append(char)
+                self.in_word = True
+                self.pos = i + 1
+
+        if self.closer is not None:
+            self.fail(f"No closing {self.closer!r}")
+        self.end_segment(n, n)
+        if self.heredocs:
+            self.skip_heredocs(n)
+        return self.result(n)
+
+    def result(self, end: int) -> CommandAST:
+        return CommandAST(
+            text=self.text[self.start:end].strip(),
+            segments=tuple(self.segments),
+            error=self.error,
+        )
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_command(command_string: str) -> CommandAST:
+    """
+    Parse a shell command line into segments, pipelines and substitutions.
 
-            if expect_command or has_cmd_substitution:
-                # Extract the base command name (handle paths like /usr/bin/python)
-                cmd = os.path.basename(token)
+    Results are cached by command text (the AST is immutable).
 
-                # Strip command substitution syntax: var=$(cmd -> cmd
-                # Handle patterns like: count=$(jq, result=$(grep, etc.
-                if "=$(" in cmd:
-                    cmd = cmd.split("=$(", 1)[1]
+    Args:
+        command_string: The full shell command
 
-                # Strip leading $( from command substitution: $(jq -> jq
-                if cmd.startswith("$("):
-                    cmd = cmd[2:]
+    Returns:
+        CommandAST (with error set if the command is malformed)
+    """
+    return _Scanner(command_string).run()
 
-                # Strip closing parenthesis from command substitution: jq) -> jq
-                if cmd.endswith(")"):
-                    cmd = cmd.rstrip(")")
 
-                # Strip backticks: `cmd` -> cmd
-                cmd = cmd.strip("`")
+def split_command_segments(command_string: str) -> list[str]:
+    """
+    Split a compound command into individual command segments.
 
-                # Skip empty commands (edge case from stripping)
-                if not cmd:
-                    continue
+    Handles command chaining (&&, ||, ;, &, newlines) outside quotes, but
+    not pipes (those are single commands).
 
-                commands.append(cmd)
-                expect_command = False
+    Args:
+        command_string: The full shell command
 
-    return commands
+    Returns:
+        List of individual command segments
+    """
+    return [segment.text for segment in parse_command(command_string).segments]
 
 
-def validate_pkill_command(command_string: str) -> tuple[bool, str]:
+def extract_commands(command_string: str) -> list[str]:
     """
-    Validate pkill commands - only allow killing dev-related processes.
+    Extract command names from a shell command string.
 
-    Uses shlex to parse the command, avoiding regex bypass vulnerabilities.
+    Handles pipes, command chaining (&&, ||, ;), and subshells.
+    Returns the base command names (without paths).
+
+    Args:
+        command_string: The full shell command
 
     Returns:
-        Tuple of (is_allowed, reason_if_blocked)
+        List of command names found in the string (empty if malformed)
     """
-    # Allowed process names for pkill
-    allowed_process_names = {
-        "node",
-        "npm",
-        "npx",
-        "vite",
-        "next",
-        "chrome",
-        "chromium",
-        "firefox",
-        "Google Chrome",  # For browser automation
-        "curl",           # For killing hanging HTTP requests during testing
-        "wget",           # For killing hanging downloads
-    }
+    ast = parse_command(command_string)
+    if ast.error:
+        # Malformed command (unclosed quotes, etc.)
+        # Return empty to trigger block (fail-safe)
+        return []
+    return list(ast.commands)
+
 
+# Allowed process names for pkill
+PKILL_ALLOWED_PROCESSES = frozenset({
+    "node",
+    "npm",
+    "npx",
+    "vite",
+    "next",
+    "chrome",
+    "chromium",
+    "firefox",
+    "Google Chrome",  # For browser automation
+    "curl",           # For killing hanging HTTP requests during testing
+    "wget",           # For killing hanging downloads
+})
+
+
+def _split(command_string: str, what: str) -> Tuple[Optional[List[str]], str]:
     try:
-        tokens = shlex.split(command_string)
+        return shlex.split(command_string), ""
     except ValueError:
-        return False, "Could not parse pkill command"
+        return None, f"Could not parse {what}"
+
 
+def _check_pkill(tokens: Tuple[str, ...], policy: SecurityPolicy) -> Tuple[bool, str]:
     if not tokens:
         return False, "Empty pkill command"
 
     # Separate flags from arguments
-    args = []
-    for token in tokens[1:]:
-        if not token.startswith("-"):
-            args.append(token)
-
+    args = [token for token in tokens[1:] if not token.startswith("-")]
     if not args:
         return False, "pkill requires a process name"
 
@@ -288,23 +690,12 @@ def validate_pkill_command(command_string: str) -> tuple[bool, str]:
     if " " in target:
         target = target.split()[0]
 
-    if target in allowed_process_names:
+    if target in policy.pkill_processes:
         return True, ""
-    return False, f"pkill only allowed for dev processes: {allowed_process_names}"
+    return False, f"pkill only allowed for dev processes: {set(policy.pkill_processes)}"
 
 
-def validate_chmod_command(command_string: str) -> tuple[bool, str]:
-    """
-    Validate chmod commands - only allow making files executable with +x.
-
-    Returns:
-        Tuple of (is_allowed, reason_if_blocked)
-    """
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
-        return False, "Could not parse chmod command"
-
+def _check_chmod(tokens: Tuple[str, ...], policy: SecurityPolicy) -> Tuple[bool, str]:
     if not tokens or tokens[0] != "chmod":
         return False, "Not a chmod command"
 
@@ -330,26 +721,13 @@ def validate_chmod_command(command_string: str) -> tuple[bool, str]:
 
     # Only allow +x variants (making files executable)
     # This matches: +x, u+x, g+x, o+x, a+x, ug+x, etc.
-    import re
-
-    if not re.match(r"^[ugoa]*\+x$", mode):
+    if not policy.chmod_mode.match(mode):
         return False, f"chmod only allowed with +x mode, got: {mode}"
 
     return True, ""
 
 
-def validate_init_script(command_string: str) -> tuple[bool, str]:
-    """
-    Validate init.sh script execution - only allow ./init.sh.
-
-    Returns:
-        Tuple of (is_allowed, reason_if_blocked)
-    """
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
-        return False, "Could not parse init script command"
-
+def _check_init_script(tokens: Tuple[str, ...], policy: SecurityPolicy) -> Tuple[bool, str]:
     if not tokens:
         return False, "Empty command"
 
@@ -363,21 +741,186 @@ def validate_init_script(command_string: str) -> tuple[bool, str]:
     return False, f"Only ./init.sh is allowed, got: {script}"
 
 
-def get_command_for_validation(cmd: str, segments: list[str]) -> str:
+def validate_pkill_command(command_string: str) -> tuple[bool, str]:
+    """
+    Validate pkill commands - only allow killing dev-related processes.
+
+    Uses shlex to parse the command, avoiding regex bypass vulnerabilities.
+
+    Returns:
+        Tuple of (is_allowed, reason_if_blocked)
+    """
+    tokens, error = _split(command_string, "pkill command")
+    if tokens is None:
+        return False, error
+    return _check_pkill(tuple(tokens), DEFAULT_POLICY)
+
+
+def validate_chmod_command(command_string: str) -> tuple[bool, str]:
+    """
+    Validate chmod commands - only allow making files executable with +x.
+
+    Returns:
+        Tuple of (is_allowed, reason_if_blocked)
+    """
+    tokens, error = _split(command_string, "chmod command")
+    if tokens is None:
+        return False, error
+    return _check_chmod(tuple(tokens), DEFAULT_POLICY)
+
+
+def validate_init_script(command_string: str) -> tuple[bool, str]:
+    """
+    Validate init.sh script execution - only allow ./init.sh.
+
+    Returns:
+        Tuple of (is_allowed, reason_if_blocked)
+    """
+    tokens, error = _split(command_string, "init script command")
+    if tokens is None:
+        return False, error
+    return _check_init_script(tuple(tokens), DEFAULT_POLICY)
+
+
+# Tools that write files, checked by protect_policy_files_hook
+FILE_WRITE_TOOLS = frozenset({"Write", "Edit", "MultiEdit", "NotebookEdit"})
+
+# Commands whose last argument (or -t DIR) is the file they write
+DESTINATION_COMMANDS = frozenset({"cp", "mv", "ln"})
+
+# Output redirection word: optional fd or &, > or >>, then the target if attached
+_REDIRECT_OUT = re.compile(r"^(?:\d*|&)>>?(.*)$")
+
+
+def is_policy_file(path: str) -> bool:
+    """Whether a path is a .claude/security_policy.* file."""
+    parts = os.path.normpath(path).split(os.sep)
+    return len(parts) >= 2 and parts[-2] == ".claude" and parts[-1].startswith("security_policy.")
+
+
+def _write_targets(argv: Tuple[str, ...]) -> Iterator[str]:
     """
-    Find the specific command segment that contains the given command.
+    Files a stage writes: output redirections, tee files, cp/mv/ln
+    destinations and sed -i files.
+
+    Best effort - a glob or an interpreter gets past it; the project policy
+    being frozen for the process is what actually protects it.
+    """
+    positional = []
+    index = 1
+    while index < len(argv):
+        word = argv[index]
+        redirect = _REDIRECT_OUT.match(word)
+        if redirect:
+            target = redirect.group(1)
+            if not target and index + 1 < len(argv):
+                index += 1
+                target = argv[index]
+            if target and not target.startswith("&"):
+                yield target
+        elif word in ("<", "<<", "<<<") or (word.startswith("<") and word != "<"):
+            index += word in ("<", "<<", "<<<")  # Skip an input redirection's source
+        elif not word.startswith("-") or word == "-":
+            positional.append(word)
+        index += 1
+
+    name = os.path.basename(argv[0])
+    if name == "tee" or (name == "sed" and any(
+        word in ("-i", "--in-place") or word.startswith("--in-place=")
+        or (word.startswith("-") and not word.startswith("--") and "i" in word)
+        for word in argv[1:]
+    )):
+        yield from positional
+    elif name in DESTINATION_COMMANDS:
+        target_dirs = [
+            argv[i + 1] for i, word in enumerate(argv[:-1]) if word in ("-t", "--target-directory")
+        ] + [word.split("=", 1)[1] for word in argv if word.startswith("--target-directory=")]
+        if not target_dirs and len(positional) >= 2:
+            yield positional[-1]  # Destination file...
+            target_dirs, positional = [positional[-1]], positional[:-1]
+        for directory in target_dirs:  # ...or the directory each source lands in
+            for source in positional:
+                yield os.path.join(directory, os.path.basename(source.rstrip("/")))
+
+
+# Built-in policy (bottom layer under global and project policy files)
+DEFAULT_POLICY = SecurityPolicy(
+    allowed_commands=frozenset(ALLOWED_COMMANDS),
+    pkill_processes=PKILL_ALLOWED_PROCESSES,
+    chmod_mode=_CHMOD_EXECUTE_MODE,
+)
+
+# Compiled policies shared by every session and project in this process
+_policy_loader = PolicyLoader(DEFAULT_POLICY, on_reload=lambda: evaluate_command.cache_clear())
+
+
+def get_policy(project_dir: Optional[str] = None) -> SecurityPolicy:
+    """
+    Compiled security policy for a project.
 
     Args:
-        cmd: The command name to find
-        segments: List of command segments
+        project_dir: Project directory (None for the global policy only)
 
     Returns:
-        The segment containing the command, or empty string if not found
+        SecurityPolicy, recompiled when a policy file changes
     """
-    for segment in segments:
-        segment_commands = extract_commands(segment)
-        if cmd in segment_commands:
-            return segment
+    return _policy_loader.get(project_dir)
+
+
+# Validators for COMMANDS_NEEDING_EXTRA_VALIDATION, applied to a stage's argv
+_VALIDATORS = {
+    "pkill": _check_pkill,
+    "chmod": _check_chmod,
+    "init.sh": _check_init_script,
+}
+
+
+@lru_cache(maxsize=DECISION_CACHE_SIZE)
+def evaluate_command(command: str, policy: Optional[SecurityPolicy] = None) -> str:
+    """
+    Decide whether a Bash command may run.
+
+    Parses the command once and checks every stage (pipelines and
+    substitutions included) against the allowlist and the extra validators.
+    Decisions are cached by command text and policy - agents repeat the
+    same commands many times per session.
+
+    Args:
+        command: The full shell command
+        policy: Compiled policy (DEFAULT_POLICY if None)
+
+    Returns:
+        Reason the command is blocked, or "" to allow it
+    """
+    policy = policy or DEFAULT_POLICY
+    if policy.error:
+        return f"Security policy is invalid, fix it to run commands: {policy.error}"
+
+    ast = parse_command(command)
+    stages = list(ast.stages())
+
+    if ast.error or not any(stage.name or stage.dynamic for stage in stages):
+        # Could not parse - fail safe by blocking
+        return f"Could not parse command for security validation: {command}"
+
+    for stage in stages:
+        if stage.dynamic:
+            return f"Command name built from a substitution is not allowed: {stage.text}"
+        if not stage.name:
+            continue
+
+        if not policy.allows(stage.name):
+            return f"Command '{stage.name}' is not in the allowed commands list"
+
+        if any(is_policy_file(target) for target in _write_targets(stage.argv)):
+            return "Security policy files cannot be changed by the agent"
+
+        # Additional validation for sensitive commands
+        if stage.name in COMMANDS_NEEDING_EXTRA_VALIDATION:
+            allowed, reason = _VALIDATORS[stage.name](stage.argv, policy)
+            if not allowed:
+                return reason
+
     return ""
 
 
@@ -385,10 +928,11 @@ async def bash_security_hook(input_data, tool_use_id=None, context=None):
     """
     Pre-tool-use hook that validates bash commands using an allowlist.
 
-    Only commands in ALLOWED_COMMANDS are permitted.
+    Only commands allowed by the project's policy (ALLOWED_COMMANDS plus
+    any policy files) are permitted.
 
     Args:
-        input_data: Dict containing tool_name and tool_input
+        input_data: Dict containing tool_name, tool_input and cwd
         tool_use_id: Optional tool use ID
         context: Optional context
 
@@ -402,45 +946,40 @@ async def bash_security_hook(input_data, tool_use_id=None, context=None):
     if not command:
         return {}
 
-    # Extract all commands from the command string
-    commands = extract_commands(command)
+    start = time.perf_counter_ns()
+    project_dir = input_data.get("cwd")
+    reason = evaluate_command(command, get_policy(project_dir))
+    if project_dir:
+        # Audit the decision (.claude/security_audit.jsonl)
+        elapsed_us = (time.perf_counter_ns() - start) / 1000
+        get_audit_log(project_dir).record(command, parse_command(command).commands, reason, elapsed_us)
 
-    if not commands:
-        # Could not parse - fail safe by blocking
-        return {
-            "decision": "block",
-            "reason": f"Could not parse command for security validation: {command}",
-        }
-
-    # Split into segments for per-command validation
-    segments = split_command_segments(command)
-
-    # Check each command against the allowlist
-    for cmd in commands:
-        if cmd not in ALLOWED_COMMANDS:
-            return {
-                "decision": "block",
-                "reason": f"Command '{cmd}' is not in the allowed commands list",
-            }
+    if reason:
+        return {"decision": "block", "reason": reason}
+    return {}
 
-        # Additional validation for sensitive commands
-        if cmd in COMMANDS_NEEDING_EXTRA_VALIDATION:
-            # Find the specific segment containing this command
-            cmd_segment = get_command_for_validation(cmd, segments)
-            if not cmd_segment:
-                cmd_segment = command  # Fallback to full command
-
-            if cmd == "pkill":
-                allowed, reason = validate_pkill_command(cmd_segment)
-                if not allowed:
-                    return {"decision": "block", "reason": reason}
-            elif cmd == "chmod":
-                allowed, reason = validate_chmod_command(cmd_segment)
-                if not allowed:
-                    return {"decision": "block", "reason": reason}
-            elif cmd == "init.sh":
-                allowed, reason = validate_init_script(cmd_segment)
-                if not allowed:
-                    return {"decision": "block", "reason": reason}
 
+async def protect_policy_files_hook(input_data, tool_use_id=None, context=None):
+    """
+    Pre-tool-use hook that blocks agent writes to security policy files.
+
+    The project policy is read once per process (see security_policy.py),
+    so a rewritten file would not take effect anyway - this makes the
+    attempt fail visibly instead.
+
+    Args:
+        input_data: Dict containing tool_name and tool_input
+        tool_use_id: Optional tool use ID
+        context: Optional context
+
+    Returns:
+        Empty dict to allow, or {"decision": "block", "reason": "..."} to block
+    """
+    if input_data.get("tool_name") not in FILE_WRITE_TOOLS:
+        return {}
+
+    tool_input = input_data.get("tool_input", {})
+    path = tool_input.get("file_path") or tool_input.get("notebook_path") or ""
+    if path and is_policy_file(path):
+        return {"decision": "block", "reason": f"Security policy files cannot be changed by the agent: {path}"}
     return {}
@@ -0,0 +1,278 @@
+"""
+Security Audit Log
+==================
+
+Records every bash_security_hook decision to .claude/security_audit.jsonl:
+
+    {"ts": "...", "hash": "3f2a9c...", "commands": ["npm", "tail"],
+     "decision": "allow", "reason": "", "us": 41.7}
+
+Commands are stored by hash plus the extracted command names, not as full
+text (they may contain credentials). Block reasons are cut at their detail
+part (the arguments, stage text or command line after ": ") for the same
+reason. Entries are buffered in memory and
+appended in batches; the file rotates like errors.jsonl.
+
+The summarizer reports the most common block reasons and p50/p99 hook
+latency. Every blocked command costs the agent a turn, so the top of that
+list is where widening the policy (.claude/security_policy.yaml) pays off.
+
+Usage:
+    python security_audit.py <project_dir>
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+
+# Audit log file name inside the project's .claude/ directory
+AUDIT_LOG_NAME = "security_audit.jsonl"
+
+# Buffered entries before a write
+AUDIT_BUFFER_SIZE = 100
+
+# Max seconds an entry waits in the buffer
+AUDIT_FLUSH_SECONDS = 5.0
+
+# Rotate the audit log when it grows past this size
+AUDIT_LOG_MAX_BYTES = 5 * 1024 * 1024
+
+# Rotated audit logs kept (security_audit.jsonl.1 ... .N)
+AUDIT_LOG_BACKUPS = 3
+
+# Longest reason stored per entry
+MAX_REASON_CHARS = 200
+
+# Command text a block reason quotes after its template ("...: <detail>",
+# "..., got: <detail>")
+_REASON_DETAIL = re.compile(r"(?:,\s*got)?:\s.*$", re.DOTALL)
+
+
+def command_hash(command: str) -> str:
+    """Stable short hash identifying a command line."""
+    return hashlib.sha1(command.encode("utf-8", "replace")).hexdigest()[:16]
+
+
+def redact_reason(reason: str) -> str:
+    """Block reason without the command text it quotes."""
+    return _REASON_DETAIL.sub("", reason)[:MAX_REASON_CHARS]
+
+
+class SecurityAuditLog:
+    """Buffered, rotating JSONL log of security hook decisions."""
+
+    def __init__(
+        self,
+        path: Path,
+        buffer_size: int = AUDIT_BUFFER_SIZE,
+        flush_seconds: float = AUDIT_FLUSH_SECONDS,
+        max_bytes: int = AUDIT_LOG_MAX_BYTES,
+        backups: int = AUDIT_LOG_BACKUPS,
+    ):
+        """
+        Initialize audit log.
+
+        Args:
+            path: JSONL file to append to
+            buffer_size: Entries buffered before a write
+            flush_seconds: Max age of a buffered entry before a write
+            max_bytes: Rotate the file past this size
+            backups: Rotated files kept
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self.flush_seconds = flush_seconds
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, command: str, commands: Sequence[str], reason: str, elapsed_us: float):
+        """
+        Buffer one hook decision.
+
+        Args:
+            command: Full command line (stored as a hash)
+            commands: Command names extracted from it
+            reason: Block reason ("" if allowed, stored redacted)
+            elapsed_us: Hook evaluation time in microseconds
+        """
+        entry = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "hash": command_hash(command),
+            "commands": list(commands),
+            "decision": "block" if reason else "allow",
+            "reason": redact_reason(reason),
+            "us": round(elapsed_us, 1),
+        }
+        with self._lock:
+            self._buffer.append(json.dumps(entry))
+            due = (
+                len(self._buffer) >= self.buffer_size
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write buffered entries, rotating the file if it is too large."""
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+            if not lines:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a") as f:
+                    f.write("\n".join(lines) + "\n")
+                if self.path.stat().st_size > self.max_bytes:
+                    self._rotate()
+            except OSError:
+                pass  # Auditing must never break the hook
+
+    def _rotate(self):
+        """Shift security_audit.jsonl -> .1 -> ... dropping the oldest."""
+        for i in range(self.backups - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+
+
+# Audit logs by project directory, shared by all sessions in this process
+_logs: Dict[str, SecurityAuditLog] = {}
+_logs_lock = threading.Lock()
+
+
+def audit_log_path(project_dir) -> Path:
+    """Audit log file of a project."""
+    return Path(project_dir) / ".claude" / AUDIT_LOG_NAME
+
+
+def get_audit_log(project_dir) -> SecurityAuditLog:
+    """Shared audit log for a project directory."""
+    key = str(project_dir)
+    log = _logs.get(key)
+    if log is None:
+        with _logs_lock:
+            log = _logs.setdefault(key, SecurityAuditLog(audit_log_path(project_dir)))
+    return log
+
+
+def flush_all():
+    """Flush every open audit log (after each session and at exit)."""
+    for log in list(_logs.values()):
+        log.flush()
+
+
+atexit.register(flush_all)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def load_entries(path: Path) -> List[Dict]:
+    """Entries of an audit log and its rotated backups, oldest first."""
+    files = sorted(
+        path.parent.glob(f"{path.name}.*"),
+        key=lambda p: int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0,
+        reverse=True,
+    ) + [path]
+    entries = []
+    for file in files:
+        try:
+            with open(file) as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # Torn last line
+        except OSError:
+            continue
+    return entries
+
+
+def summarize_audit_log(project_dir, top: int = 10) -> Dict:
+    """
+    Summarize a project's security decisions.
+
+    Args:
+        project_dir: Project directory
+        top: Number of block reasons to list
+
+    Returns:
+        Dict with total, blocked, block_rate, p50_us, p99_us and
+        top_blocked ([{"reason", "count", "commands"}])
+    """
+    get_audit_log(project_dir).flush()
+    entries = load_entries(audit_log_path(project_dir))
+
+    latencies = sorted(float(e.get("us", 0)) for e in entries)
+    blocked = [e for e in entries if e.get("decision") == "block"]
+
+    reasons = Counter(e.get("reason", "") for e in blocked)
+    examples: Dict[str, Counter] = {}
+    for e in blocked:
+        examples.setdefault(e.get("reason", ""), Counter())[" ".join(e.get("commands", []))] += 1
+
+    return {
+        "total": len(entries),
+        "blocked": len(blocked),
+        "block_rate": len(blocked) / len(entries) if entries else 0.0,
+        "p50_us": _percentile(latencies, 0.50),
+        "p99_us": _percentile(latencies, 0.99),
+        "top_blocked": [
+            {
+                "reason": reason,
+                "count": count,
+                "commands": examples[reason].most_common(1)[0][0],
+            }
+            for reason, count in reasons.most_common(top)
+        ],
+    }
+
+
+def print_audit_summary(project_dir, top: int = 10):
+    """Print the security decision summary for a project (nothing if empty)."""
+    summary = summarize_audit_log(project_dir, top)
+    if not summary["total"]:
+        return
+
+    print("\n" + "=" * 70)
+    print("  SECURITY HOOK SUMMARY")
+    print("=" * 70)
+    print(f"\nCommands checked: {summary['total']}")
+    print(f"Blocked: {summary['blocked']} ({summary['block_rate']:.1%})")
+    print(f"Hook latency: p50 {summary['p50_us']:.0f}µs, p99 {summary['p99_us']:.0f}µs")
+    if summary["top_blocked"]:
+        print("\nMost blocked (each one cost the agent a turn):")
+        for item in summary["top_blocked"]:
+            print(f"   {item['count']:4d}x  {item['reason']}")
+            if item["commands"]:
+                print(f"          e.g. commands: {item['commands']}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python security_audit.py <project_dir>")
+        sys.exit(1)
+    project = Path(sys.argv[1])
+    if not audit_log_path(project).exists():
+        print(f"No security audit log in {project / '.claude'}")
+        sys.exit(1)
+    print_audit_summary(project)
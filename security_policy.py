@@ -0,0 +1,314 @@
+"""
+Security Policy Files
+=====================
+
+Declarative overrides for the Bash allowlist in security.py.
+
+Policies are loaded from (later layers override earlier ones):
+1. Built-in defaults: ALLOWED_COMMANDS etc. in security.py
+2. Global policy: ~/.claude/security_policy.{yaml,yml,toml}
+3. Project policy: <project>/.claude/security_policy.{yaml,yml,toml}
+
+Example (.claude/security_policy.yaml for a Go project):
+
+    allow: [go, gofmt, golangci-lint]
+    allow_patterns: ["python3.*"]     # fnmatch patterns on command names
+    deny: [curl, wget]
+    pkill_processes: [air]            # Added to the pkill allowlist
+    chmod_mode_pattern: '^[ugoa]*\\+x$'
+    replace_defaults: false           # true: start from an empty allowlist
+
+Each layer is compiled into an immutable SecurityPolicy (frozen sets and
+compiled regexes). PolicyLoader caches compiled policies per project for the
+whole process. The global policy is recompiled when its mtime changes, so
+edits apply to running sessions without rebuilding the client.
+
+The project policy lives inside the tree the agent can write to, so it is
+read once - the first time the project is seen, which create_client()
+arranges before the agent starts - and frozen for the rest of the process.
+The agent is also denied writes to it (see protect_policy_files_hook in
+security.py).
+"""
+
+import fnmatch
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import yaml
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
+
+
+# Policy file names, in order of preference within a directory
+POLICY_FILE_NAMES = ("security_policy.yaml", "security_policy.yml", "security_policy.toml")
+
+# Directory holding the global policy file
+GLOBAL_POLICY_DIR = Path.home() / ".claude"
+
+# Project directory holding the (frozen) project policy file
+PROJECT_POLICY_DIR = ".claude"
+
+# Seconds between mtime checks of the policy files
+POLICY_CHECK_INTERVAL = 1.0
+
+# Keys a policy file may contain
+POLICY_KEYS = frozenset({
+    "allow", "allow_patterns", "deny", "pkill_processes", "chmod_mode_pattern", "replace_defaults",
+})
+
+
+class PolicyError(ValueError):
+    """Raised for policy files that cannot be loaded or compiled."""
+
+
+@dataclass(frozen=True, eq=False)
+class SecurityPolicy:
+    """
+    Compiled Bash command policy.
+
+    Compared and hashed by identity: each compiled policy is shared, and
+    decision caches are keyed on the policy object.
+    """
+    allowed_commands: FrozenSet[str]
+    pkill_processes: FrozenSet[str]
+    chmod_mode: "re.Pattern[str]"
+    allow_pattern: Optional["re.Pattern[str]"] = None  # Combined allow_patterns
+    denied_commands: FrozenSet[str] = frozenset()
+    sources: Tuple[str, ...] = ()  # Policy files this was compiled from
+    error: Optional[str] = None  # Set if a policy file is invalid (blocks everything)
+
+    def allows(self, command: str) -> bool:
+        """Whether a command name is allowed."""
+        if command in self.denied_commands:
+            return False
+        if command in self.allowed_commands:
+            return True
+        return self.allow_pattern is not None and self.allow_pattern.match(command) is not None
+
+
+def _string_list(data: Dict[str, Any], key: str, path: Path) -> List[str]:
+    value = data.get(key, [])
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise PolicyError(f"{path}: '{key}' must be a list of strings")
+    return value
+
+
+def read_policy_file(path: Path) -> Dict[str, Any]:
+    """
+    Read a YAML or TOML policy file.
+
+    Raises:
+        PolicyError: If the file cannot be read or parsed
+    """
+    try:
+        if path.suffix == ".toml":
+            if tomllib is None:
+                raise PolicyError(f"{path}: TOML policies need Python 3.11+ (use YAML instead)")
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        else:
+            with open(path) as f:
+                data = yaml.safe_load(f)
+    except PolicyError:
+        raise
+    except Exception as e:
+        raise PolicyError(f"{path}: {e}") from e
+
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise PolicyError(f"{path}: expected a mapping at the top level")
+    unknown = set(data) - POLICY_KEYS
+    if unknown:
+        raise PolicyError(f"{path}: unknown keys {sorted(unknown)}")
+    return data
+
+
+def compile_policy(data: Dict[str, Any], base: SecurityPolicy, path: Path) -> SecurityPolicy:
+    """
+    Compile one policy file's data on top of a base policy.
+
+    Args:
+        data: Parsed policy file
+        base: Policy of the layers below
+        path: Policy file (for error messages and sources)
+
+    Returns:
+        New SecurityPolicy
+
+    Raises:
+        PolicyError: If a value has the wrong type or a pattern does not compile
+    """
+    allow = _string_list(data, "allow", path)
+    deny = _string_list(data, "deny", path)
+    patterns = _string_list(data, "allow_patterns", path)
+    pkill = _string_list(data, "pkill_processes", path)
+
+    replace = data.get("replace_defaults", False)
+    if not isinstance(replace, bool):
+        raise PolicyError(f"{path}: 'replace_defaults' must be true or false")
+
+    allowed = set() if replace else set(base.allowed_commands)
+    allowed.update(allow)
+    allowed.difference_update(deny)
+
+    # Denied names also beat allow_patterns from this and lower layers
+    denied = (set() if replace else set(base.denied_commands) - set(allow)) | set(deny)
+
+    allow_pattern = None if replace else base.allow_pattern
+    if patterns:
+        combined = "|".join(fnmatch.translate(pattern) for pattern in patterns)
+        if allow_pattern is not None:
+            combined = f"{allow_pattern.pattern}|{combined}"
+        allow_pattern = re.compile(combined)
+
+    chmod_mode = base.chmod_mode
+    if "chmod_mode_pattern" in data:
+        try:
+            chmod_mode = re.compile(str(data["chmod_mode_pattern"]))
+        except re.error as e:
+            raise PolicyError(f"{path}: invalid chmod_mode_pattern: {e}") from e
+
+    return SecurityPolicy(
+        allowed_commands=frozenset(allowed),
+        pkill_processes=base.pkill_processes | frozenset(pkill),
+        chmod_mode=chmod_mode,
+        allow_pattern=allow_pattern,
+        denied_commands=frozenset(denied),
+        sources=base.sources + (str(path),),
+    )
+
+
+def find_policy_file(directory: Path) -> Optional[Path]:
+    """First policy file present in a directory."""
+    for name in POLICY_FILE_NAMES:
+        path = directory / name
+        if path.is_file():
+            return path
+    return None
+
+
+class PolicyLoader:
+    """
+    Process-wide cache of compiled policies, one per project directory.
+
+    The global policy file is re-checked at most every POLICY_CHECK_INTERVAL
+    seconds and recompiled when its mtime changes. A project's policy file
+    is read the first time the project is seen and never re-read.
+    """
+
+    def __init__(
+        self,
+        default: SecurityPolicy,
+        global_dir: Optional[Path] = GLOBAL_POLICY_DIR,
+        on_reload: Optional[Callable[[], None]] = None,
+        check_interval: float = POLICY_CHECK_INTERVAL,
+    ):
+        """
+        Initialize policy loader.
+
+        Args:
+            default: Built-in policy (bottom layer)
+            global_dir: Directory of the global policy file (None to disable)
+            on_reload: Called after any policy is recompiled (e.g. to clear decision caches)
+            check_interval: Seconds between mtime checks per project
+        """
+        self.default = default
+        self.global_dir = global_dir
+        self.on_reload = on_reload
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        # {project_dir: (checked_at, stamp, policy)}
+        self._cache: Dict[Optional[str], Tuple[float, Tuple, SecurityPolicy]] = {}
+        # {project_dir: (path, data or PolicyError)} as first read, None if no file
+        self._project_layers: Dict[str, Optional[Tuple[Path, Any]]] = {}
+
+    def _read_layer(self, path: Path) -> Tuple[Path, Any]:
+        try:
+            return path, read_policy_file(path)
+        except PolicyError as e:
+            return path, e
+
+    def _project_layer(self, project_dir: str) -> Optional[Tuple[Path, Any]]:
+        """The project's policy file contents, frozen at first use."""
+        if project_dir not in self._project_layers:
+            path = find_policy_file(Path(project_dir) / PROJECT_POLICY_DIR)
+            self._project_layers[project_dir] = None if path is None else self._read_layer(path)
+        return self._project_layers[project_dir]
+
+    def _compile(self, layers: List[Tuple[Path, Any]]) -> SecurityPolicy:
+        policy = self.default
+        for path, data in layers:
+            try:
+                if isinstance(data, PolicyError):
+                    raise data
+                policy = compile_policy(data, policy, path)
+            except PolicyError as e:
+                # Fail safe: an unreadable policy blocks every command until fixed
+                return SecurityPolicy(
+                    allowed_commands=frozenset(),
+                    pkill_processes=frozenset(),
+                    chmod_mode=self.default.chmod_mode,
+                    sources=policy.sources + (str(path),),
+                    error=str(e),
+                )
+        return policy
+
+    def get(self, project_dir: Optional[str] = None) -> SecurityPolicy:
+        """
+        Compiled policy for a project (global + defaults if project_dir is None).
+
+        Args:
+            project_dir: Project directory (the hook input's cwd)
+
+        Returns:
+            SecurityPolicy shared by all callers for that project
+        """
+        if project_dir:
+            project_dir = os.path.realpath(project_dir)
+        now = time.monotonic()
+        cached = self._cache.get(project_dir)
+        if cached is not None and now - cached[0] < self.check_interval:
+            return cached[2]
+
+        with self._lock:
+            global_file = find_policy_file(self.global_dir) if self.global_dir is not None else None
+            stamp = ()
+            if global_file is not None:
+                try:
+                    stamp = (str(global_file), global_file.stat().st_mtime_ns)
+                except OSError:
+                    stamp = (str(global_file), None)
+
+            cached = self._cache.get(project_dir)
+            if cached is not None and cached[1] == stamp:
+                self._cache[project_dir] = (now, stamp, cached[2])
+                return cached[2]
+
+            layers = [] if global_file is None else [self._read_layer(global_file)]
+            if project_dir:
+                project_layer = self._project_layer(project_dir)
+                if project_layer is not None:
+                    layers.append(project_layer)
+            policy = self._compile(layers)
+            self._cache[project_dir] = (now, stamp, policy)
+
+        if cached is not None and self.on_reload is not None:
+            self.on_reload()
+        return policy
+
+    def clear(self):
+        """Drop all compiled policies and frozen project files (next get() re-reads them)."""
+        with self._lock:
+            self._cache.clear()
+            self._project_layers.clear()
@@ -0,0 +1,181 @@
+"""
+Session Attribution
+===================
+
+Attributes the outcome of a coding session to feature ids so the retry
+manager can count attempts per feature.
+
+Two sources are combined:
+- The feature_list.json diff before/after the session (features that flipped
+  to passing, or regressed)
+- Commit messages created during the session that mention a feature by id
+  or description
+
+The target feature is the one the session was pointed at (the retry
+manager's next feature). A session that times out or errors without the
+target flipping to passing is a failure for the target; a completed session
+is a failure for the target only if it made no commits and flipped nothing
+to passing. A normal session that commits partial work on the target is not
+held against it.
+"""
+
+import re
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from feature_loader import Feature, load_project_features
+
+
+# Descriptions shorter than this are too generic to match in commit messages
+MIN_DESCRIPTION_MATCH = 12
+
+# Prefix of a description that has to appear in a commit message
+DESCRIPTION_MATCH_CHARS = 60
+
+# Skipped features listed in the prompt (the rest are summarized)
+MAX_SKIPPED_IN_PROMPT = 20
+
+
+@dataclass
+class SessionSnapshot:
+    """Feature pass state and git HEAD at the start of a session."""
+    passes: Dict[str, bool]
+    head: Optional[str]
+
+
+@dataclass
+class SessionAttribution:
+    """Which features a session touched and how."""
+    target: Optional[str] = None
+    passed: List[str] = field(default_factory=list)  # Flipped to passing
+    regressed: List[str] = field(default_factory=list)  # Flipped to failing
+    mentioned: List[str] = field(default_factory=list)  # Referenced by new commits
+    failed: List[str] = field(default_factory=list)  # Attempts to count as failures
+
+
+def git_output(project_dir: Path, *args: str) -> Optional[str]:
+    """Run a git command, returning stdout or None if git/repo is unavailable."""
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=project_dir,
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def take_snapshot(project_dir: Path) -> SessionSnapshot:
+    """Record feature pass state and HEAD before a session."""
+    head = git_output(project_dir, "rev-parse", "HEAD")
+    return SessionSnapshot(
+        passes={f.id: f.passes for f in load_project_features(project_dir)},
+        head=head.strip() if head else None,
+    )
+
+
+def commit_messages_since(project_dir: Path, base: Optional[str]) -> List[str]:
+    """Full messages of commits made after base (all commits if base is None)."""
+    rev_range = f"{base}..HEAD" if base else "HEAD"
+    output = git_output(project_dir, "log", "--format=%B%x00", rev_range)
+    if not output:
+        return []
+    return [message.strip() for message in output.split("\0") if message.strip()]
+
+
+def features_mentioned(features: Iterable[Feature], messages: List[str]) -> List[str]:
+    """Ids of features referenced by id or description in any commit message."""
+    text = "\n".join(messages).lower()
+    if not text:
+        return []
+
+    mentioned = []
+    for feature in features:
+        description = feature.description.strip().lower()[:DESCRIPTION_MATCH_CHARS]
+        id_pattern = rf"(?<![\w-]){re.escape(feature.id.lower())}(?![\w-])"
+        if re.search(id_pattern, text) or (
+            len(description) >= MIN_DESCRIPTION_MATCH and description in text
+        ):
+            mentioned.append(feature.id)
+    return mentioned
+
+
+def attribute_session(
+    project_dir: Path,
+    before: SessionSnapshot,
+    status: str,
+    target: Optional[str] = None,
+) -> SessionAttribution:
+    """
+    Attribute a finished session's outcome to feature ids.
+
+    Args:
+        project_dir: Project directory
+        before: Snapshot taken before the session started
+        status: Session status ("continue", "timeout" or "error")
+        target: Feature id the session was pointed at
+
+    Returns:
+        SessionAttribution with passed/regressed/mentioned/failed ids
+    """
+    features = load_project_features(project_dir)
+    after = {f.id: f.passes for f in features}
+
+    result = SessionAttribution(target=target)
+    result.passed = [fid for fid, passes in after.items() if passes and not before.passes.get(fid)]
+    result.regressed = [fid for fid, passes in after.items() if not passes and before.passes.get(fid)]
+    messages = commit_messages_since(project_dir, before.head)
+    result.mentioned = features_mentioned(features, messages)
+
+    if target is None or after.get(target):
+        return result
+
+    if status in ("timeout", "error"):
+        result.failed.append(target)
+    elif not (messages or result.passed):
+        # Completed without committing anything or passing any feature
+        result.failed.append(target)
+    return result
+
+
+def build_focus_prompt(base_prompt: str, target: Optional[Feature], skipped: List[Feature]) -> str:
+    """
+    Append the session's target feature and skipped features to a prompt.
+
+    Args:
+        base_prompt: Normal coding prompt
+        target: Feature to work on next (None to leave the choice to the agent)
+        skipped: Failing features that hit max retries
+
+    Returns:
+        Prompt text (unchanged if there is nothing to add)
+    """
+    if target is None and not skipped:
+        return base_prompt
+
+    sections = [base_prompt, "", "---", "", "## FEATURE FOCUS", ""]
+    if target is not None:
+        sections.append(
+            f"Work on this feature next (#{target.index} in feature_list.json):\n\n"
+            f"   Id: {target.id}\n"
+            f"   Category: {target.category or 'unknown'}\n"
+            f"   Description: {target.description}\n\n"
+            f"Mention \"{target.id}\" in the commit message for this feature."
+        )
+    if skipped:
+        listed = skipped[:MAX_SKIPPED_IN_PROMPT]
+        lines = "\n".join(f"   - #{f.index} {f.id}: {f.description}" for f in listed)
+        more = len(skipped) - len(listed)
+        if more > 0:
+            lines += f"\n   - ... and {more} more"
+        sections.append(
+            "\nThese features failed repeatedly and are SKIPPED - do not work on them:\n\n"
+            f"{lines}"
+        )
+    return "\n".join(sections) + "\n"
@@ -33,15 +33,28 @@ setup(
     py_modules=[
         "agent",
         "autonomous_agent",
+        "churn_detector",
         "client",
         "error_handler",
+        "feature_loader",
+        "feature_queue",
+        "feature_store",
         "loop_detector",
         "lsp_plugins",
+        "orchestrator",
         "output_formatter",
+        "parallel_workers",
         "progress",
+        "progress_probe",
+        "project_walker",
         "prompts",
         "retry_manager",
+        "session_attribution",
+        "stall_history",
+        "tool_registry",
         "security",
+        "security_policy",
+        "security_audit",
         "setup_mcp",
         "skills_manager",
     ],
@@ -0,0 +1,133 @@
+"""
+Stall History
+=============
+
+On-disk histogram of the gaps between tool calls, per tool category.
+
+LoopDetector records how long the agent went quiet after each kind of tool
+call (a Puppeteer screenshot is followed by a reply within seconds, an
+`npm run build` by minutes). Across sessions this yields a per-category
+distribution from which a stall threshold is derived:
+
+    threshold = clamp(percentile(gaps, STALL_PERCENTILE) * STALL_SAFETY_FACTOR,
+                      MIN_STALL_SECONDS, cli_stall_timeout)
+
+Gaps are counted in fixed log-spaced buckets, so the file stays small no
+matter how many sessions contribute to it.
+"""
+
+import bisect
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# Upper bucket edges in seconds (a final overflow bucket catches the rest)
+BUCKET_EDGES = [1, 2, 5, 10, 20, 30, 45, 60, 90, 120, 180, 240, 300, 450, 600, 900, 1200, 1800, 3600]
+
+# Percentile of observed gaps used as the base threshold
+STALL_PERCENTILE = 0.99
+
+# Multiplier on the percentile gap
+STALL_SAFETY_FACTOR = 3.0
+
+# Never derive a threshold below this
+MIN_STALL_SECONDS = 120
+
+# Samples needed in a category before its threshold is trusted
+MIN_SAMPLES = 30
+
+
+class GapHistogram:
+    """Per-category histogram of inter-tool-call gaps, persisted as JSON."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initialize gap histogram.
+
+        Args:
+            path: JSON file to load from / save to (None keeps it in memory)
+        """
+        self.path = path
+        self.counts: Dict[str, List[int]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """Load counts from disk, ignoring files written with other buckets."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return
+        if data.get("edges") != BUCKET_EDGES:
+            return  # Bucket layout changed - start over
+        self.counts = {
+            category: list(counts)
+            for category, counts in data.get("counts", {}).items()
+            if isinstance(counts, list) and len(counts) == len(BUCKET_EDGES) + 1
+        }
+
+    def save(self):
+        """Write the histogram to disk if it changed."""
+        if self.path is None or not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"edges": BUCKET_EDGES, "counts": self.counts}, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except IOError:
+            pass  # Losing a few samples is harmless
+
+    def record(self, category: str, gap_seconds: float):
+        """Count one gap after a tool call of the given category."""
+        counts = self.counts.get(category)
+        if counts is None:
+            counts = self.counts[category] = [0] * (len(BUCKET_EDGES) + 1)
+        counts[bisect.bisect_left(BUCKET_EDGES, gap_seconds)] += 1
+        self._dirty = True
+
+    def samples(self, category: str) -> int:
+        """Number of gaps recorded for a category."""
+        return sum(self.counts.get(category, ()))
+
+    def percentile(self, category: str, fraction: float) -> Optional[float]:
+        """
+        Upper bucket edge at the given percentile.
+
+        Returns:
+            Gap in seconds (inf for the overflow bucket), or None without samples
+        """
+        counts = self.counts.get(category)
+        total = sum(counts) if counts else 0
+        if not total:
+            return None
+        target = fraction * total
+        running = 0
+        for index, count in enumerate(counts):
+            running += count
+            if running >= target:
+                return BUCKET_EDGES[index] if index < len(BUCKET_EDGES) else float("inf")
+        return float("inf")
+
+    def stall_threshold(self, category: str, ceiling: float) -> float:
+        """
+        Stall threshold for the gap after a tool call of this category.
+
+        Args:
+            category: Tool category of the last call
+            ceiling: Maximum threshold (the --stall-timeout value, in seconds)
+
+        Returns:
+            Threshold in seconds (the ceiling until enough samples exist)
+        """
+        if self.samples(category) < MIN_SAMPLES:
+            return ceiling
+        gap = self.percentile(category, STALL_PERCENTILE)
+        return min(ceiling, max(MIN_STALL_SECONDS, gap * STALL_SAFETY_FACTOR))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the cross-session churn detector.
+
+Verifies diff hunk fingerprinting, oscillation detection across
+sessions and idle edit streaks.
+"""
+
+import subprocess
+import tempfile
+from pathlib import Path
+
+from churn_detector import CHURN_EDIT_SESSIONS, ChurnDetector, parse_diff_hunks
+
+
+GOOD = "function total(items) {\n  return items.reduce((sum, item) => sum + item.price, 0);\n}\n"
+BAD = "function total(items) {\n  return items.map(item => item.price).reduce((a, b) => a + b);\n}\n"
+
+
+def _git(cwd: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=cwd, check=True, capture_output=True, text=True,
+    )
+    return result.stdout.strip()
+
+
+def _session(project_dir: Path, content: str) -> str:
+    """Simulate a session: remember HEAD, rewrite the file, commit."""
+    base = _git(project_dir, "rev-parse", "HEAD")
+    (project_dir / "cart.js").write_text(content)
+    _git(project_dir, "commit", "-qam", "session")
+    return base
+
+
+def test_parse_diff_hunks():
+    """Test per-file hunk fingerprints (trivial lines and feature list ignored)."""
+    diff = """diff --git a/cart.js b/cart.js
+--- a/cart.js
++++ b/cart.js
+@@ -2 +2 @@
+-  return items.map(item => item.price).reduce((a, b) => a + b);
++  return items.reduce((sum, item) => sum + item.price, 0);
+@@ -9,0 +10 @@
++}
+diff --git a/spec/feature_list.json b/spec/feature_list.json
+@@ -3 +3 @@
+-    "passes": false
++    "passes": true
+"""
+    hunks = parse_diff_hunks(diff)
+    assert list(hunks) == ["cart.js"]
+    assert len(hunks["cart.js"]) == 2
+    added, removed = hunks["cart.js"][0]
+    assert added and removed and added != removed
+    assert hunks["cart.js"][1] == (None, None)
+    print("✅ Diff hunk fingerprints - PASS")
+
+
+def test_oscillation():
+    """Test that writing and reverting the same change is flagged."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        _git(project_dir, "init", "-q")
+        (project_dir / "cart.js").write_text(GOOD)
+        _git(project_dir, "add", ".")
+        _git(project_dir, "commit", "-qm", "init")
+
+        detector = ChurnDetector(project_dir)
+        assert detector.record_session(_session(project_dir, BAD), "feature-1") is None
+        assert detector.record_session(_session(project_dir, GOOD), "feature-1") is None  # First revert
+
+        # Reloaded from .claude/churn.json
+        detector = ChurnDetector(project_dir)
+        reason = detector.record_session(_session(project_dir, BAD), "feature-1")
+        assert reason and "oscillating edits in cart.js" in reason, reason
+        print(f"✅ Oscillation detected - PASS ({reason})")
+
+
+def test_idle_edit_streak():
+    """Test repeated edits on one feature with no passes change."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        _git(project_dir, "init", "-q")
+        (project_dir / "cart.js").write_text(GOOD)
+        _git(project_dir, "add", ".")
+        _git(project_dir, "commit", "-qm", "init")
+
+        detector = ChurnDetector(project_dir)
+        reasons = []
+        for i in range(CHURN_EDIT_SESSIONS):
+            base = _session(project_dir, GOOD + f"// attempt number {i} at fixing the total\n")
+            reasons.append(detector.record_session(base, "feature-2"))
+        assert reasons[:-1] == [None] * (CHURN_EDIT_SESSIONS - 1)
+        assert reasons[-1] and "feature-2" in reasons[-1]
+
+        base = _session(project_dir, GOOD + "// finally fixed the total computation\n")
+        assert detector.record_session(base, "feature-2", passes_changed=True) is None
+        assert "feature-2" not in detector.edit_streaks
+        print("✅ Idle edit streak - PASS")
+
+
+if __name__ == "__main__":
+    test_parse_diff_hunks()
+    test_oscillation()
+    test_idle_edit_streak()
+    print("\n✅ All churn detector tests passed!\n")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-pass shell command parser in security.py.
+
+Verifies segments, pipelines, substitutions and here-docs in the command
+AST, and that bash_security_hook decisions are cached by command text.
+"""
+
+import asyncio
+
+from benchmarks.fuzz_security_parser import fuzz, fuzz_bash
+from security import (
+    bash_security_hook,
+    evaluate_command,
+    extract_commands,
+    parse_command,
+    split_command_segments,
+)
+
+
+def test_segments_and_pipelines():
+    """Test splitting on operators outside quotes."""
+    ast = parse_command("npm install && npm test 2>&1 | tail -20; git status &")
+    assert [segment.text for segment in ast.segments] == [
+        "npm install", "npm test 2>&1 | tail -20", "git status",
+    ]
+    assert [stage.name for stage in ast.segments[1].pipeline] == ["npm", "tail"]
+    assert ast.segments[1].pipeline[0].argv == ("npm", "test", "2>&1")
+
+    assert split_command_segments('git commit -m "fix a && b; c"') == ['git commit -m "fix a && b; c"']
+    assert extract_commands("ls\nrm -rf build") == ["ls", "rm"], "Newlines separate commands"
+    assert extract_commands("echo hi # rm -rf /") == ["echo"]
+    assert extract_commands("for f in *.js; do node $f; done") == ["node"]
+    assert extract_commands("echo 'unclosed") == []
+    print("✅ Segments and pipelines - PASS")
+
+
+def test_substitutions_and_heredocs():
+    """Test $(...), backticks, sh -c and here-doc bodies."""
+    assert extract_commands("count=$(jq '.x' f.json) && echo $count") == ["jq", "echo"]
+    assert extract_commands('echo "Result: $(cat x)"') == ["cat", "echo"]
+    assert extract_commands("echo `whoami` $((1 + 2)) ${HOME}") == ["whoami", "echo"]
+    assert extract_commands("bash -c 'npm test && ls'") == ["npm", "ls", "bash"]
+
+    heredoc = "cat > notes.txt <<'EOF'\nshutdown now\n$(reboot)\nEOF\nls"
+    assert extract_commands(heredoc) == ["cat", "ls"], "Here-doc body is data"
+    commit = "git commit -m \"$(cat <<'EOF'\nfeat: x ) y\nEOF\n)\""
+    assert extract_commands(commit) == ["cat", "git"]
+    assert parse_command("echo $(echo $(" * 20).error, "Deep nesting is rejected"
+    print("✅ Substitutions and here-docs - PASS")
+
+
+def test_decisions():
+    """Test hook decisions on commands the old parser missed."""
+    def blocked(command):
+        result = asyncio.run(bash_security_hook({"tool_name": "Bash", "tool_input": {"command": command}}))
+        return result.get("decision") == "block"
+
+    assert blocked("ls\nshutdown now")
+    assert blocked("bash -c 'shutdown now'")
+    assert blocked("$(echo pkill) node"), "Command names from substitutions are blocked"
+    assert blocked("echo $(pkill bash)"), "Validators apply inside substitutions"
+    assert blocked("ls && chmod 777 x.sh")
+    assert not blocked("npm run dev > /tmp/log 2>&1 &")
+    assert not blocked("chmod +x init.sh && ./init.sh")
+    assert not blocked("git commit -m \"$(cat <<'EOF'\nfix: a && b\nEOF\n)\"")
+    print("✅ Hook decisions - PASS")
+
+
+def test_nested_expansions():
+    """Test substitutions inside expansions, expanded here-docs and find -exec run."""
+    def blocked(command):
+        result = asyncio.run(bash_security_hook({"tool_name": "Bash", "tool_input": {"command": command}}))
+        return result.get("decision") == "block"
+
+    assert blocked("cat <<EOF\n$(sudo id)\nEOF"), "Unquoted here-doc bodies are expanded"
+    assert blocked("cat <<EOF\n`sudo id`\nEOF")
+    assert blocked("echo $(( $(sudo id) ))"), "Substitutions run inside arithmetic"
+    assert blocked("echo $(( `sudo id` ))")
+    assert blocked("echo ${x:-`sudo id`}"), "Substitutions run inside parameter expansions"
+    assert blocked("find . -exec sudo id \\;"), "find -exec runs its arguments"
+    assert blocked("find . -name '*.tmp' -execdir sudo rm {} +")
+
+    assert not blocked("cat <<'EOF'\n$(sudo id)\nEOF"), "Quoted here-doc bodies stay data"
+    assert not blocked("echo $(( (1 + 2) * 3 )) ${HOME:-/tmp}")
+    assert not blocked("find . -name '*.py' -exec grep -n TODO {} \\;")
+    assert extract_commands("cat <<EOF\n$(ls)\nEOF\npwd") == ["ls", "cat", "pwd"]
+    print("✅ Nested expansions - PASS")
+
+
+def test_decision_cache():
+    """Test repeated commands hit the decision cache."""
+    evaluate_command.cache_clear()
+    for _ in range(50):
+        assert evaluate_command("git status") == ""
+        assert "not in the allowed" in evaluate_command("shutdown now")
+    info = evaluate_command.cache_info()
+    assert info.misses == 2 and info.hits == 98
+    print("✅ Decision cache - PASS")
+
+
+def test_fuzz_against_shlex():
+    """Test the parser tokenizes like shlex on random commands."""
+    report = fuzz(iterations=2000, seed=7)
+    assert report["mismatches"] == 0, report["examples"][:3]
+    print("✅ Fuzz against shlex - PASS")
+
+
+def test_fuzz_against_bash():
+    """Test the parser sees every command bash runs, substitutions and here-docs included."""
+    report = fuzz_bash(iterations=300, seed=7)
+    if report["skipped"]:
+        print("⚠️  Fuzz against bash - SKIPPED (bash not installed)")
+        return
+    assert report["mismatches"] == 0, report["examples"][:3]
+    assert report["rejected"] < report["iterations"] / 2, "Most generated commands are checked"
+    print("✅ Fuzz against bash - PASS")
+
+
+if __name__ == "__main__":
+    test_segments_and_pipelines()
+    test_substitutions_and_heredocs()
+    test_decisions()
+    test_nested_expansions()
+    test_decision_cache()
+    test_fuzz_against_shlex()
+    test_fuzz_against_bash()
+    print("\n✅ All command parser tests passed!\n")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared feature loader.
+
+Verifies that every feature_list.json shape normalizes to the same
+Feature objects and that each file version is parsed once.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from feature_loader import Feature, load_features, load_project_features, set_feature_passes
+from retry_manager import RetryManager
+from validators.e2e_hook import get_current_feature
+
+
+def test_shapes_normalize():
+    """Test bare-list, wrapped and id/name-keyed records."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "feature_list.json"
+
+        path.write_text(json.dumps([
+            {"description": "a", "category": "functional", "steps": ["s1"], "passes": True},
+            {"id": "auth", "description": "b", "passes": False},
+        ]))
+        features = load_features(path)
+        assert [f.id for f in features] == ["feature-0", "auth"]
+        assert [f.passes for f in features] == [True, False]
+        assert features[0].steps == ("s1",)
+        assert features[0].category == "functional"
+
+        path.write_text(json.dumps({"features": [
+            {"name": "login", "description": "c", "passing": True},
+        ]}))
+        features = load_features(path)
+        assert features[0].id == "login"
+        assert features[0].passes is True
+        assert features[0].to_dict()["index"] == 0
+        print("✅ Shapes normalize to Feature - PASS")
+
+
+def test_parsed_once_per_version():
+    """Test that unchanged files return the shared parsed list."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "feature_list.json"
+        path.write_text(json.dumps([{"description": "a"}]))
+
+        first = load_features(path)
+        assert load_features(path) is first
+
+        path.write_text(json.dumps([{"description": "a"}, {"description": "b"}]))
+        assert len(load_features(path)) == 2
+
+        path.write_text("[{")
+        assert load_features(path) == []
+        print("✅ Parsed once per file version - PASS")
+
+
+def test_shared_by_callers():
+    """Test that retry manager and E2E hook agree on the current feature."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        (project_dir / "spec").mkdir()
+        (project_dir / "spec" / "feature_list.json").write_text(json.dumps({"features": [
+            {"description": "done", "passing": True},
+            {"description": "next", "passing": False},
+        ]}))
+
+        features = load_project_features(project_dir)
+        manager = RetryManager(project_dir)
+        next_feature = manager.get_next_feature(features)
+        assert isinstance(next_feature, Feature)
+        assert next_feature.description == "next"
+
+        current = get_current_feature(project_dir)
+        assert current["description"] == "next"
+        assert current["index"] == 1
+        print("✅ Shared by retry manager and E2E hook - PASS")
+
+
+def test_set_feature_passes_keeps_shape():
+    """Test flipping one feature keeps either top-level shape."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "feature_list.json"
+        path.write_text(json.dumps({"version": 1, "features": [
+            {"description": "a", "passing": False}, "junk", {"description": "b", "passes": False},
+        ]}))
+        set_feature_passes(path, 0)
+        set_feature_passes(path, 1)
+        data = json.loads(path.read_text())
+        assert data["version"] == 1 and data["features"][1] == "junk"
+        assert [f.passes for f in load_features(path)] == [True, True]
+
+        path.write_text(json.dumps([{"description": "a", "passes": True}]))
+        set_feature_passes(path, 0, passes=False)
+        assert json.loads(path.read_text()) == [{"description": "a", "passes": False}]
+        print("✅ set_feature_passes keeps the file shape - PASS")
+
+
+if __name__ == "__main__":
+    test_shapes_normalize()
+    test_parsed_once_per_version()
+    test_shared_by_callers()
+    test_set_feature_passes_keeps_shape()
+    print("\n✅ All feature loader tests passed!\n")
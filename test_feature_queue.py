@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for the heap-backed feature queue.
+
+Verifies scheduling policies and incremental updates on success,
+failure and skip, both directly and through RetryManager.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from feature_loader import load_features
+from feature_queue import FeatureQueue
+from retry_manager import RetryManager
+
+
+FEATURES = [
+    {"id": "a", "category": "style", "priority": "low", "passes": False},
+    {"id": "b", "category": "functional", "priority": "critical", "passes": False},
+    {"id": "c", "category": "functional", "priority": "high", "passes": True},
+    {"id": "d", "category": "security", "priority": 1, "passes": False},
+]
+
+
+def test_policies():
+    """Test that each policy picks the expected next feature."""
+    assert FeatureQueue(FEATURES).peek()["id"] == "a"
+    assert FeatureQueue(FEATURES, policy="priority").peek()["id"] == "b"
+
+    queue = FeatureQueue(FEATURES, policy="category", category_order=["security", "functional"])
+    assert queue.peek()["id"] == "d"
+
+    retries = {"a": 2, "b": 1}
+    queue = FeatureQueue(FEATURES, policy="fewest_retries", retry_count=retries)
+    assert queue.peek()["id"] == "d"
+
+    try:
+        FeatureQueue(FEATURES, policy="random")
+        assert False, "Unknown policy should raise"
+    except ValueError:
+        pass
+    print("✅ Scheduling policies - PASS")
+
+
+def test_incremental_updates():
+    """Test pass/skip/fail updates and re-sync with a changed list."""
+    retries = {}
+    queue = FeatureQueue(FEATURES, policy="fewest_retries", retry_count=retries)
+    assert len(queue) == 3
+
+    queue.mark_passed("a")
+    assert queue.peek()["id"] == "b"
+
+    retries["b"] = 1
+    queue.mark_failed("b")
+    assert queue.peek()["id"] == "d"
+
+    queue.mark_skipped("d")
+    assert queue.peek()["id"] == "b"
+
+    # "c" regressed and a new feature was appended
+    changed = [dict(f) for f in FEATURES] + [{"id": "e", "passes": False}]
+    changed[2]["passes"] = False
+    changed[0]["passes"] = True
+    queue.sync(changed)
+    assert queue.peek()["id"] == "c"
+    assert len(queue) == 3  # b, c, e (d stays skipped)
+
+    queue.unskip("d")
+    queue.sync(changed)
+    assert len(queue) == 4
+    print("✅ Incremental updates - PASS")
+
+
+def test_retry_manager_queue():
+    """Test RetryManager selection through the queue with reloaded lists."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        path = project_dir / "feature_list.json"
+        path.write_text(json.dumps(FEATURES))
+
+        manager = RetryManager(project_dir, max_retries=1, queue_policy="priority")
+        assert manager.get_next_feature(load_features(path)).id == "b"
+
+        manager.record_failure("b", "boom")
+        assert manager.get_next_feature(load_features(path)).id == "d"
+
+        manager.record_success("d")
+        records = json.loads(path.read_text())
+        records[3]["passes"] = True
+        path.write_text(json.dumps(records, indent=2))
+        assert manager.get_next_feature(load_features(path)).id == "a"
+
+        manager.reset()
+        assert manager.get_next_feature(load_features(path)).id == "b"
+        print("✅ RetryManager uses the queue - PASS")
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("Feature Queue Tests")
+    print("=" * 60 + "\n")
+
+    test_policies()
+    test_incremental_updates()
+    test_retry_manager_queue()
+
+    print("\n✅ All feature queue tests passed!\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite feature store.
+
+Verifies that feature_list.json is indexed, re-imported only on change,
+and that retry state and exports round-trip.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from feature_store import FeatureStore
+from progress import count_passing_tests
+from retry_manager import RetryManager
+
+
+def _write_features(project_dir: Path, features) -> Path:
+    spec_dir = project_dir / "spec"
+    spec_dir.mkdir(parents=True, exist_ok=True)
+    path = spec_dir / "feature_list.json"
+    path.write_text(json.dumps(features, indent=2))
+    return path
+
+
+def test_counts_and_queries():
+    """Test counts, next pending and category filtering."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        _write_features(project_dir, [
+            {"id": "f1", "category": "functional", "passes": True},
+            {"id": "f2", "category": "style", "passes": False},
+            {"id": "f3", "category": "functional", "passes": False},
+        ])
+
+        store = FeatureStore(project_dir)
+        assert store.counts() == (1, 3)
+        assert store.next_pending()["id"] == "f2"
+        assert store.next_pending(category="functional")["id"] == "f3"
+        assert store.get("f1")["passes"] is True
+        assert store.passing_ids() == ["f1"]
+        store.close()
+
+        assert count_passing_tests(project_dir) == (1, 3)
+        print("✅ Counts and indexed queries - PASS")
+
+
+def test_reimport_on_change():
+    """Test that the store re-imports only when the file changes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        path = _write_features(project_dir, [{"description": "a", "passes": False}])
+
+        store = FeatureStore(project_dir)
+        assert store.counts() == (0, 1)
+
+        _write_features(project_dir, [
+            {"description": "a", "passes": True},
+            {"description": "b", "passes": False},
+        ])
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert store.counts() == (1, 2)
+        assert store.next_pending()["description"] == "b"
+
+        # Corrupted write keeps serving the last good import
+        path.write_text("[{")
+        assert store.counts() == (1, 2)
+        store.close()
+        print("✅ Re-import on change - PASS")
+
+
+def test_wrapped_shape_and_export():
+    """Test {"features": [...]} with "passing" keys, and export round-trip."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        _write_features(project_dir, {"features": [
+            {"description": "a", "passing": True},
+            {"description": "b", "passing": False},
+        ]})
+
+        store = FeatureStore(project_dir)
+        assert store.counts() == (1, 2)
+
+        out = store.export_json(project_dir / "export.json")
+        exported = json.loads(out.read_text())
+        assert [f["passes"] for f in exported] == [True, False]
+        store.close()
+        print("✅ Wrapped shape and export - PASS")
+
+
+def test_retry_state_in_index():
+    """Test that skipped features are excluded from next-feature selection."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        _write_features(project_dir, [
+            {"id": "f1", "passes": False},
+            {"id": "f2", "passes": False},
+        ])
+
+        manager = RetryManager(project_dir, max_retries=1)
+        assert manager.get_next_feature()["id"] == "f1"
+
+        manager.record_failure("f1", "boom")
+        assert manager.get_next_feature()["id"] == "f2"
+
+        manager.record_success("f1")
+        assert manager.get_next_feature()["id"] == "f1"
+        print("✅ Retry state in index - PASS")
+
+
+if __name__ == "__main__":
+    test_counts_and_queries()
+    test_reimport_on_change()
+    test_wrapped_shape_and_export()
+    test_retry_state_in_index()
+    print("\n✅ All FeatureStore tests passed!\n")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-project orchestrator.
+
+Verifies job loading, the --jobs concurrency bound, that a job doing
+blocking I/O doesn't stall the others, per-project output prefixes and
+per-project progress reporting.
+"""
+
+import asyncio
+import io
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from orchestrator import ProjectJob, load_jobs, print_combined_progress, run_projects
+
+
+def _jobs(root: Path, names):
+    jobs = []
+    for name in names:
+        (root / name).mkdir()
+        jobs.append(ProjectJob(project_dir=root / name))
+    return jobs
+
+
+def _run(jobs, run_agent, concurrency):
+    """run_projects with stdout captured; returns (result, output)."""
+    captured = io.StringIO()
+    stdout = sys.stdout
+    sys.stdout = captured
+    try:
+        result = asyncio.run(run_projects(
+            jobs, model="test-model", concurrency=concurrency,
+            progress_interval=3600, run_agent=run_agent,
+        ))
+    finally:
+        sys.stdout = stdout
+    return result, captured.getvalue()
+
+
+def test_load_jobs():
+    """Test job files, relative paths and duplicate detection."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "jobs").mkdir()
+        (root / "jobs" / "a.json").write_text(json.dumps({"project_dir": "proj-a"}))
+        (root / "jobs" / "b.yaml").write_text(
+            "jobs:\n  - project_dir: proj-b\n    mode: enhancement\n    spec: spec.md\n"
+        )
+        jobs = load_jobs(root / "jobs")
+        assert [job.name for job in jobs] == ["proj-a", "proj-b"]
+        assert jobs[1].spec == str(root / "jobs" / "spec.md") and jobs[1].mode == "enhancement"
+
+        (root / "jobs" / "c.json").write_text(json.dumps({"project_dir": "proj-a"}))
+        try:
+            load_jobs(root / "jobs")
+            assert False, "Duplicate project_dir should be rejected"
+        except ValueError:
+            pass
+    print("✅ Job loading - PASS")
+
+
+def test_concurrency_and_blocking_io():
+    """Test at most --jobs run at once and blocking jobs don't stall the others."""
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = _jobs(Path(tmp), ["p1", "p2", "p3", "p4"])
+        lock = threading.Lock()
+        active = [0, 0]  # [now, max]
+
+        async def blocking_agent(project_dir, **kwargs):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.2)  # Blocking call, as agent code does with subprocess/git
+            with lock:
+                active[0] -= 1
+
+        start = time.monotonic()
+        result, _ = _run(jobs, blocking_agent, concurrency=2)
+        elapsed = time.monotonic() - start
+
+        assert active[1] == 2, f"At most 2 jobs at once, saw {active[1]}"
+        assert 0.35 < elapsed < 0.7, f"2 jobs blocking concurrently, then 2 more: {elapsed:.2f}s"
+        assert [job.status for job in result.jobs] == ["done"] * 4
+    print("✅ Concurrency bound and blocking I/O - PASS")
+
+
+def test_output_prefixed_per_project():
+    """Test every line a job prints carries its project name."""
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = _jobs(Path(tmp), ["alpha", "beta"])
+
+        async def chatty_agent(project_dir, **kwargs):
+            for i in range(20):
+                print(f"{project_dir.name} step", end="")
+                await asyncio.sleep(0)
+                print(f" {i}")
+            print("no newline at the end", end="")
+
+        _, output = _run(jobs, chatty_agent, concurrency=2)
+        job_lines = [line for line in output.splitlines() if line.startswith("[")]
+        for name in ("alpha", "beta"):
+            lines = [line for line in job_lines if line.startswith(f"[{name}] ")]
+            assert lines[:20] == [f"[{name}] {name} step {i}" for i in range(20)], lines[:3]
+            assert lines[20] == f"[{name}] no newline at the end"
+        assert len(job_lines) == 42
+    print("✅ Output prefixed per project - PASS")
+
+
+def test_same_name_projects():
+    """Test projects sharing a directory name get separate output and labels."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "a").mkdir()
+        (root / "b").mkdir()
+        jobs = _jobs(root, ["a/app", "b/app", "solo"])
+
+        async def chatty_agent(project_dir, **kwargs):
+            for i in range(10):
+                print(f"{project_dir.parent.name} step", end="")
+                await asyncio.sleep(0)
+                print(f" {i}")
+
+        _, output = _run(jobs, chatty_agent, concurrency=3)
+        assert [job.name for job in jobs] == ["a/app", "b/app", "solo"]
+        for parent in ("a", "b"):
+            lines = [line for line in output.splitlines() if line.startswith(f"[{parent}/app] ")]
+            assert lines == [f"[{parent}/app] {parent} step {i}" for i in range(10)], lines[:3]
+    print("✅ Same-name projects kept apart - PASS")
+
+
+def test_failures_and_progress():
+    """Test a failing job doesn't stop the others, and per-project progress."""
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = _jobs(Path(tmp), ["good", "bad"])
+        (jobs[0].project_dir / "feature_list.json").write_text(
+            json.dumps([{"passes": True}, {"passes": False}])
+        )
+
+        async def agent(project_dir, **kwargs):
+            if project_dir.name == "bad":
+                raise RuntimeError("boom")
+
+        result, output = _run(jobs, agent, concurrency=2)
+        assert [job.status for job in result.jobs] == ["done", "failed"]
+        assert result.failed[0].error == "boom"
+        assert "❌ Job bad failed: boom" in output
+
+        captured = io.StringIO()
+        stdout = sys.stdout
+        sys.stdout = captured
+        try:
+            print_combined_progress(result.jobs)
+        finally:
+            sys.stdout = stdout
+        report = captured.getvalue()
+        assert "1/2 (50.0%)" in report and "no feature_list.json yet" in report
+    print("✅ Failures and progress reporting - PASS")
+
+
+if __name__ == "__main__":
+    test_load_jobs()
+    test_concurrency_and_blocking_io()
+    test_output_prefixed_per_project()
+    test_same_name_projects()
+    test_failures_and_progress()
+    print("\n✅ All orchestrator tests passed!\n")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel feature workers.
+
+Runs the worktree / claim / merge steps against a temporary git repo
+(no agent sessions): merges keep the feature list's shape, commit only
+what the merge brought in, keep harness state under .claude/ out of
+worker commits, worktree resets keep .claude/ logs, git runs off the
+event loop, and work that isn't marked passing is rejected.
+"""
+
+import asyncio
+import json
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import parallel_workers
+from feature_loader import load_features, set_feature_passes
+from parallel_workers import FEATURE_LIST_PATH, ParallelRunner
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True,
+    ).stdout
+
+
+def _make_project(root: Path) -> Path:
+    project = root / "app"
+    (project / "spec").mkdir(parents=True)
+    (project / FEATURE_LIST_PATH).write_text(json.dumps({
+        "version": 2,
+        "features": [
+            {"description": "first", "steps": [], "passes": False},
+            {"description": "second", "steps": [], "passes": False},
+            {"description": "third", "steps": [], "passes": False},
+        ],
+    }, indent=2))
+    _git(project, "init", "-q")
+    _git(project, "config", "user.email", "dev@localhost")
+    _git(project, "config", "user.name", "dev")
+    _git(project, "add", ".")
+    _git(project, "commit", "-q", "-m", "initial")
+    return project
+
+
+def _commit_feature(worktree: Path, index: int, name: str):
+    """Do what a coding session does: write code and harness logs, `git add .`, commit."""
+    (worktree / f"{name}.txt").write_text("done\n")
+    (worktree / ".claude").mkdir(exist_ok=True)
+    (worktree / ".claude" / "security_audit.jsonl").write_text(f'{{"worker": "{name}"}}\n')
+    set_feature_passes(worktree / FEATURE_LIST_PATH, index)
+    _git(worktree, "add", ".")
+    _git(worktree, "commit", "-q", "-m", name)
+
+
+def test_claim_prepare_and_merge():
+    """Test workers' committed features are merged with the feature list shape kept."""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = _make_project(Path(tmp))
+        # The user's own untracked files and the harness's log in the main checkout
+        (project / "notes.txt").write_text("mine\n")
+        (project / ".claude").mkdir()
+        (project / ".claude" / "security_audit.jsonl").write_text('{"worker": "main"}\n')
+        runner = ParallelRunner(project, model="test-model", workers=3)
+
+        async def scenario():
+            first = await runner.claims.claim(1)
+            second = await runner.claims.claim(2)
+            third = await runner.claims.claim(3)
+            assert (first.index, second.index, third.index) == (0, 1, 2), "Workers get distinct features"
+            assert await runner.claims.claim(4) is None
+
+            worktree, base = await runner._prepare_worktree(1)
+            worktree3, base3 = await runner._prepare_worktree(3)
+            _commit_feature(worktree, 0, "first")
+            _commit_feature(worktree3, 2, "third")
+            assert await runner._merge(1, first, base)
+            assert await runner._merge(3, third, base3), "Both workers' .claude/ logs don't conflict"
+
+            # Worker 2 commits without marking its feature as passing
+            worktree2, base2 = await runner._prepare_worktree(2)
+            (worktree2 / "second.txt").write_text("wip\n")
+            _git(worktree2, "add", "-A")
+            _git(worktree2, "commit", "-q", "-m", "wip")
+            assert not await runner._merge(2, second, base2)
+
+        try:
+            asyncio.run(scenario())
+            data = json.loads((project / FEATURE_LIST_PATH).read_text())
+            assert data["version"] == 2, "{'features': [...]} shape is kept"
+            assert [f["passes"] for f in data["features"]] == [True, False, True]
+            assert (project / "first.txt").exists() and not (project / "second.txt").exists()
+            assert "Merge feature #2" in _git(project, "log", "-1", "--format=%s")
+
+            committed = _git(project, "log", "--name-only", "--format=").split()
+            assert "notes.txt" not in committed, "The user's untracked files are not committed"
+            assert not [path for path in committed if path.startswith(".claude/")], committed
+            assert "notes.txt" in _git(project, "status", "--porcelain")
+            assert (project / ".claude" / "security_audit.jsonl").read_text() == '{"worker": "main"}\n'
+
+            ids = [feature.id for feature in load_features(project / FEATURE_LIST_PATH)]
+            assert runner.retry_manager.retry_count.get(ids[1]) == 1
+            assert not runner.retry_manager.retry_count.get(ids[2]), "No failure charged to the third feature"
+        finally:
+            runner.cleanup()
+        assert not runner.worktree_root.exists(), "Worktrees removed"
+    print("✅ Claim, prepare and merge - PASS")
+
+
+def test_tracked_harness_state_keeps_main_copy():
+    """Test a merge keeps the main checkout's copy of tracked .claude/ files."""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = _make_project(Path(tmp))
+        (project / ".claude").mkdir()
+        (project / ".claude" / "churn.json").write_text("{}\n")
+        _git(project, "add", ".claude")
+        _git(project, "commit", "-q", "-m", "track harness state")
+        runner = ParallelRunner(project, model="test-model", workers=1)
+
+        async def scenario():
+            feature = await runner.claims.claim(1)
+            worktree, base = await runner._prepare_worktree(1)
+            (worktree / ".claude" / "churn.json").write_text('{"worker": 1}\n')
+            _commit_feature(worktree, feature.index, "first")
+            (project / ".claude" / "churn.json").write_text('{"main": 1}\n')
+            _git(project, "commit", "-q", "-am", "main moved on")
+            return await runner._merge(1, feature, base)
+
+        try:
+            assert asyncio.run(scenario()), "Harness state never blocks a merge"
+            assert _git(project, "show", "HEAD:.claude/churn.json") == '{"main": 1}\n'
+            assert "security_audit.jsonl" not in _git(project, "ls-files", ".claude")
+        finally:
+            runner.cleanup()
+    print("✅ Tracked harness state keeps main copy - PASS")
+
+
+def test_reset_keeps_claude_logs():
+    """Test resetting a worktree removes stray files but keeps .claude/ logs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = _make_project(Path(tmp))
+        runner = ParallelRunner(project, model="test-model", workers=1)
+        try:
+            worktree, _ = asyncio.run(runner._prepare_worktree(1))
+            (worktree / ".claude").mkdir()
+            (worktree / ".claude" / "errors.jsonl").write_text('{"error": "x"}\n')
+            (worktree / "stray.txt").write_text("leftover\n")
+
+            asyncio.run(runner._prepare_worktree(1))
+            assert (worktree / ".claude" / "errors.jsonl").exists(), "Error log survives the reset"
+            assert not (worktree / "stray.txt").exists()
+        finally:
+            runner.cleanup()
+    print("✅ Worktree reset keeps .claude/ logs - PASS")
+
+
+def test_git_runs_off_event_loop():
+    """Test slow git calls don't block other coroutines."""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = _make_project(Path(tmp))
+        runner = ParallelRunner(project, model="test-model", workers=1)
+        original = parallel_workers._git
+
+        def slow_git(*args, **kwargs):
+            time.sleep(0.05)
+            return original(*args, **kwargs)
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await runner._prepare_worktree(1)
+            task.cancel()
+            return ticks
+
+        parallel_workers._git = slow_git
+        try:
+            ticks = asyncio.run(scenario())
+        finally:
+            parallel_workers._git = original
+            runner.cleanup()
+        assert ticks >= 5, f"Event loop was blocked during git calls ({ticks} ticks)"
+    print("✅ git runs off the event loop - PASS")
+
+
+if __name__ == "__main__":
+    test_claim_prepare_and_merge()
+    test_tracked_harness_state_keeps_main_copy()
+    test_reset_keeps_claude_logs()
+    test_git_runs_off_event_loop()
+    print("\n✅ All parallel worker tests passed!\n")
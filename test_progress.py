@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for progress counting.
+
+Verifies the streaming feature counter against json.load and its
+(mtime, size) memoization.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+import progress
+from progress import count_feature_file, count_passing_tests
+
+
+def test_streaming_matches_json_load():
+    """Test streaming counts across chunk boundaries."""
+    original_chunk = progress.STREAM_CHUNK_SIZE
+    progress.STREAM_CHUNK_SIZE = 16  # Force elements to span chunks
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "feature_list.json"
+            features = [
+                {"description": f"feature {i} with ] and , inside", "passes": i % 3 == 0}
+                for i in range(100)
+            ]
+            path.write_text(json.dumps(features, indent=2))
+
+            expected = (sum(1 for f in features if f["passes"]), len(features))
+            assert count_feature_file(path) == expected
+            print(f"✅ Streaming count matches json.load - PASS ({expected})")
+    finally:
+        progress.STREAM_CHUNK_SIZE = original_chunk
+
+
+def test_memoized_by_signature():
+    """Test that unchanged files are served from the cache."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "feature_list.json"
+        path.write_text(json.dumps([{"passes": True}, {"passes": False}]))
+        assert count_feature_file(path) == (1, 2)
+
+        # Same signature -> cached result, even if the cache was the only source
+        key = str(path)
+        signature, _ = progress._count_cache[key]
+        progress._count_cache[key] = (signature, (42, 42))
+        assert count_feature_file(path) == (42, 42)
+
+        path.write_text(json.dumps([{"passes": True}, {"passes": True}, {"passes": False}]))
+        assert count_feature_file(path) == (2, 3)
+        print("✅ Memoization by (mtime, size) - PASS")
+
+
+def test_missing_and_invalid():
+    """Test missing, truncated and legacy-shaped files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        assert count_passing_tests(project_dir) == (0, 0)
+
+        (project_dir / "spec").mkdir()
+        path = project_dir / "spec" / "feature_list.json"
+        path.write_text('[{"passes": true}, {"pas')
+        assert count_passing_tests(project_dir) == (0, 0)
+
+        path.write_text(json.dumps({"features": [{"passing": True}, {"passing": False}]}))
+        assert count_passing_tests(project_dir) == (1, 2)
+        print("✅ Missing, truncated and legacy files - PASS")
+
+
+if __name__ == "__main__":
+    test_streaming_matches_json_load()
+    test_memoized_by_signature()
+    test_missing_and_invalid()
+    print("\n✅ All progress tests passed!\n")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared project walker.
+
+Verifies excluded directories are never opened, .gitignore rules
+(nested, negated, anchored, directory-only, **) are honoured, depth
+limits, and that the secrets scanner still scans gitignored files.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from project_walker import is_ignored, parse_gitignore, walk_project
+from validators.secrets_scanner import SecretsScanner
+
+
+def _make_tree(root: Path, files: dict):
+    for rel, content in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def _walk(root: Path, **kwargs):
+    return [os.path.relpath(entry.path, root) for entry in walk_project(root, **kwargs)]
+
+
+def test_gitignore_rules():
+    """Test gitignore pattern semantics."""
+    rules = parse_gitignore([
+        "# comment",
+        "*.log",
+        "!keep.log",
+        "/root_only.txt",
+        "tmp/",
+        "docs/**/draft.md",
+        "\\#hash",
+        "trailing.txt   ",
+    ])
+    assert is_ignored(rules, "a/b/debug.log", False)
+    assert not is_ignored(rules, "a/keep.log", False), "Negation re-includes"
+    assert is_ignored(rules, "root_only.txt", False)
+    assert not is_ignored(rules, "sub/root_only.txt", False), "Leading / anchors to the root"
+    assert is_ignored(rules, "src/tmp", True)
+    assert not is_ignored(rules, "src/tmp", False), "Trailing / matches directories only"
+    assert is_ignored(rules, "docs/draft.md", False) and is_ignored(rules, "docs/a/b/draft.md", False)
+    assert is_ignored(rules, "#hash", False)
+    assert is_ignored(rules, "trailing.txt", False)
+
+    nested = parse_gitignore(["/out", "*.tmp"], base="pkg")
+    assert is_ignored(nested, "pkg/out", True)
+    assert not is_ignored(nested, "out", True), "Nested rules only apply below their directory"
+    assert not is_ignored(nested, "pkg/sub/out", True)
+    assert is_ignored(nested, "pkg/sub/x.tmp", False)
+    print("✅ gitignore rules - PASS")
+
+
+def test_walk_prunes_and_ignores():
+    """Test excluded and ignored directories are pruned before descending."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_tree(root, {
+            ".gitignore": "*.log\ncoverage/\n",
+            "app.py": "",
+            "server.log": "",
+            "node_modules/pkg/index.js": "",
+            "coverage/report.json": "",
+            "src/main.ts": "",
+            "src/.gitignore": "generated.ts\n",
+            "src/generated.ts": "",
+            "src/deep/util.ts": "",
+        })
+        opened = []
+        original = os.scandir
+
+        def recording_scandir(path):
+            opened.append(os.path.relpath(path, root))
+            return original(path)
+
+        os.scandir = recording_scandir
+        try:
+            paths = _walk(root)
+        finally:
+            os.scandir = original
+
+        assert paths == [".gitignore", "app.py", "src", "src/.gitignore", "src/deep", "src/main.ts", "src/deep/util.ts"]
+        assert sorted(opened) == [".", "src", "src/deep"], "Pruned directories are never opened"
+
+        assert "node_modules/pkg/index.js" in _walk(root, excluded_dirs=(), gitignore=False)
+        assert _walk(root, max_depth=0) == [".gitignore", "app.py", "src"]
+    print("✅ Walk prunes excluded and ignored directories - PASS")
+
+
+def test_secrets_scanner_keeps_gitignored():
+    """Test gitignored files are scanned (git add -f can commit them), excluded dirs are not."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        secret = "api_key = 'abcdefghijklmnopqrstuvwxyz'\n"
+        _make_tree(root, {
+            ".gitignore": ".env\nsecrets/\n",
+            ".env": secret,
+            "secrets/keys.py": secret,
+            "app.py": secret,
+            "node_modules/pkg/index.js": secret,
+        })
+        assert sorted(m.file for m in SecretsScanner(root).scan()) == [".env", "app.py", "secrets/keys.py"]
+    print("✅ Secrets scanner keeps gitignored files - PASS")
+
+
+if __name__ == "__main__":
+    test_gitignore_rules()
+    test_walk_prunes_and_ignores()
+    test_secrets_scanner_keeps_gitignored()
+    print("\n✅ All project walker tests passed!\n")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent secrets scan cache.
+
+Verifies unchanged files are not re-read across scanner instances,
+changed files are, touched files are not rescanned, the cache never
+stores secret text and lives outside the project, a rewrite that
+restores size and mtime is still rescanned, and a pattern change
+invalidates the cache.
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from validators.scan_cache import cache_path
+from validators.secrets_scanner import SecretsScanner
+
+
+API_LINE = "api_key = 'abcdefghijklmnopqrstuvwxyz'"
+OLD_MTIME = time.time() - 3600  # Outside the racy window
+
+
+def _make_project(root: Path):
+    files = {
+        "app.py": f"import os\n{API_LINE}\n",
+        "src/util.py": "def f():\n    return 1\n",
+        "config.yaml": "debug: true\n",
+    }
+    for rel, content in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        os.utime(path, (OLD_MTIME, OLD_MTIME))
+
+
+class _Counter:
+    """Count Path.read_bytes and SecretsScanner.scan_text calls."""
+
+    def __enter__(self):
+        self.reads, self.scans = [], []
+        self._read_bytes, self._scan_text = Path.read_bytes, SecretsScanner.scan_text
+        counter = self
+
+        def read_bytes(path):
+            counter.reads.append(path.name)
+            return counter._read_bytes(path)
+
+        def scan_text(scanner, rel_path, content):
+            counter.scans.append(rel_path)
+            return counter._scan_text(scanner, rel_path, content)
+
+        Path.read_bytes, SecretsScanner.scan_text = read_bytes, scan_text
+        return self
+
+    def __exit__(self, *exc):
+        Path.read_bytes, SecretsScanner.scan_text = self._read_bytes, self._scan_text
+
+
+def test_unchanged_files_not_reread():
+    """Test a second scan (new instance) only reads changed files."""
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as cache_tmp:
+        root, cache_dir = Path(tmp), Path(cache_tmp)
+        _make_project(root)
+        expected = SecretsScanner(root).scan()
+
+        assert SecretsScanner(root, cache=True, cache_dir=cache_dir).scan() == expected
+        assert cache_path(root, cache_dir).exists()
+
+        with _Counter() as counter:
+            assert SecretsScanner(root, cache=True, cache_dir=cache_dir).scan() == expected
+        # Only the file with a violation is read, for the match text
+        assert counter.reads == ["app.py"] and counter.scans == [], counter.reads
+
+        (root / "src/util.py").write_text(f"def f():\n    {API_LINE}\n")
+        with _Counter() as counter:
+            matches = SecretsScanner(root, cache=True, cache_dir=cache_dir).scan()
+        assert counter.scans == ["src/util.py"]
+        assert [(m.file, m.line) for m in matches] == [("app.py", 2), ("src/util.py", 2)]
+    print("✅ Unchanged files not re-read - PASS")
+
+
+def test_touch_reuses_by_hash():
+    """Test a changed mtime with the same content is not rescanned."""
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as cache_tmp:
+        root, cache_dir = Path(tmp), Path(cache_tmp)
+        _make_project(root)
+        SecretsScanner(root, cache=True, cache_dir=cache_dir).scan()
+
+        os.utime(root / "config.yaml", (OLD_MTIME + 60, OLD_MTIME + 60))
+        with _Counter() as counter:
+            SecretsScanner(root, cache=True, cache_dir=cache_dir).scan()
+        assert counter.scans == [] and "config.yaml" in counter.reads
+
+        with _Counter() as counter:
+            SecretsScanner(root, cache=True, cache_dir=cache_dir, verify_hash=True).scan()
+        assert counter.scans == [] and len(counter.reads) == 3, "verify_hash reads every file"
+    print("✅ Touched files reused by content hash - PASS")
+
+
+def test_cache_outside_project():
+    """Test the cache stores no secret text and is not in the agent-writable tree."""
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as cache_tmp:
+        root, cache_dir = Path(tmp), Path(cache_tmp)
+        _make_project(root)
+        scanner = SecretsScanner(root, cache=True, cache_dir=cache_dir)
+        scanner.scan()
+
+        assert root.resolve() not in cache_path(root, cache_dir).resolve().parents
+        assert not (root / ".claude").exists(), "Nothing is written into the project"
+        assert "abcdefghijklmnopqrstuvwxyz" not in cache_path(root, cache_dir).read_text()
+
+        # A file planted where the cache used to live is scanned like any other
+        (root / ".claude").mkdir()
+        (root / ".claude" / "secrets_scan_cache.json").write_text(f'{{"{API_LINE}": 1}}\n')
+        assert ".claude/secrets_scan_cache.json" in {m.file for m in SecretsScanner(root, cache=True, cache_dir=cache_dir).scan()}
+    print("✅ Cache outside the project - PASS")
+
+
+def test_restored_mtime_rescanned():
+    """Test a same-size rewrite with its old mtime restored (touch -d) is rescanned."""
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as cache_tmp:
+        root, cache_dir = Path(tmp), Path(cache_tmp)
+        _make_project(root)
+        clean = API_LINE.replace("api_key", "api_kez") + "\n"
+        path = root / "settings.py"
+        path.write_text(clean)
+        os.utime(path, (OLD_MTIME, OLD_MTIME))
+        assert [m.file for m in SecretsScanner(root, cache=True, cache_dir=cache_dir).scan()] == ["app.py"]
+
+        stat = os.stat(path)
+        path.write_text(API_LINE + "\n")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert os.stat(path).st_size == stat.st_size and os.stat(path).st_mtime_ns == stat.st_mtime_ns
+
+        matches = SecretsScanner(root, cache=True, cache_dir=cache_dir).scan()
+        assert [m.file for m in matches] == ["app.py", "settings.py"]
+    print("✅ Restored mtime rescanned - PASS")
+
+
+def test_pattern_change_invalidates():
+    """Test a different pattern set starts from an empty cache."""
+    class StricterScanner(SecretsScanner):
+        PATTERNS = {**SecretsScanner.PATTERNS, "debug": r"debug:\s*true"}
+
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as cache_tmp:
+        root, cache_dir = Path(tmp), Path(cache_tmp)
+        _make_project(root)
+        SecretsScanner(root, cache=True, cache_dir=cache_dir).scan()
+
+        with _Counter() as counter:
+            matches = StricterScanner(root, cache=True, cache_dir=cache_dir).scan()
+        assert sorted(counter.scans) == ["app.py", "config.yaml", "src/util.py"]
+        assert [m.type for m in matches] == ["api_key", "debug"]
+    print("✅ Pattern change invalidates cache - PASS")
+
+
+def test_deleted_files_pruned():
+    """Test entries for deleted files are dropped on a full scan."""
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as cache_tmp:
+        root, cache_dir = Path(tmp), Path(cache_tmp)
+        _make_project(root)
+        SecretsScanner(root, cache=True, cache_dir=cache_dir).scan()
+        (root / "app.py").unlink()
+
+        scanner = SecretsScanner(root, cache=True, cache_dir=cache_dir)
+        assert scanner.scan() == []
+        assert set(scanner.cache.files) == {"src/util.py", "config.yaml"}
+    print("✅ Deleted files pruned - PASS")
+
+
+if __name__ == "__main__":
+    test_unchanged_files_not_reread()
+    test_touch_reuses_by_hash()
+    test_cache_outside_project()
+    test_restored_mtime_rescanned()
+    test_pattern_change_invalidates()
+    test_deleted_files_pruned()
+    print("\n✅ All scan cache tests passed!\n")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the security decision audit log.
+
+Verifies buffering, rotation, what each entry records, and the
+blocked-command / latency summary.
+"""
+
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+from security import bash_security_hook
+from security_audit import (
+    SecurityAuditLog,
+    audit_log_path,
+    command_hash,
+    get_audit_log,
+    redact_reason,
+    summarize_audit_log,
+)
+
+
+def test_buffer_and_rotation():
+    """Test entries are written in batches and the file rotates."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "audit.jsonl"
+        log = SecurityAuditLog(path, buffer_size=3, flush_seconds=3600, max_bytes=600, backups=2)
+
+        log.record("ls", ["ls"], "", 10.0)
+        log.record("ls", ["ls"], "", 12.0)
+        assert not path.exists(), "Entries stay buffered"
+        log.record("curl x", ["curl"], "Command 'curl' is not allowed", 15.0)
+        lines = path.read_text().splitlines()
+        assert len(lines) == 3
+
+        entry = json.loads(lines[2])
+        assert entry["hash"] == command_hash("curl x") and "curl x" not in lines[2]
+        assert entry["commands"] == ["curl"] and entry["decision"] == "block"
+        assert entry["us"] == 15.0
+
+        for _ in range(30):
+            log.record("git status", ["git"], "", 5.0)
+        log.flush()
+        assert path.with_name("audit.jsonl.1").exists()
+        assert not path.with_name("audit.jsonl.3").exists(), "Only 2 backups kept"
+    print("✅ Buffering and rotation - PASS")
+
+
+def test_reason_redaction():
+    """Test block reasons are stored without the command text they quote."""
+    assert redact_reason("Could not parse command for security validation: "
+                         "echo 'TOKEN=abc123") == "Could not parse command for security validation"
+    assert redact_reason("Command name built from a substitution is not allowed: "
+                         "$(cat .env)") == "Command name built from a substitution is not allowed"
+    assert redact_reason("chmod only allowed with +x mode, got: 777") == "chmod only allowed with +x mode"
+    assert redact_reason("Command 'curl' is not in the allowed commands list") == \
+        "Command 'curl' is not in the allowed commands list"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "audit.jsonl"
+        log = SecurityAuditLog(path)
+        command = "echo 'SECRET=hunter2"
+        log.record(command, [], f"Could not parse command for security validation: {command}", 3.0)
+        log.flush()
+        assert "hunter2" not in path.read_text()
+    print("✅ Reason redaction - PASS")
+
+
+def test_hook_and_summary():
+    """Test the hook audits decisions per project and the summary."""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = str(Path(tmp).resolve())
+
+        async def run(commands):
+            for command in commands:
+                await bash_security_hook(
+                    {"tool_name": "Bash", "tool_input": {"command": command}, "cwd": project}
+                )
+
+        asyncio.run(run(["git status"] * 5 + ["shutdown now"] * 3 + ["reboot", "npm test | tail"]))
+        asyncio.run(bash_security_hook({"tool_name": "Bash", "tool_input": {"command": "ls"}}))
+
+        summary = summarize_audit_log(project)
+        assert summary["total"] == 10, "Only hook calls with a cwd are audited"
+        assert summary["blocked"] == 4
+        assert summary["top_blocked"][0] == {
+            "reason": "Command 'shutdown' is not in the allowed commands list",
+            "count": 3,
+            "commands": "shutdown",
+        }
+        assert 0 < summary["p50_us"] <= summary["p99_us"]
+        assert audit_log_path(project).exists(), "Summary flushes the buffer first"
+        assert get_audit_log(project) is get_audit_log(project)
+    print("✅ Hook auditing and summary - PASS")
+
+
+if __name__ == "__main__":
+    test_buffer_and_rotation()
+    test_reason_redaction()
+    test_hook_and_summary()
+    print("\n✅ All security audit tests passed!\n")
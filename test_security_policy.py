@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test script for declarative security policy files.
+
+Verifies policy layering (defaults, global, project), YAML and TOML
+formats, hot reload of the global policy, the project policy being frozen
+at first use and protected from agent writes, and fail-safe handling of
+broken files.
+"""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+from security import DEFAULT_POLICY, _write_targets, bash_security_hook, evaluate_command, protect_policy_files_hook
+from security_policy import PolicyLoader
+
+
+def _write(path: Path, text: str, mtime_ns: int = None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_layering():
+    """Test global and project policies on top of the defaults."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        global_dir = root / "home" / ".claude"
+        project = root / "project"
+        _write(global_dir / "security_policy.yaml", "allow: [go]\ndeny: [curl]\n")
+        _write(project / ".claude" / "security_policy.toml",
+               'allow = ["cargo", "curl"]\nallow_patterns = ["python3.*"]\npkill_processes = ["air"]\n')
+
+        loader = PolicyLoader(DEFAULT_POLICY, global_dir=global_dir)
+        global_only = loader.get(None)
+        assert global_only.allows("go") and global_only.allows("git")
+        assert not global_only.allows("curl") and not global_only.allows("cargo")
+
+        policy = loader.get(str(project))
+        assert policy.allows("cargo") and policy.allows("go")
+        assert policy.allows("curl"), "Project allow overrides a global deny"
+        assert policy.allows("python3.12") and not policy.allows("ruby")
+        assert loader.get(str(project)) is policy, "Compiled policy is shared"
+
+        assert evaluate_command("pkill air", policy) == ""
+        assert evaluate_command("pkill air") != "", "Default policy is unchanged"
+        assert evaluate_command("go test ./...", global_only) == ""
+        assert "not in the allowed" in evaluate_command("go test ./...")
+    print("✅ Policy layering - PASS")
+
+
+def test_hot_reload():
+    """Test recompiling when the global policy file's mtime changes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        global_dir = Path(tmp)
+        policy_file = global_dir / "security_policy.yaml"
+        _write(policy_file, "allow: [go]\n", mtime_ns=1_000_000_000)
+
+        reloads = []
+        loader = PolicyLoader(DEFAULT_POLICY, global_dir=global_dir,
+                              on_reload=lambda: reloads.append(1), check_interval=0)
+        first = loader.get(None)
+        assert first.allows("go") and not reloads
+
+        _write(policy_file, "allow: [go]\ndeny: [git]\n", mtime_ns=2_000_000_000)
+        second = loader.get(None)
+        assert second is not first and not second.allows("git")
+        assert reloads == [1]
+
+        _write(policy_file, "allow: [go\n", mtime_ns=3_000_000_000)
+        broken = loader.get(None)
+        assert broken.error and "Security policy is invalid" in evaluate_command("ls", broken)
+
+        _write(policy_file, "allow_everything: true\n", mtime_ns=4_000_000_000)
+        assert "unknown keys" in loader.get(None).error
+
+        policy_file.unlink()
+        assert loader.get(None) is DEFAULT_POLICY
+    print("✅ Hot reload - PASS")
+
+
+def test_project_policy_frozen():
+    """Test the project policy is read once and later edits are ignored."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        global_dir = root / "home"
+        global_dir.mkdir()
+        project = root / "project"
+        policy_file = project / ".claude" / "security_policy.yaml"
+        _write(policy_file, "allow: [go]\n", mtime_ns=1_000_000_000)
+
+        loader = PolicyLoader(DEFAULT_POLICY, global_dir=global_dir, check_interval=0)
+        first = loader.get(str(project))
+        assert first.allows("go")
+
+        # The agent rewrites its own policy: nothing changes, even after a global reload
+        _write(policy_file, 'allow_patterns: ["*"]\n', mtime_ns=2_000_000_000)
+        assert loader.get(str(project)) is first
+        _write(global_dir / "security_policy.yaml", "allow: [cargo]\n")
+        reloaded = loader.get(str(project) + "/")
+        assert reloaded.allows("cargo") and reloaded.allows("go")
+        assert evaluate_command("sudo rm -rf /", reloaded) != ""
+
+        # A policy file created after the first use is ignored too
+        other = root / "other"
+        other.mkdir()
+        assert loader.get(str(other)).allows("cargo")
+        _write(other / ".claude" / "security_policy.yaml", 'allow_patterns: ["*"]\n')
+        assert not loader.get(str(other)).allows("sudo")
+    print("✅ Project policy frozen - PASS")
+
+
+def test_policy_files_protected():
+    """Test the agent cannot write policy files with file tools or Bash."""
+    def blocked(tool_name, tool_input):
+        input_data = {"tool_name": tool_name, "tool_input": tool_input}
+        hook = bash_security_hook if tool_name == "Bash" else protect_policy_files_hook
+        return asyncio.run(hook(input_data)).get("decision") == "block"
+
+    assert blocked("Write", {"file_path": ".claude/security_policy.yaml", "content": "allow_patterns: ['*']"})
+    assert blocked("Edit", {"file_path": "/work/app/.claude/security_policy.toml"})
+    assert blocked("MultiEdit", {"file_path": "/work/app/src/../.claude/security_policy.yml"})
+    assert not blocked("Write", {"file_path": ".claude/settings.json"})
+    assert not blocked("Write", {"file_path": "docs/security_policy.md"})
+    assert not blocked("Read", {"file_path": ".claude/security_policy.yaml"})
+
+    assert blocked("Bash", {"command": "echo 'allow_patterns: [\"*\"]' > .claude/security_policy.yaml"})
+    assert blocked("Bash", {"command": "cp /tmp/p.yaml .claude/security_policy.yaml"})
+    assert blocked("Bash", {"command": "cp /tmp/security_policy.yaml ./.claude/"})
+    assert blocked("Bash", {"command": "mv -t .claude security_policy.toml"})
+    assert blocked("Bash", {"command": "sed -i 's/deny/allow/' .claude/security_policy.yaml"})
+    assert blocked("Bash", {"command": "echo x 2>>.claude/security_policy.yml"})
+    assert list(_write_targets(("tee", "-a", "out.log", ".claude/security_policy.yaml"))) == [
+        "out.log", ".claude/security_policy.yaml",
+    ]
+
+    # Only writes are blocked: reading or merely naming a policy file is fine
+    for command in (
+        "python -m pytest test_security_policy.py",
+        "git log --grep=security_policy.",
+        "ls > security_policy.txt",
+        "cat .claude/security_policy.yaml",
+        "cp .claude/security_policy.yaml /tmp/backup.yaml",
+        "grep deny < .claude/security_policy.yaml",
+    ):
+        assert "Security policy files" not in evaluate_command(command), command
+    print("✅ Policy files protected - PASS")
+
+
+def test_hook_uses_project_policy():
+    """Test bash_security_hook picks the policy from the hook input's cwd."""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp)
+        _write(project / ".claude" / "security_policy.yaml", "allow: [cargo]\ndeny: [npm]\n")
+
+        def blocked(command, cwd):
+            input_data = {"tool_name": "Bash", "tool_input": {"command": command}, "cwd": cwd}
+            return asyncio.run(bash_security_hook(input_data)).get("decision") == "block"
+
+        assert not blocked("cargo build", str(project))
+        assert blocked("npm install", str(project))
+        assert not blocked("npm install", None)
+    print("✅ Hook uses project policy - PASS")
+
+
+if __name__ == "__main__":
+    test_layering()
+    test_hot_reload()
+    test_project_policy_frozen()
+    test_policy_files_protected()
+    test_hook_uses_project_policy()
+    print("\n✅ All security policy tests passed!\n")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for session outcome attribution.
+
+Verifies that feature_list.json diffs and commit messages are attributed
+to feature ids, and that failed sessions feed the retry manager.
+"""
+
+import json
+import subprocess
+import tempfile
+from pathlib import Path
+
+from feature_loader import load_project_features
+from retry_manager import RetryManager
+from session_attribution import attribute_session, build_focus_prompt, take_snapshot
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def _setup_project(tmpdir: str) -> Path:
+    project_dir = Path(tmpdir)
+    (project_dir / "spec").mkdir()
+    _write_features(project_dir, [False, False, False])
+    _git(project_dir, "init", "-q")
+    _git(project_dir, "-c", "user.name=t", "-c", "user.email=t@t", "add", ".")
+    _git(project_dir, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    return project_dir
+
+
+def _write_features(project_dir: Path, passes: list) -> None:
+    descriptions = ["User can log in with email", "User can reset password", "Dark mode toggle"]
+    (project_dir / "spec" / "feature_list.json").write_text(json.dumps([
+        {"description": d, "category": "functional", "passes": p}
+        for d, p in zip(descriptions, passes)
+    ]))
+
+
+def _commit(project_dir: Path, message: str) -> None:
+    (project_dir / "work.txt").write_text(message)
+    _git(project_dir, "add", ".")
+    _git(project_dir, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", message)
+
+
+def test_diff_and_commits():
+    """Test passed/mentioned attribution from the diff and commit messages."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = _setup_project(tmpdir)
+        before = take_snapshot(project_dir)
+
+        _write_features(project_dir, [True, False, False])
+        _commit(project_dir, "Implement feature-0: user can log in with email")
+        _commit(project_dir, "WIP on user can reset password")
+
+        result = attribute_session(project_dir, before, "continue", target="feature-1")
+        assert result.passed == ["feature-0"]
+        assert result.mentioned == ["feature-0", "feature-1"]
+        assert result.failed == []  # Partial work on the target is not a failure
+        print("✅ Diff + commit attribution - PASS")
+
+
+def test_timeout_counts_as_failure():
+    """Test that timeouts fail the target unless it flipped to passing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = _setup_project(tmpdir)
+
+        before = take_snapshot(project_dir)
+        result = attribute_session(project_dir, before, "timeout", target="feature-0")
+        assert result.failed == ["feature-0"]
+
+        _write_features(project_dir, [True, False, False])
+        result = attribute_session(project_dir, before, "error", target="feature-0")
+        assert result.failed == []
+        assert result.passed == ["feature-0"]
+
+        # Progress on another feature is not held against the target
+        before = take_snapshot(project_dir)
+        _write_features(project_dir, [True, False, True])
+        result = attribute_session(project_dir, before, "continue", target="feature-1")
+        assert result.failed == []
+
+        # A completed session that committed nothing and passed nothing fails
+        before = take_snapshot(project_dir)
+        result = attribute_session(project_dir, before, "continue", target="feature-1")
+        assert result.failed == ["feature-1"]
+        print("✅ Timeout/error failure attribution - PASS")
+
+
+def test_skipped_dropped_from_prompt():
+    """Test that repeated failures skip a feature and move the focus on."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = _setup_project(tmpdir)
+        manager = RetryManager(project_dir, max_retries=2)
+
+        for _ in range(2):
+            target = manager.get_next_feature(load_project_features(project_dir))
+            assert target.id == "feature-0"
+            manager.record_failure(target.id, "timeout")
+
+        features = load_project_features(project_dir)
+        target = manager.get_next_feature(features)
+        skipped = [f for f in features if not f.passes and manager.should_skip(f.id)]
+        prompt = build_focus_prompt("BASE", target, skipped)
+
+        assert target.id == "feature-1"
+        assert "Id: feature-1" in prompt
+        assert "SKIPPED" in prompt and "feature-0: User can log in" in prompt
+        assert build_focus_prompt("BASE", None, []) == "BASE"
+        print("✅ Skipped features dropped from prompt - PASS")
+
+
+if __name__ == "__main__":
+    test_diff_and_commits()
+    test_timeout_counts_as_failure()
+    test_skipped_dropped_from_prompt()
+    print("\n✅ All session attribution tests passed!\n")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental (staged-diff) secrets scanning.
+
+Verifies git add / git commit parsing, that only added lines and
+untracked files under the pathspec are scanned (gitignored ones too
+for git add -f), the full-scan fallback in secrets_scan_hook, and that
+the hook scans off the event loop.
+"""
+
+import asyncio
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from validators import secrets_hook
+from validators.secrets_hook import secrets_scan_hook
+from validators.staged_scan import git_scan_targets, incremental_scan
+
+
+API_LINE = "api_key = 'abcdefghijklmnopqrstuvwxyz'"
+TOKEN_LINE = "GITHUB_TOKEN = '" + "a" * 40 + "'"
+
+
+@contextmanager
+def _uncached_hook():
+    """Run the hook without its scan cache, which lives in the real home directory."""
+    original = secrets_hook.SCAN_CACHE
+    secrets_hook.SCAN_CACHE = False
+    try:
+        yield
+    finally:
+        secrets_hook.SCAN_CACHE = original
+
+
+def _git(repo: Path, *args: str):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def _make_repo(root: Path):
+    _git(root, "init", "-q")
+    _git(root, "config", "user.email", "dev@localhost")
+    _git(root, "config", "user.name", "dev")
+    # Secret already committed: not part of any new change
+    (root / "old.py").write_text(f"{API_LINE}\n")
+    (root / "app.py").write_text("a = 1\nb = 2\n")
+    _git(root, "add", ".")
+    _git(root, "commit", "-q", "-m", "initial")
+
+
+def test_git_scan_targets():
+    """Test which git invocations are recognised."""
+    targets = git_scan_targets("git add src/app.py README.md && git commit -m 'add app'")
+    assert targets.add_pathspecs == [["src/app.py", "README.md"]] and targets.add_untracked
+    assert targets.commit and targets.commit_unstaged is None
+
+    assert git_scan_targets("git commit -am 'wip'").commit_unstaged == []
+    assert git_scan_targets("git commit -m 'msg' -- a.py").commit_unstaged == ["a.py"]
+    assert git_scan_targets("git add -u").add_untracked is False
+    assert git_scan_targets("git add -f .env && git commit -m wip").force_pathspecs == [[".env"]]
+    assert git_scan_targets("git add --force -A").force_pathspecs == [[]]
+    assert git_scan_targets("git add .").force_pathspecs == []
+    assert git_scan_targets("git -c core.x=1 add -A").add_pathspecs == [[]]
+    assert git_scan_targets("git -C ../other add .") is None
+    assert git_scan_targets("cd ../other && git add .", Path(".")) is None
+    assert git_scan_targets("cd . && git add .", Path(".")).add_pathspecs == [["."]]
+    assert git_scan_targets("echo 'unclosed") is None
+    print("✅ git add/commit parsing - PASS")
+
+
+def test_incremental_scan():
+    """Test only changed lines and untracked files are scanned."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_repo(root)
+
+        (root / "app.py").write_text(f"a = 1\n{TOKEN_LINE}\nb = 2\n")
+        (root / "docs").mkdir()
+        (root / "docs" / "new.py").write_text(f"x = 1\n{API_LINE}\n")
+
+        matches = incremental_scan(root, "git add app.py")
+        assert [(m.file, m.line, m.type) for m in matches] == [("app.py", 2, "github_token")]
+
+        matches = incremental_scan(root, "git add .")
+        assert [(m.file, m.line) for m in matches] == [("docs/new.py", 2), ("app.py", 2)]
+        assert "old.py" not in {m.file for m in matches}, "Committed secrets are not rescanned"
+
+        assert incremental_scan(root, "git commit -m 'x'") == [], "Nothing staged yet"
+        _git(root, "add", "app.py")
+        matches = incremental_scan(root, "git commit -m 'x'")
+        assert [(m.file, m.line) for m in matches] == [("app.py", 2)]
+        assert incremental_scan(root, "git status") == []
+    print("✅ Incremental scan - PASS")
+
+
+def test_force_add_ignored_file():
+    """Test git add -f scans a gitignored file that a plain git add would skip."""
+    with tempfile.TemporaryDirectory() as tmp, _uncached_hook():
+        root = Path(tmp)
+        _make_repo(root)
+        (root / ".gitignore").write_text(".env\n")
+        (root / ".env").write_text(f"{API_LINE}\n")
+
+        assert incremental_scan(root, "git add . && git commit -m wip") == [], "Ignored file is not staged"
+        matches = incremental_scan(root, "git add -f .env && git commit -m wip")
+        assert [(m.file, m.line) for m in matches] == [(".env", 1)]
+
+        command = {"tool_input": {"command": "git add -f .env && git commit -m wip"}, "cwd": str(root)}
+        result = asyncio.run(secrets_scan_hook(command, None, None))
+        assert result["permission"] == "deny" and ".env:1" in result["agent_message"]
+
+        # Once staged, the commit sees it through the index
+        _git(root, "add", "-f", ".env")
+        assert [m.file for m in incremental_scan(root, "git commit -m wip")] == [".env"]
+    print("✅ Forced add of an ignored file - PASS")
+
+
+def test_hook_input_and_fallback():
+    """Test the hook reads tool_input or a bare command, and falls back to a full scan."""
+    with tempfile.TemporaryDirectory() as tmp, _uncached_hook():
+        root = Path(tmp)
+        _make_repo(root)
+        (root / "app.py").write_text(f"{TOKEN_LINE}\n")
+
+        nested = {"tool_name": "Bash", "tool_input": {"command": "git add app.py"}, "cwd": str(root)}
+        result = asyncio.run(secrets_scan_hook(nested, None, None))
+        assert result["permission"] == "deny" and "app.py:1" in result["agent_message"]
+
+        bare = {"command": "git add app.py"}
+        result = asyncio.run(secrets_scan_hook(bare, None, {"cwd": str(root)}))
+        assert result["permission"] == "deny"
+
+        # cd elsewhere can't be analysed: full scan also finds the committed secret
+        (root / "docs").mkdir()
+        fallback = {"tool_input": {"command": "cd docs && git add ../app.py"}, "cwd": str(root)}
+        result = asyncio.run(secrets_scan_hook(fallback, None, None))
+        assert "old.py:1" in result["agent_message"]
+
+        # The full scan covers gitignored files too: git add -f can stage them
+        (root / ".gitignore").write_text(".env\n")
+        (root / ".env").write_text(f"{API_LINE}\n")
+        forced = {"tool_input": {"command": "cd docs && git add -f ../.env"}, "cwd": str(root)}
+        result = asyncio.run(secrets_scan_hook(forced, None, None))
+        assert ".env:1" in result["agent_message"]
+        (root / ".env").unlink()
+
+        clean = {"tool_input": {"command": "git add README.md"}, "cwd": str(root)}
+        assert asyncio.run(secrets_scan_hook(clean, None, None)) == {}
+    print("✅ Hook input and fallback - PASS")
+
+
+def test_hook_runs_off_event_loop():
+    """Test a slow scan doesn't block other coroutines."""
+    def slow_scan(project_dir, command, scanner=None):
+        time.sleep(0.2)
+        return []
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await secrets_scan_hook({"tool_input": {"command": "git add ."}, "cwd": "."}, None, None)
+        task.cancel()
+        return result, ticks
+
+    original = secrets_hook.incremental_scan
+    secrets_hook.incremental_scan = slow_scan
+    try:
+        with _uncached_hook():
+            result, ticks = asyncio.run(scenario())
+    finally:
+        secrets_hook.incremental_scan = original
+    assert result == {}
+    assert ticks >= 5, f"Event loop was blocked during the scan ({ticks} ticks)"
+    print("✅ Hook runs off the event loop - PASS")
+
+
+if __name__ == "__main__":
+    test_git_scan_targets()
+    test_incremental_scan()
+    test_force_add_ignored_file()
+    test_hook_input_and_fallback()
+    test_hook_runs_off_event_loop()
+    print("\n✅ All staged scan tests passed!\n")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for adaptive per-category stall thresholds.
+
+Verifies the on-disk gap histogram and that LoopDetector derives
+stall timeouts from it, capped by the CLI value.
+"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from loop_detector import LoopDetector
+from stall_history import BUCKET_EDGES, MIN_SAMPLES, MIN_STALL_SECONDS, GapHistogram
+
+
+def test_histogram_thresholds():
+    """Test percentile thresholds, floor, ceiling and persistence."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / ".claude" / "tool_gaps.json"
+        histogram = GapHistogram(path)
+
+        for _ in range(MIN_SAMPLES):
+            histogram.record("browser", 3)
+            histogram.record("exec", 200)
+
+        assert histogram.percentile("browser", 0.99) == 5
+        assert histogram.stall_threshold("browser", 600) == MIN_STALL_SECONDS
+        assert histogram.stall_threshold("exec", 600) == 600, "CLI value is the ceiling"
+        assert histogram.stall_threshold("docs", 600) == 600, "No samples - use the CLI value"
+
+        histogram.save()
+        data = json.loads(path.read_text())
+        assert data["edges"] == BUCKET_EDGES
+        assert GapHistogram(path).samples("browser") == MIN_SAMPLES
+        print("✅ Histogram thresholds and persistence - PASS")
+
+
+def test_loop_detector_adaptive_stall():
+    """Test that a learned category limit stalls before the CLI timeout."""
+    histogram = GapHistogram()
+    for _ in range(MIN_SAMPLES):
+        histogram.record("browser", 4)
+
+    detector = LoopDetector(stall_timeout_minutes=10, gap_histogram=histogram)
+    detector.track_tool("browser")
+    detector.last_progress -= MIN_STALL_SECONDS + 5
+    is_stuck, reason = detector.check()
+    assert is_stuck and "learned limit" in reason, reason
+
+    detector.track_tool("exec")
+    detector.last_progress -= MIN_STALL_SECONDS + 5
+    is_stuck, _ = detector.check()
+    assert not is_stuck, "No history for exec - CLI timeout applies"
+    print(f"✅ Adaptive stall timeout - PASS ({reason})")
+
+
+def test_gaps_recorded():
+    """Test that gaps between tool calls are recorded under the previous category."""
+    histogram = GapHistogram()
+    detector = LoopDetector(gap_histogram=histogram)
+    detector.track_tool("exec")
+    time.sleep(0.01)
+    detector.track_tool("read")
+    assert histogram.samples("exec") == 1
+    assert histogram.samples("read") == 0
+
+    detector.reset()
+    detector.track_tool("read")
+    assert histogram.samples("exec") == 1, "No gap across sessions"
+    print("✅ Gaps recorded per category - PASS")
+
+
+if __name__ == "__main__":
+    test_histogram_thresholds()
+    test_loop_detector_adaptive_stall()
+    test_gaps_recorded()
+    print("\n✅ All stall history tests passed!\n")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the tool taxonomy registry.
+
+Verifies that SDK, MCP and Bash tool calls map to the right categories
+and paths, and that LoopDetector and output_formatter consume them.
+"""
+
+from loop_detector import LoopDetector
+from output_formatter import format_tool_output
+from tool_registry import classify_tool
+
+
+def test_sdk_and_mcp_tools():
+    """Test built-in and MCP tool categories."""
+    use = classify_tool("Read", {"file_path": "/app/src/index.js"})
+    assert use.category == "read"
+    assert use.paths == ("/app/src/index.js",)
+
+    assert classify_tool("Edit", {"file_path": "a.py"}).category == "write"
+    assert classify_tool("Grep", {"pattern": "x", "path": "src"}).paths == ()
+    assert classify_tool("mcp__puppeteer__puppeteer_click", {}).category == "browser"
+    assert classify_tool("mcp__context7__get_library_docs", {}).category == "docs"
+    assert classify_tool("mcp__linear__list_issues", {}).category == "other"
+    assert classify_tool("SomethingNew", None).category == "other"
+    print("✅ SDK and MCP tools - PASS")
+
+
+def test_bash_commands():
+    """Test Bash classification through security.extract_commands."""
+    use = classify_tool("Bash", {"command": "cat a.txt | grep foo && head -n 5 b.txt"})
+    assert use.category == "read"
+    assert use.commands == ("cat", "grep", "head")
+    assert use.paths == ("a.txt", "b.txt")
+
+    use = classify_tool("Bash", {"command": "mkdir -p src && cat a.txt > src/b.txt"})
+    assert use.category == "write"
+    assert use.paths == ("src", "a.txt")
+
+    assert classify_tool("Bash", {"command": "npm test"}).category == "exec"
+    assert classify_tool("Bash", {"command": "echo 'unclosed"}).category == "exec"
+    print("✅ Bash commands - PASS")
+
+
+def test_consumers():
+    """Test that SDK Read calls reach LoopDetector and the formatter."""
+    detector = LoopDetector()
+    for _ in range(4):
+        detector.track_tool_use("Read", {"file_path": "src/app.js"})
+    is_stuck, reason = detector.check()
+    assert is_stuck and "src/app.js" in reason
+
+    detector.reset()
+    detector.track_tool_use("Bash", {"command": "cat src/app.js"})
+    detector.track_tool_use("Edit", {"file_path": "src/app.js"})
+    detector.track_tool_use("Bash", {"command": "npm test"})
+    stats = detector.get_stats()
+    assert stats["tools_by_category"] == {"read": 1, "write": 1, "exec": 1}
+    assert stats["repeated_reads"] == {}, "Writes reset the repeated-read counts"
+
+    assert format_tool_output("Read", {"file_path": "/x/y/app.js"}).endswith("app.js")
+    assert "📚" in format_tool_output("mcp__ref__search", {"query": "react"})
+    print("✅ LoopDetector and formatter use the registry - PASS")
+
+
+if __name__ == "__main__":
+    test_sdk_and_mcp_tools()
+    test_bash_commands()
+    test_consumers()
+    print("\n✅ All tool registry tests passed!\n")
@@ -61,6 +61,64 @@ def test_loop_detector():
     assert stats['tool_count'] == 2
     print(f"✅ Test 5: Stats tracking - PASS (tool_count={stats['tool_count']})")
 
+    # Test: Repeated tool cycle with identical inputs
+    detector = LoopDetector(session_timeout_minutes=2, stall_timeout_minutes=1)
+    cycle = [
+        ("Edit", {"file_path": "app.js", "old_string": "a", "new_string": "b"}),
+        ("Bash", {"command": "npm   test"}),
+        ("Read", {"file_path": "app.js"}),
+    ]
+    for tool, tool_input in cycle * 2:
+        detector.track_tool(tool, tool_input=tool_input)
+    is_stuck, _ = detector.check()
+    assert not is_stuck, "Two passes through a cycle should be fine"
+    detector.track_tool("Edit", tool_input=cycle[0][1])
+    detector.track_tool("Bash", tool_input={"command": "npm test"})  # Whitespace-normalized
+    is_stuck, _ = detector.check()
+    assert not is_stuck, "A partial third pass is not yet three repeats"
+    detector.track_tool("Read", tool_input=cycle[2][1])
+    is_stuck, reason = detector.check()
+    assert is_stuck and "3-tool cycle 3 times" in reason, "Should detect repeated tool cycle"
+    print(f"✅ Test: Tool cycle detection - PASS ({reason})")
+
+    # Test: Varying inputs are progress, and memory stays bounded
+    detector.reset()
+    for i in range(500):
+        detector.track_tool("Edit", tool_input={"file_path": f"file{i}.js"})
+        detector.track_tool("Bash", tool_input={"command": "npm test"})
+    is_stuck, _ = detector.check()
+    assert not is_stuck, "Different edits between test runs are not a loop"
+    assert len(detector._recent) <= detector.cycle_window
+    print("✅ Test: Bounded cycle window - PASS")
+
+    # Test: Different edits followed by the same build/test commands are progress
+    detector.reset()
+    for i in range(20):
+        detector.track_tool("Edit", tool_input={"file_path": "app.js", "old_string": f"v{i}", "new_string": f"v{i + 1}"})
+        detector.track_tool("Bash", tool_input={"command": "npm run build"})
+        detector.track_tool("Bash", tool_input={"command": "npm test"})
+    for i in range(20):
+        detector.track_tool("Write", tool_input={"file_path": f"x{i}.js", "content": "x"})
+        detector.track_tool("Bash", tool_input={"command": "git status"})
+        detector.track_tool("Bash", tool_input={"command": "git diff"})
+    is_stuck, reason = detector.check()
+    assert not is_stuck, f"Edit -> build -> test with different edits is not a loop ({reason})"
+    print("✅ Test: Build/test after different edits - PASS")
+
+    # Test: A 2-tool cycle only counts when repeated back to back
+    detector.reset()
+    for i in range(4):
+        detector.track_tool("Bash", tool_input={"command": "npm test"})
+        detector.track_tool("Read", tool_input={"file_path": "log.txt"})
+        detector.track_tool("Edit", tool_input={"file_path": f"f{i}.js"})
+    assert not detector.check()[0], "Repeats separated by other calls are not a cycle"
+    for _ in range(3):
+        detector.track_tool("Bash", tool_input={"command": "npm test"})
+        detector.track_tool("Read", tool_input={"file_path": "log.txt"})
+    is_stuck, reason = detector.check()
+    assert is_stuck and "2-tool cycle 3 times" in reason, reason
+    print(f"✅ Test: Back-to-back 2-tool cycle - PASS ({reason})")
+
     print("\n✅ All LoopDetector tests passed!\n")
 
 
@@ -118,6 +176,55 @@ def test_retry_manager():
         shutil.rmtree(temp_dir)
 
 
+def test_retry_journal():
+    """Test journaled retry state persistence and replay."""
+    print("\n" + "="*70)
+    print("TEST: Retry Journal")
+    print("="*70)
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        manager = RetryManager(temp_dir, max_retries=2)
+        manager.record_failure("feature-1", "error 1")
+        manager.record_failure("feature-2", "error 2")
+        manager.record_failure("feature-2", "error 3")
+        manager.record_success("feature-1")
+
+        journal = temp_dir / ".claude" / "retry_state.jsonl"
+        assert journal.exists(), "Should append to journal"
+        print("✅ Test 1: Changes appended to journal - PASS")
+
+        # Simulate a crash mid-append: torn trailing line is ignored on replay
+        with open(journal, "a") as f:
+            f.write('{"seq": 99, "op": "fail')
+
+        reloaded = RetryManager(temp_dir, max_retries=2)
+        assert reloaded.get_retry_count("feature-1") == 0
+        assert reloaded.get_retry_count("feature-2") == 2
+        assert reloaded.should_skip("feature-2")
+        print("✅ Test 2: Snapshot + journal replay - PASS")
+
+        # The next append after a torn tail must not be glued onto it
+        reloaded.record_failure("feature-3", "after crash")
+        after_crash = RetryManager(temp_dir, max_retries=2)
+        assert after_crash.get_retry_count("feature-3") == 1, "Entry after torn write survives"
+        assert after_crash.get_retry_count("feature-2") == 2
+        assert journal.read_text().endswith("}\n") and '"op": "fail{' not in journal.read_text()
+        print("✅ Test 2b: Append after torn write survives reload - PASS")
+
+        # Compaction folds the journal into the snapshot without double-applying
+        reloaded._save_state()
+        assert journal.read_text() == ""
+        again = RetryManager(temp_dir, max_retries=2)
+        assert again.get_retry_count("feature-2") == 2
+        assert len(again.retry_history) == 4
+        print("✅ Test 3: Compaction - PASS")
+
+        print("\n✅ All retry journal tests passed!\n")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
 def test_error_handler():
     """Test error handler functionality."""
     print("\n" + "="*70)
@@ -155,7 +262,7 @@ def test_error_handler():
         print("✅ Test 4: Session errors filtering - PASS")
 
         # Test 5: Error log file
-        log_file = temp_dir / ".claude" / "errors.json"
+        log_file = temp_dir / ".claude" / "errors.jsonl"
         assert log_file.exists(), "Should create error log file"
         print("✅ Test 5: Error log persistence - PASS")
 
@@ -174,6 +281,93 @@ def test_error_handler():
         shutil.rmtree(temp_dir)
 
 
+def test_error_log_rotation():
+    """Test append-only error log rotation and per-session memory."""
+    print("\n" + "="*70)
+    print("TEST: Error Log Rotation")
+    print("="*70)
+
+    import error_handler
+
+    temp_dir = Path(tempfile.mkdtemp())
+    original_max = error_handler.ERROR_LOG_MAX_BYTES
+    try:
+        error_handler.ERROR_LOG_MAX_BYTES = 2000
+        old_session = ErrorHandler(temp_dir)
+        for i in range(40):
+            old_session.record_warning("session_timeout", f"stall {i}")
+
+        log_file = temp_dir / ".claude" / "errors.jsonl"
+        assert (temp_dir / ".claude" / "errors.jsonl.1").exists(), "Should rotate log"
+        assert not (temp_dir / ".claude" / f"errors.jsonl.{error_handler.ERROR_LOG_BACKUPS + 1}").exists()
+        assert log_file.stat().st_size <= 2000 + 500
+        print("✅ Test 1: Size-based rotation - PASS")
+
+        # A new session starts empty and does not read the history
+        handler = ErrorHandler(temp_dir)
+        assert handler.get_session_errors() == []
+        handler.record_warning("session_timeout", "stall")
+        summary = handler.get_error_summary()
+        assert summary['warnings'] == 1
+        assert summary['errors_by_context'] == {'session_timeout': 1}
+        print("✅ Test 2: Only current session in memory - PASS")
+
+        handler.clear_session_errors()
+        assert handler.get_error_summary()['warnings'] == 0
+        assert not handler.has_fatal_errors()
+        print("✅ Test 3: Clear session errors - PASS")
+
+        print("\n✅ All error log rotation tests passed!\n")
+    finally:
+        error_handler.ERROR_LOG_MAX_BYTES = original_max
+        shutil.rmtree(temp_dir)
+
+
+def test_error_fingerprinting():
+    """Test that repeated failures are stored once with counts."""
+    print("\n" + "="*70)
+    print("TEST: Error Fingerprinting")
+    print("="*70)
+
+    def connect(port):
+        raise ConnectionError(f"MCP server on port {port} died (pid 0x7f{port})")
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        handler = ErrorHandler(temp_dir)
+        for port in (5000, 5001, 5002):
+            try:
+                connect(port)
+            except Exception as e:
+                handler.record_error("mcp", e)
+        try:
+            raise ValueError("something else")
+        except Exception as e:
+            handler.record_error("mcp", e)
+
+        entries = handler.get_session_errors()
+        assert len(entries) == 2, "Same failure should be stored once"
+        assert entries[0]['count'] == 3
+        assert entries[0]['first_seen'] <= entries[0]['last_seen']
+        print("✅ Test 1: Repeats deduplicated - PASS")
+
+        summary = handler.get_error_summary()
+        assert summary['total_errors'] == 4
+        groups = summary['errors_by_fingerprint']
+        assert [g['count'] for g in groups] == [3, 1]
+        assert groups[0]['type'] == "ConnectionError"
+        print("✅ Test 2: Summary grouped by fingerprint - PASS")
+
+        lines = (temp_dir / ".claude" / "errors.jsonl").read_text().splitlines()
+        full = [l for l in lines if '"traceback"' in l]
+        assert len(full) == 2, "Traceback should be written once per fingerprint"
+        print("✅ Test 3: Traceback logged once - PASS")
+
+        print("\n✅ All error fingerprinting tests passed!\n")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
 def main():
     """Run all tests."""
     print("\n" + "="*70)
@@ -184,7 +378,10 @@ def main():
     try:
         test_loop_detector()
         test_retry_manager()
+        test_retry_journal()
         test_error_handler()
+        test_error_log_rotation()
+        test_error_fingerprinting()
 
         print("\n" + "="*70)
         print("  ALL TESTS PASSED! ✅")
@@ -0,0 +1,175 @@
+"""
+Tool Registry
+=============
+
+Central taxonomy of the tools the agent can call.
+
+Maps SDK built-in tools, MCP tools (by server prefix) and parsed Bash
+commands to a small set of categories, and extracts the file paths a call
+touches. LoopDetector, output_formatter and the session stats all classify
+tool calls through classify_tool() so they agree on what a "read" is.
+
+Categories:
+- read: inspects files without changing them (Read, Grep, Glob, `cat`, ...)
+- write: changes files (Edit, Write, `mv`, `rm`, ...)
+- exec: runs programs (any other Bash command)
+- browser: browser automation (Puppeteer/Playwright MCP)
+- docs: documentation lookup (Ref, Context7, web fetch/search)
+- other: anything else (TodoWrite, issue trackers, unknown tools)
+"""
+
+import os
+import shlex
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+from security import extract_commands, split_command_segments
+
+
+CATEGORIES = ("read", "write", "exec", "browser", "docs", "other")
+
+# SDK built-in tools
+TOOL_CATEGORIES: Dict[str, str] = {
+    "Read": "read",
+    "Grep": "read",
+    "Glob": "read",
+    "LS": "read",
+    "NotebookRead": "read",
+    "Edit": "write",
+    "MultiEdit": "write",
+    "Write": "write",
+    "NotebookEdit": "write",
+    "Bash": "exec",
+    "WebFetch": "docs",
+    "WebSearch": "docs",
+    "TodoWrite": "other",
+}
+
+# MCP tools, matched on their "mcp__<server>__" prefix
+MCP_SERVER_CATEGORIES: Dict[str, str] = {
+    "puppeteer": "browser",
+    "playwright": "browser",
+    "ref": "docs",
+    "context7": "docs",
+}
+
+# Bash commands that only read files
+BASH_READ_COMMANDS = frozenset({
+    "cat", "head", "tail", "less", "more", "wc", "nl", "file", "stat",
+    "ls", "tree", "find", "grep", "rg", "diff", "pwd",
+})
+
+# Bash commands that change files
+BASH_WRITE_COMMANDS = frozenset({
+    "cp", "mv", "rm", "mkdir", "touch", "tee", "chmod", "ln",
+})
+
+# Bash commands whose positional arguments are file paths
+BASH_PATH_COMMANDS = frozenset({
+    "cat", "head", "tail", "less", "more", "wc", "nl", "file", "stat",
+    "cp", "mv", "rm", "mkdir", "touch", "tee",
+})
+
+# Tool input keys that hold a file path (Grep/Glob "path" is a search root, not a file)
+PATH_KEYS = ("file_path", "notebook_path", "target_file")
+
+# Display emoji per category (output_formatter fallback)
+CATEGORY_EMOJI = {
+    "read": "📖",
+    "write": "✏️",
+    "exec": "⚡",
+    "browser": "🌐",
+    "docs": "📚",
+    "other": "🔧",
+}
+
+
+@dataclass(frozen=True)
+class ToolUse:
+    """One classified tool call."""
+    name: str
+    category: str
+    paths: Tuple[str, ...] = ()
+    commands: Tuple[str, ...] = ()  # Bash only: command names, in order
+
+    @property
+    def path(self) -> str:
+        """First path touched, or ""."""
+        return self.paths[0] if self.paths else ""
+
+
+def tool_category(tool_name: str) -> str:
+    """Category of a tool by name alone (Bash is always "exec" here)."""
+    if tool_name in TOOL_CATEGORIES:
+        return TOOL_CATEGORIES[tool_name]
+    if tool_name.startswith("mcp__"):
+        server = tool_name.split("__")[1] if tool_name.count("__") >= 2 else ""
+        return MCP_SERVER_CATEGORIES.get(server, "other")
+    return "other"
+
+
+def _bash_paths(command: str) -> Tuple[str, ...]:
+    """File arguments of path-taking commands in a Bash command line."""
+    paths = []
+    for segment in split_command_segments(command):
+        try:
+            tokens = shlex.split(segment)
+        except ValueError:
+            continue
+
+        expect_command = True
+        takes_paths = False
+        redirect_target = False
+        for token in tokens:
+            if token in ("|", "&"):
+                expect_command = True
+                continue
+            if token in (">", ">>", "<", "2>", "&>"):
+                redirect_target = True
+                continue
+            if redirect_target:
+                redirect_target = False  # Redirection target, not an argument
+                continue
+            if expect_command:
+                takes_paths = os.path.basename(token) in BASH_PATH_COMMANDS
+                expect_command = False
+                continue
+            if not takes_paths or token.startswith("-") or token.isdigit() or token == "2>&1":
+                continue
+            paths.append(token)
+    return tuple(paths)
+
+
+def classify_bash(command: str) -> ToolUse:
+    """Classify a Bash command line by the commands it runs."""
+    commands = tuple(extract_commands(command))
+    if commands and all(cmd in BASH_READ_COMMANDS for cmd in commands):
+        category = "read"
+    elif commands and all(cmd in BASH_READ_COMMANDS | BASH_WRITE_COMMANDS for cmd in commands):
+        category = "write"
+    else:
+        category = "exec"
+    return ToolUse("Bash", category, _bash_paths(command), commands)
+
+
+def classify_tool(tool_name: str, tool_input: Any = None) -> ToolUse:
+    """
+    Classify a tool call.
+
+    Args:
+        tool_name: Tool name as reported by the SDK (e.g. "Read", "mcp__puppeteer__puppeteer_click")
+        tool_input: Tool input dict
+
+    Returns:
+        ToolUse with category and extracted paths
+    """
+    tool_input = tool_input if isinstance(tool_input, dict) else {}
+
+    if tool_name == "Bash":
+        return classify_bash(str(tool_input.get("command", "")))
+
+    paths = tuple(
+        str(tool_input[key]) for key in PATH_KEYS
+        if isinstance(tool_input.get(key), str) and tool_input[key]
+    )
+    return ToolUse(tool_name, tool_category(tool_name), paths)
@@ -6,6 +6,9 @@ PostToolUse hook that validates E2E tests after git commit.
 
 from pathlib import Path
 import json
+import sqlite3
+
+from feature_store import get_feature_store
 from .e2e_verifier import E2EVerifier
 
 
@@ -15,14 +18,11 @@ def get_current_feature(project_dir: Path) -> dict | None:
     feature_list_path = project_dir / "spec" / "feature_list.json"
     if feature_list_path.exists():
         try:
-            with open(feature_list_path) as f:
-                data = json.load(f)
-                features = data.get("features", [])
-                # Find first feature that's not passing
-                for feature in features:
-                    if not feature.get("passing", False):
-                        return feature
-        except:
+            # Indexed lookup - first feature that's not passing
+            feature = get_feature_store(project_dir).next_pending(include_skipped=True)
+            if feature:
+                return feature.to_dict()
+        except sqlite3.Error:
             pass
 
     # Check for .next_feature.json (continuation mode)
@@ -0,0 +1,183 @@
+"""
+Persistent per-file cache for the secrets scanner.
+
+Most files are unchanged between consecutive `git add` calls, so the
+scanner keeps each file's violations (line and type only - never the
+secret itself), keyed by (path, size, mtime_ns, ctime_ns, inode):
+
+- Key unchanged: the stored violations are reused without reading the file
+- Key changed but content hash unchanged (touch, checkout): reused after a
+  read, without running the patterns
+- Otherwise the file is rescanned
+
+The whole cache is dropped when the pattern set changes. Files modified
+within RACY_WINDOW_NS of being cached are always verified by hash, since
+a second write in the same mtime tick would not change the key.
+
+A "clean" entry lets a file skip the scan, so the cache must not be
+forgeable by the agent being checked. It lives under SCAN_CACHE_DIR in
+the user's home, outside the project tree the agent may write to (one
+file per project), and the key includes ctime and inode, which - unlike
+size and mtime (`touch -d`) - a process cannot set to chosen values.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Directory of the cache files (outside every project: the agent cannot write it)
+SCAN_CACHE_DIR = Path.home() / ".claude" / "secrets_scan_cache"
+
+# Bump when the cache file layout changes
+SCAN_CACHE_VERSION = 2
+
+# mtime this close to the time of caching is not trusted on its own
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 of a file's bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def cache_path(project_dir: Path, cache_dir: Optional[Path] = None) -> Path:
+    """
+    Cache file for a project.
+
+    Args:
+        project_dir: Project directory
+        cache_dir: Directory of cache files (None = SCAN_CACHE_DIR)
+
+    Returns:
+        <cache_dir>/<hash of the project's real path>.json
+    """
+    key = hashlib.sha256(os.path.realpath(project_dir).encode()).hexdigest()[:16]
+    return (cache_dir or SCAN_CACHE_DIR) / f"{key}.json"
+
+
+def _stat_key(stat: os.stat_result) -> Dict[str, int]:
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "ctime_ns": stat.st_ctime_ns,
+        "ino": stat.st_ino,
+    }
+
+
+def patterns_fingerprint(patterns: Dict[str, str], ignore_patterns: Iterable[str]) -> str:
+    """Hash of everything that decides a file's violations."""
+    payload = json.dumps([SCAN_CACHE_VERSION, sorted(patterns.items()), list(ignore_patterns)])
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class ScanCache:
+    """Per-file secrets scan results that survive across sessions."""
+
+    def __init__(
+        self,
+        project_dir: Path,
+        fingerprint: str,
+        verify_hash: bool = False,
+        cache_dir: Optional[Path] = None,
+    ):
+        """
+        Initialize scan cache.
+
+        Args:
+            project_dir: Project directory
+            fingerprint: patterns_fingerprint() of the scanner's pattern set
+            verify_hash: Re-read and hash files even when their key is unchanged
+            cache_dir: Directory of cache files (None = SCAN_CACHE_DIR)
+        """
+        self.cache_file = cache_path(project_dir, cache_dir)
+        self.project_dir = os.path.realpath(project_dir)
+        self.fingerprint = fingerprint
+        self.verify_hash = verify_hash
+        self.files: Dict[str, Dict] = {}  # {rel_path: {size, mtime_ns, ctime_ns, ino, sha256, racy, hits}}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file) as f:
+                state = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return  # Start fresh if cache file is corrupted
+        if state.get("fingerprint") != self.fingerprint or state.get("project") != self.project_dir:
+            self._dirty = True  # Pattern set changed: every entry is stale
+            return
+        self.files = state.get("files", {})
+
+    def save(self):
+        """Write the cache if anything changed."""
+        if not self._dirty:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_suffix(f".json.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"fingerprint": self.fingerprint, "project": self.project_dir, "files": self.files}, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError:
+            return  # No writable cache dir: scans just aren't cached
+        self._dirty = False
+
+    def lookup(self, rel_path: str, stat: os.stat_result) -> Optional[List[Tuple[int, str]]]:
+        """
+        Cached (line, type) violations if the file's key is unchanged (None: read the file).
+
+        Args:
+            rel_path: Path relative to the project dir
+            stat: Current os.stat() of the file
+        """
+        entry = self.files.get(rel_path)
+        if (
+            entry is None
+            or self.verify_hash
+            or entry.get("racy")
+            or any(entry.get(name) != value for name, value in _stat_key(stat).items())
+        ):
+            return None
+        return [tuple(hit) for hit in entry["hits"]]
+
+    def lookup_content(self, rel_path: str, stat: os.stat_result, digest: str) -> Optional[List[Tuple[int, str]]]:
+        """
+        Cached (line, type) violations if the file's content is unchanged (None: scan it).
+
+        Refreshes the entry's key, so the next lookup() hits without a read.
+        """
+        entry = self.files.get(rel_path)
+        if entry is None or entry["sha256"] != digest:
+            return None
+        self._set(rel_path, stat, digest, entry["hits"])
+        return [tuple(hit) for hit in entry["hits"]]
+
+    def store(self, rel_path: str, stat: os.stat_result, digest: str, hits: Iterable[Tuple[int, str]]):
+        """Record a freshly scanned file's (line, type) violations."""
+        self._set(rel_path, stat, digest, [list(hit) for hit in hits])
+
+    def retain(self, rel_paths: Iterable[str]):
+        """Drop entries for files no longer in the tree."""
+        keep = set(rel_paths)
+        stale = [path for path in self.files if path not in keep]
+        for path in stale:
+            del self.files[path]
+        if stale:
+            self._dirty = True
+
+    def _set(self, rel_path: str, stat: os.stat_result, digest: str, hits: List[list]):
+        entry = {
+            **_stat_key(stat),
+            "sha256": digest,
+            "racy": time.time_ns() - stat.st_mtime_ns < RACY_WINDOW_NS,
+            "hits": hits,
+        }
+        if self.files.get(rel_path) != entry:
+            self.files[rel_path] = entry
+            self._dirty = True
@@ -2,10 +2,33 @@
 Secrets scanning hook for Claude Agent SDK.
 
 PreToolUse hook that blocks git commits if secrets are detected.
+
+Only the content the git command can commit is scanned (see
+staged_scan.py); the full-tree scan is the fallback.
 """
 
+import asyncio
 from pathlib import Path
-from .secrets_scanner import SecretsScanner
+from typing import List
+
+from .secrets_scanner import SecretMatch, SecretsScanner
+from .staged_scan import incremental_scan
+
+
+# Scan only staged/added changes (False: always scan the whole tree)
+INCREMENTAL_SCAN = True
+
+# Reuse results for unchanged files across calls (~/.claude/secrets_scan_cache/)
+SCAN_CACHE = True
+
+
+def _scan(project_dir: Path, command: str) -> List[SecretMatch]:
+    """Scan what the command can commit, else the whole tree (blocking)."""
+    scanner = SecretsScanner(project_dir, cache=SCAN_CACHE)
+    violations = incremental_scan(project_dir, command, scanner) if INCREMENTAL_SCAN else None
+    if violations is None:
+        violations = scanner.scan()
+    return violations
 
 
 async def secrets_scan_hook(input_data: dict, tool_use_id: str, context: dict) -> dict:
@@ -13,25 +36,27 @@ async def secrets_scan_hook(input_data: dict, tool_use_id: str, context: dict) -
     PreToolUse hook - blocks git commits if secrets detected.
 
     Args:
-        input_data: Tool input (e.g., {"command": "git commit ..."})
+        input_data: Hook input ({"tool_input": {"command": "git commit ..."}, "cwd": ...});
+            a bare {"command": ...} is accepted too
         tool_use_id: Unique ID for this tool use
         context: Execution context (cwd, etc.)
 
     Returns:
         Hook result - either {} (allow) or {"permission": "deny", "user_message": ..., "agent_message": ...}
     """
-    command = input_data.get("command", "")
+    tool_input = input_data.get("tool_input") or {}
+    command = tool_input.get("command") or input_data.get("command", "")
 
     # Check if this is a git commit or git add (both can stage secrets)
     if "git commit" not in command and "git add" not in command:
         return {}  # Not a git operation, allow
 
-    # Get project directory from context
-    project_dir = Path(context.get("cwd", "."))
-    scanner = SecretsScanner(project_dir)
+    # Get project directory from the hook input (or context)
+    cwd = input_data.get("cwd") or (context.get("cwd") if isinstance(context, dict) else None)
+    project_dir = Path(cwd or ".")
 
-    # Scan for secrets
-    violations = scanner.scan()
+    # Scan off the event loop: git, file reads and the process pool all block
+    violations = await asyncio.to_thread(_scan, project_dir, command)
 
     if violations:
         # Format violations for display
@@ -1,8 +1,14 @@
 """Secrets scanner to prevent committing sensitive data."""
 
+import multiprocessing
+import os
+import pickle
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
 from dataclasses import dataclass
 
 
@@ -14,9 +20,104 @@ class SecretMatch:
     match: str
 
 
+# "@@ -a,b +c,d @@" - c is the first new-file line of the hunk
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)')
+
+# Below this many bytes to scan, a process pool costs more than it saves
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+# Bytes of files handed to a worker at a time
+PARALLEL_CHUNK_BYTES = 2 * 1024 * 1024
+
+# Most worker processes a scan starts (the agent's own tools share the machine)
+PARALLEL_MAX_WORKERS = 4
+
+
+def _pool_context():
+    """
+    Start method for scan workers.
+
+    Not fork: the hook runs in a process with an event loop and other
+    threads, whose state a forked child would inherit half-way.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _decode(data: bytes) -> Optional[str]:
+    """File bytes as text, with the same newline handling as read_text() (None if not UTF-8)."""
+    try:
+        return data.decode().replace('\r\n', '\n').replace('\r', '\n')
+    except UnicodeDecodeError:
+        return None
+
+
+def _chunk_by_bytes(items: List[Tuple[str, int]], chunk_bytes: int) -> List[List[str]]:
+    """Split (rel_path, size) pairs into consecutive chunks of about chunk_bytes."""
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    current_bytes = 0
+    for rel_path, size in items:
+        current.append(rel_path)
+        current_bytes += size
+        if current_bytes >= chunk_bytes:
+            chunks.append(current)
+            current, current_bytes = [], 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _scan_chunk(scanner_cls, project_dir: Path, rel_paths: List[str], with_digest: bool) -> List[tuple]:
+    """
+    Worker: scan a chunk of files.
+
+    Returns:
+        (rel_path, stat, digest, matches) per file, in chunk order
+        (stat is None if the file could not be read)
+    """
+    from .scan_cache import content_hash
+
+    scanner = scanner_cls(project_dir, workers=1)
+    results = []
+    for rel_path in rel_paths:
+        file_path = project_dir / rel_path
+        try:
+            stat = os.stat(file_path)
+            data = file_path.read_bytes()
+        except OSError:
+            results.append((rel_path, None, None, []))
+            continue
+        content = _decode(data)
+        matches = scanner.scan_text(rel_path, content) if content is not None else []
+        results.append((rel_path, stat, content_hash(data) if with_digest else None, matches))
+    return results
+
+
+@lru_cache(maxsize=8)
+def _compile_patterns(patterns: Tuple[Tuple[str, str], ...]) -> Tuple[Pattern, Tuple[Tuple[str, Pattern], ...]]:
+    """
+    Compile the secret patterns once.
+
+    Returns:
+        (prefilter, ((name, pattern), ...)) - the prefilter is one alternation
+        of all patterns, so text it does not match cannot match any of them
+    """
+    alternatives = []
+    for _, pattern in patterns:
+        # A global (?i) is not allowed mid-pattern: scope it to the alternative
+        if pattern.startswith("(?i)"):
+            alternatives.append(f"(?i:{pattern[4:]})")
+        else:
+            alternatives.append(f"(?:{pattern})")
+    prefilter = re.compile("|".join(alternatives))
+    compiled = tuple((name, re.compile(pattern)) for name, pattern in patterns)
+    return prefilter, compiled
+
+
 class SecretsScanner:
     """Scan for exposed secrets."""
-    
+
     PATTERNS = {
         'api_key': r'(?i)(api[_-]?key|apikey)\s*[:=]\s*["\']?([a-zA-Z0-9_\-]{20,})["\']?',
         'secret_key': r'(?i)(secret[_-]?key|secretkey)\s*[:=]\s*["\']?([a-zA-Z0-9_\-]{20,})["\']?',
@@ -26,7 +127,7 @@ class SecretsScanner:
         'aws_key': r'(?i)aws[_-]?access[_-]?key[_-]?id\s*[:=]\s*["\']?([A-Z0-9]{20})["\']?',
         'github_token': r'(?i)github[_-]?token\s*[:=]\s*["\']?([a-zA-Z0-9_]{40,})["\']?',
     }
-    
+
     IGNORE_PATTERNS = [
         'example',
         'sample',
@@ -37,60 +138,294 @@ class SecretsScanner:
         '<',
         '>',
     ]
-    
-    def __init__(self, project_dir: Path):
+
+    # File extensions scanned (results are ordered by this list)
+    EXTENSIONS = ['.py', '.js', '.ts', '.go', '.java', '.rb', '.env', '.yml', '.yaml', '.json']
+
+    # Directories never scanned
+    EXCLUDED_DIRS = ['.git', 'node_modules', 'venv', '__pycache__', 'dist', 'build']
+
+    def __init__(
+        self,
+        project_dir: Path,
+        cache: bool = False,
+        verify_hash: bool = False,
+        workers: Optional[int] = None,
+        parallel_min_bytes: int = PARALLEL_MIN_BYTES,
+        cache_dir: Optional[Path] = None,
+    ):
+        """
+        Initialize scanner.
+
+        Args:
+            project_dir: Project directory
+            cache: Reuse results for unchanged files (see scan_cache.py)
+            verify_hash: With cache, confirm unchanged files by content hash too
+            workers: Processes for large scans (None = CPU count up to
+                PARALLEL_MAX_WORKERS, 1 = always serial)
+            parallel_min_bytes: Smallest scan (in bytes) worth a process pool
+            cache_dir: With cache, directory of cache files (None = SCAN_CACHE_DIR)
+        """
         self.project_dir = project_dir
-    
+        self.workers = workers or min(os.cpu_count() or 1, PARALLEL_MAX_WORKERS)
+        self.parallel_min_bytes = parallel_min_bytes
+        self._prefilter, self._patterns = _compile_patterns(tuple(self.PATTERNS.items()))
+        self.cache = None
+        if cache:
+            from .scan_cache import ScanCache, patterns_fingerprint
+            fingerprint = patterns_fingerprint(self.PATTERNS, self.IGNORE_PATTERNS)
+            self.cache = ScanCache(project_dir, fingerprint, verify_hash, cache_dir)
+
     def scan(self) -> List[SecretMatch]:
-        """Scan for secrets."""
-        secrets = []
-        
-        for pattern_name, pattern in self.PATTERNS.items():
-            matches = self._scan_pattern(pattern, pattern_name)
-            secrets.extend(matches)
-        
-        return secrets
-    
-    def _scan_pattern(self, pattern: str, pattern_name: str) -> List[SecretMatch]:
-        """Scan for a specific pattern."""
-        matches = []
-        
-        for file_path in self._get_files():
+        """
+        Scan for secrets.
+
+        Walks the tree once and reads each file once. Results are grouped by
+        pattern (in PATTERNS order), then by file, then by line.
+        """
+        files = self._get_files()
+        if self.cache is not None:
+            self.cache.retain(str(f.relative_to(self.project_dir)) for f in files)
+        return self.scan_paths(files)
+
+    def scan_paths(self, paths: Iterable[Path]) -> List[SecretMatch]:
+        """
+        Scan specific files (skipping ones a full scan would not cover).
+
+        Args:
+            paths: Files to scan, absolute or relative to the project dir
+
+        Returns:
+            Matches grouped by pattern, then file (in the given order), then line
+        """
+        targets = []
+        for file_path in paths:
+            file_path = self.project_dir / file_path
+            rel_path = str(file_path.relative_to(self.project_dir))
+            if self.is_scanned(rel_path):
+                targets.append((file_path, rel_path))
+
+        if self.workers > 1 and len(targets) > 1:
+            per_file = self._scan_parallel(targets)
+            if per_file is not None:
+                if self.cache is not None:
+                    self.cache.save()
+                return self.merge(per_file)
+
+        per_file = []
+        for file_path, rel_path in targets:
+            if self.cache is not None:
+                per_file.append(self._scan_cached(file_path, rel_path))
+                continue
             try:
                 content = file_path.read_text()
-                lines = content.split('\n')
-                
-                for i, line in enumerate(lines, 1):
-                    if re.search(pattern, line):
-                        # Check if it's a false positive
-                        if not self._is_false_positive(line):
-                            matches.append(SecretMatch(
-                                file=str(file_path.relative_to(self.project_dir)),
-                                line=i,
-                                type=pattern_name,
-                                match=line.strip()[:100]
-                            ))
-            except:
-                pass
-        
-        return matches
-    
+            except (OSError, UnicodeDecodeError):
+                continue
+            per_file.append(self.scan_text(rel_path, content))
+        if self.cache is not None:
+            self.cache.save()
+        return self.merge(per_file)
+
+    def _scan_parallel(self, targets: List[Tuple[Path, str]]) -> Optional[List[List[SecretMatch]]]:
+        """
+        Scan files across a process pool, in chunks of PARALLEL_CHUNK_BYTES.
+
+        Files whose cache key is unchanged and clean are not sent to workers.
+        Results are per file, in target order, whatever order chunks finish in.
+
+        Returns:
+            Per-file matches, or None if the scan is too small (or the pool
+            cannot be used) and should run serially
+        """
+        results: Dict[str, List[SecretMatch]] = {}
+        pending: List[Tuple[str, int]] = []
+        total_bytes = 0
+        for file_path, rel_path in targets:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                results[rel_path] = []
+                continue
+            if self.cache is not None and self.cache.lookup(rel_path, stat) == []:
+                results[rel_path] = []
+                continue
+            pending.append((rel_path, stat.st_size))
+            total_bytes += stat.st_size
+
+        chunks = _chunk_by_bytes(pending, PARALLEL_CHUNK_BYTES)
+        if total_bytes < self.parallel_min_bytes or len(chunks) < 2:
+            return None
+
+        with_digest = self.cache is not None
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks)), mp_context=_pool_context()) as pool:
+                chunk_results = list(pool.map(
+                    _scan_chunk,
+                    [type(self)] * len(chunks),
+                    [self.project_dir] * len(chunks),
+                    chunks,
+                    [with_digest] * len(chunks),
+                ))
+        except (OSError, BrokenProcessPool, pickle.PicklingError, AttributeError):
+            return None  # No pool here (or an unpicklable scanner class): scan serially
+
+        for chunk in chunk_results:
+            for rel_path, stat, digest, matches in chunk:
+                results[rel_path] = matches
+                if with_digest and stat is not None:
+                    self.cache.store(rel_path, stat, digest, [(m.line, m.type) for m in matches])
+        return [results[rel_path] for _, rel_path in targets]
+
+    def _scan_cached(self, file_path: Path, rel_path: str) -> List[SecretMatch]:
+        """Scan one file, reading it only if its cache key changed (or it has violations)."""
+        from .scan_cache import content_hash
+
+        try:
+            stat = os.stat(file_path)
+            hits = self.cache.lookup(rel_path, stat)
+            if hits == []:
+                return []
+            data = file_path.read_bytes()
+        except OSError:
+            return []
+        content = _decode(data)
+
+        if hits is None:
+            digest = content_hash(data)
+            hits = self.cache.lookup_content(rel_path, stat, digest)
+            if hits is None:
+                matches = self.scan_text(rel_path, content) if content is not None else []
+                self.cache.store(rel_path, stat, digest, [(m.line, m.type) for m in matches])
+                return matches
+
+        # The cache holds no secret text: take the matched lines from the file
+        lines = content.split('\n')
+        return [
+            SecretMatch(file=rel_path, line=line, type=kind, match=lines[line - 1].strip()[:100])
+            for line, kind in hits
+        ]
+
+    def scan_diff(self, diff: str) -> List[SecretMatch]:
+        """
+        Scan only the lines a unified diff adds.
+
+        Args:
+            diff: `git diff` output (any context size)
+
+        Returns:
+            Matches with new-file line numbers, grouped like scan()
+        """
+        per_file = []
+        added: List[Tuple[int, str]] = []
+        rel_path = None
+        in_hunk = False
+        line_no = 0
+
+        def flush():
+            if rel_path is not None and added and self.is_scanned(rel_path):
+                per_file.append(self._scan_lines(rel_path, added))
+
+        for line in diff.split('\n'):
+            if line.startswith('diff --git '):
+                flush()
+                added, rel_path, in_hunk = [], None, False
+            elif line.startswith('@@ '):
+                match = _HUNK_HEADER.match(line)
+                line_no = int(match.group(1)) if match else 0
+                in_hunk = True
+            elif not in_hunk:
+                if line.startswith('+++ '):
+                    target = line[4:].strip().strip('"')
+                    rel_path = target[2:] if target.startswith('b/') else None
+            elif line.startswith('+'):
+                added.append((line_no, line[1:]))
+                line_no += 1
+            elif line.startswith(' '):
+                line_no += 1
+        flush()
+        return self.merge(per_file)
+
+    def scan_text(self, rel_path: str, content: str) -> List[SecretMatch]:
+        """
+        Scan one file's content.
+
+        Args:
+            rel_path: Path reported in the matches
+            content: File text
+
+        Returns:
+            Matches ordered by pattern, then line
+        """
+        # Most files contain nothing that could match: one regex pass rules them out
+        if not self._prefilter.search(content):
+            return []
+        return self._scan_lines(rel_path, enumerate(content.split('\n'), 1))
+
+    def _scan_lines(self, rel_path: str, lines: Iterable[Tuple[int, str]]) -> List[SecretMatch]:
+        """Scan (line_number, text) pairs of one file, ordered by pattern, then line."""
+        hits: List[Tuple[int, int, SecretMatch]] = []
+        for i, line in lines:
+            if not self._prefilter.search(line) or self._is_false_positive(line):
+                continue
+            for order, (pattern_name, pattern) in enumerate(self._patterns):
+                if pattern.search(line):
+                    hits.append((order, i, SecretMatch(
+                        file=rel_path,
+                        line=i,
+                        type=pattern_name,
+                        match=line.strip()[:100]
+                    )))
+        hits.sort(key=lambda hit: (hit[0], hit[1]))
+        return [match for _, _, match in hits]
+
+    def merge(self, per_file: Iterable[List[SecretMatch]]) -> List[SecretMatch]:
+        """
+        Combine per-file results into scan() order (pattern, then file, then line).
+
+        Duplicate (file, line, type) matches are dropped.
+        """
+        by_type: Dict[str, List[SecretMatch]] = {name: [] for name, _ in self._patterns}
+        seen = set()
+        for matches in per_file:
+            for match in matches:
+                key = (match.file, match.line, match.type)
+                if key not in seen:
+                    seen.add(key)
+                    by_type[match.type].append(match)
+        return [match for matches in by_type.values() for match in matches]
+
+    def is_scanned(self, rel_path: str) -> bool:
+        """Whether a full scan covers this path (extension and excluded dirs)."""
+        parts = Path(rel_path).parts
+        return (
+            bool(parts)
+            and parts[-1].endswith(tuple(self.EXTENSIONS))
+            and not set(self.EXCLUDED_DIRS).intersection(parts)
+        )
+
     def _is_false_positive(self, line: str) -> bool:
         """Check if match is a false positive."""
         lower_line = line.lower()
         return any(ignore in lower_line for ignore in self.IGNORE_PATTERNS)
-    
+
     def _get_files(self) -> List[Path]:
-        """Get all files to scan."""
-        files = []
-        
-        for ext in ['.py', '.js', '.ts', '.go', '.java', '.rb', '.env', '.yml', '.yaml', '.json']:
-            files.extend(self.project_dir.rglob(f'*{ext}'))
-        
-        # Filter out node_modules, .git, etc
-        files = [f for f in files if not any(
-            part in f.parts for part in ['.git', 'node_modules', 'venv', '__pycache__', 'dist', 'build']
-        )]
-        
-        return files
+        """
+        Get all files to scan, in one walk, ordered by EXTENSIONS.
 
+        Excluded directories are never descended into. .gitignore is not
+        applied: ignored files can still be committed (git add -f, or
+        tracked before they were ignored).
+        """
+        from project_walker import walk_project
+
+        extensions = tuple(self.EXTENSIONS)
+        files = [
+            Path(entry.path)
+            for entry in walk_project(self.project_dir, excluded_dirs=self.EXCLUDED_DIRS, gitignore=False)
+            if entry.name.endswith(extensions) and entry.is_file()
+            and self.is_scanned(os.path.relpath(entry.path, self.project_dir))
+        ]
+
+        # Stable sort keeps walk order within each extension
+        files.sort(key=lambda f: next(i for i, ext in enumerate(extensions) if f.name.endswith(ext)))
+        return files
@@ -0,0 +1,214 @@
+"""
+Incremental secrets scanning for git add / git commit.
+
+Only content that a git command can commit is scanned:
+- git add <pathspec>: lines the working tree adds relative to the index
+  (`git diff -- <pathspec>`), plus untracked files under the pathspec -
+  gitignored ones too for `git add -f`
+- git commit: the staged blobs (`git diff --cached`), plus unstaged
+  changes for `commit -a` and `commit <paths>`
+
+So hook latency scales with the size of the change, not the repository.
+When the command cannot be analysed (git -C, cd to another directory,
+unparseable shell, git unavailable) the caller falls back to a full-tree
+scan.
+"""
+
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from security import parse_command
+from .secrets_scanner import SecretMatch, SecretsScanner
+
+
+# git options (before the subcommand) that take a value
+GIT_VALUE_OPTIONS = {"-c", "--git-dir", "--work-tree", "--namespace", "--exec-path"}
+
+# git commit options that take a value (short letters and long names)
+COMMIT_VALUE_SHORT = set("mFCct")
+COMMIT_VALUE_LONG = {
+    "--message", "--file", "--reuse-message", "--reedit-message", "--fixup", "--squash",
+    "--author", "--date", "--template", "--cleanup", "--trailer", "--pathspec-from-file",
+}
+
+# git add options that take a value
+ADD_VALUE_LONG = {"--chmod", "--pathspec-from-file"}
+
+
+@dataclass
+class GitScanTargets:
+    """What the git commands in a Bash command line can commit."""
+    add_pathspecs: List[List[str]] = field(default_factory=list)  # One list per `git add` ([] = all)
+    add_untracked: bool = False  # Some `git add` may stage untracked files
+    force_pathspecs: List[List[str]] = field(default_factory=list)  # `git add -f` pathspecs (ignored files too)
+    commit: bool = False  # Staged content is committed
+    commit_unstaged: Optional[List[str]] = None  # Unstaged paths committed too ([] = all tracked)
+
+
+def _git(project_dir: Path, *args: str) -> Optional[str]:
+    """Run git, returning stdout (None if git fails)."""
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=project_dir, capture_output=True, text=True, errors="replace",
+        )
+    except OSError:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def _subcommand(argv) -> Optional[tuple]:
+    """(subcommand, args) of a git argv, or None if it cannot be determined safely."""
+    i = 1
+    while i < len(argv):
+        word = argv[i]
+        if word == "-C" or word.startswith("--git-dir") or word.startswith("--work-tree"):
+            return None  # Runs against another repository/work tree
+        if word in GIT_VALUE_OPTIONS:
+            i += 2
+            continue
+        if word.startswith("-"):
+            i += 1
+            continue
+        return word, list(argv[i + 1:])
+    return None
+
+
+def _positional(args: List[str], value_long: set, value_short: set = frozenset()) -> tuple:
+    """(positional args, set of flags) of a git subcommand's arguments."""
+    paths, flags = [], set()
+    i = 0
+    while i < len(args):
+        word = args[i]
+        if word == "--":
+            paths.extend(args[i + 1:])
+            break
+        if word.startswith("--"):
+            name = word.split("=", 1)[0]
+            flags.add(name)
+            if name in value_long and "=" not in word:
+                i += 1
+        elif word.startswith("-") and len(word) > 1:
+            for index, letter in enumerate(word[1:], 1):
+                flags.add(f"-{letter}")
+                if letter in value_short:
+                    if index == len(word) - 1:
+                        i += 1  # Value is the next word
+                    break  # Rest of the cluster is the value
+        else:
+            paths.append(word)
+        i += 1
+    return paths, flags
+
+
+def git_scan_targets(command: str, project_dir: Optional[Path] = None) -> Optional[GitScanTargets]:
+    """
+    Work out what a Bash command line's git add/commit calls can commit.
+
+    Args:
+        command: Full Bash command
+        project_dir: Directory the command runs in (`cd` into it is allowed)
+
+    Returns:
+        GitScanTargets, or None if a full scan is needed
+    """
+    ast = parse_command(command)
+    if ast.error:
+        return None
+
+    targets = GitScanTargets()
+    for stage in ast.stages():
+        if stage.dynamic:
+            return None
+        if stage.name in ("cd", "pushd"):
+            # Pathspecs after a cd elsewhere would be relative to another directory
+            dirs = [word for word in stage.argv[1:] if not word.startswith("-")]
+            if project_dir is None or len(dirs) != 1 or \
+                    (project_dir / dirs[0]).resolve() != project_dir.resolve():
+                return None
+            continue
+        if stage.name != "git":
+            continue
+        parsed = _subcommand(stage.argv)
+        if parsed is None:
+            return None
+        subcommand, args = parsed
+
+        if subcommand == "add":
+            paths, flags = _positional(args, ADD_VALUE_LONG)
+            if "--pathspec-from-file" in flags:
+                return None
+            targets.add_pathspecs.append(paths)
+            if not flags & {"-u", "--update"}:
+                targets.add_untracked = True
+                if flags & {"-f", "--force"}:
+                    targets.force_pathspecs.append(paths)
+        elif subcommand == "commit":
+            paths, flags = _positional(args, COMMIT_VALUE_LONG, COMMIT_VALUE_SHORT)
+            if "--pathspec-from-file" in flags:
+                return None
+            targets.commit = True
+            if flags & {"-a", "--all"}:
+                targets.commit_unstaged = []
+            elif paths and targets.commit_unstaged is None:
+                targets.commit_unstaged = paths
+            elif paths:
+                targets.commit_unstaged.extend(paths)
+    return targets
+
+
+def incremental_scan(
+    project_dir: Path,
+    command: str,
+    scanner: Optional[SecretsScanner] = None,
+) -> Optional[List[SecretMatch]]:
+    """
+    Scan only what the command's git add/commit calls can commit.
+
+    Args:
+        project_dir: Repository working tree
+        command: Full Bash command
+        scanner: Scanner to use (default: a new uncached one)
+
+    Returns:
+        Matches (scan() order), or None if a full scan is needed
+    """
+    targets = git_scan_targets(command, project_dir)
+    if targets is None:
+        return None
+
+    scanner = scanner or SecretsScanner(project_dir)
+    diffs: List[str] = []
+    untracked: List[str] = []
+
+    def diff(*args: str) -> bool:
+        output = _git(project_dir, "diff", "--no-color", "--no-ext-diff", "--relative", "-U0", *args)
+        if output is None:
+            return False
+        diffs.append(output)
+        return True
+
+    for pathspecs in targets.add_pathspecs:
+        if not diff("--", *pathspecs):
+            return None
+    if targets.add_untracked:
+        for pathspecs in targets.add_pathspecs:
+            output = _git(project_dir, "ls-files", "-z", "--others", "--exclude-standard", "--", *pathspecs)
+            if output is None:
+                return None
+            untracked.extend(path for path in output.split("\0") if path)
+    for pathspecs in targets.force_pathspecs:
+        # No --exclude-standard: -f stages ignored files as well
+        output = _git(project_dir, "ls-files", "-z", "--others", "--", *pathspecs)
+        if output is None:
+            return None
+        untracked.extend(path for path in output.split("\0") if path and path not in untracked)
+
+    if targets.commit:
+        if not diff("--cached"):
+            return None
+        if targets.commit_unstaged is not None and not diff("--", *targets.commit_unstaged):
+            return None
+
+    return scanner.merge([scanner.scan_diff("\n".join(diffs)), scanner.scan_paths(untracked)])